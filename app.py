@@ -14,7 +14,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.database import Database
-from modules.indicators import add_all_indicators
+from modules.indicator_store import IndicatorStore
 from modules.strategy import ScalpingStrategy
 import config
 
@@ -61,6 +61,12 @@ def init_components():
     strategy = ScalpingStrategy()
     return db, strategy
 
+@st.cache_resource
+def init_indicator_store():
+    """Initialize the indicator store (cached)"""
+    db, _ = init_components()
+    return IndicatorStore(db)
+
 # Load stock data
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_stock_data(symbol):
@@ -73,19 +79,17 @@ def load_stock_data(symbol):
 @st.cache_data(ttl=300)
 def calculate_indicators_and_signals(symbol):
     """Calculate indicators and generate signals"""
-    db, strategy = init_components()
+    _, strategy = init_components()
+    store = init_indicator_store()
     
-    # Load data
-    df = db.get_price_data(symbol)
+    # Load data with stored indicators (only new candles are computed)
+    df_with_indicators = store.load(symbol)
     
-    if df.empty:
+    if df_with_indicators.empty:
         return pd.DataFrame(), pd.DataFrame()
     
-    # Add indicators
-    df_with_indicators = add_all_indicators(df.copy())
-    
-    # Generate signals
-    signals_df = strategy.generate_signals(df_with_indicators.copy())
+    # Generate signals from the stored indicator columns (nothing is recomputed)
+    signals_df = strategy.generate_signals(df_with_indicators)
     
     return df_with_indicators, signals_df
 
@@ -148,13 +152,13 @@ def main():
         start_date, end_date = date_range
         mask = (df_with_indicators['timestamp'].dt.date >= start_date) & \
                (df_with_indicators['timestamp'].dt.date <= end_date)
-        df_filtered = df_with_indicators[mask].copy()
+        df_filtered = df_with_indicators[mask]
         
         # Filter signals too
         if not signals_df.empty:
             signals_mask = (signals_df['timestamp'].dt.date >= start_date) & \
                           (signals_df['timestamp'].dt.date <= end_date)
-            signals_filtered = signals_df[signals_mask].copy()
+            signals_filtered = signals_df[signals_mask]
         else:
             signals_filtered = signals_df
     else:
@@ -0,0 +1,118 @@
+"""
+Headless historical data backfill
+Fetches candles for many symbols without prompts and resumes from checkpoints
+
+Examples:
+    python backfill.py --days 90
+    python backfill.py --symbols-file universe.txt --start 2024-01-01 --end 2024-12-31 --resolution 5 --workers 4
+    python backfill.py --from-db --resolution D --start 2020-01-01
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.backfill import BackfillJob, default_date_range, load_symbols_file, parse_date
+from modules.data_fetcher import FyersDataFetcher
+from modules.database import Database
+from modules.rate_limit import RateLimiter
+from modules.resilience import FailureLedger, ResilientCaller
+import config
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="Resumable historical data backfill")
+
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--symbols', nargs='+', help="Symbols to fetch (e.g. NSE:TCS-EQ)")
+    source.add_argument('--symbols-file', help="File with one symbol per line")
+    source.add_argument('--from-db', action='store_true', help="Use every symbol in the stocks table")
+
+    parser.add_argument('--start', type=parse_date, help="First date, YYYY-MM-DD")
+    parser.add_argument('--end', type=parse_date, help="Last date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--days', type=int, default=config.HISTORICAL_DATA_DAYS,
+                        help="Days before --end to fetch when --start is not given")
+    parser.add_argument('--resolution', default=config.DATA_RESOLUTION, help="Fyers resolution (1, 5, 15, 60, D)")
+    parser.add_argument('--workers', type=int, default=2, help="Concurrent requests")
+    parser.add_argument('--window-days', type=int, help="Days per request window (default: API maximum)")
+    parser.add_argument('--token-file', default="fyers_access_token.txt", help="Access token file")
+    parser.add_argument('--db', default=config.DB_PATH, help="SQLite database path")
+    parser.add_argument('--restart', action='store_true', help="Discard checkpoints for this resolution first")
+    return parser
+
+
+def resolve_symbols(args, db):
+    """Return the symbol list selected on the command line"""
+    if args.symbols:
+        return args.symbols
+    if args.symbols_file:
+        return load_symbols_file(args.symbols_file)
+    if args.from_db:
+        return db.get_all_stocks()['symbol'].tolist()
+    return config.DEFAULT_STOCKS
+
+
+def main(argv=None):
+    """Run the backfill and return a process exit code"""
+    args = build_parser().parse_args(argv)
+
+    if not os.path.exists(args.token_file):
+        print(f"❌ Error: {args.token_file} not found!")
+        print("Please run authenticate_fyers.py first to generate access token.")
+        return 2
+
+    with open(args.token_file, 'r') as f:
+        access_token = f.read().strip()
+
+    db = Database(db_path=args.db)
+    symbols = resolve_symbols(args, db)
+    if not symbols:
+        print("❌ No symbols to backfill")
+        return 2
+
+    if args.start:
+        start_date, end_date = args.start, args.end or default_date_range(0)[1]
+    else:
+        start_date, end_date = default_date_range(args.days, args.end)
+
+    if args.restart:
+        db.clear_backfill_checkpoints(args.resolution)
+
+    # Retry transient errors, wait out open circuits and log what still fails;
+    # every attempt, retries included, waits for the job's rate limiter
+    ledger = FailureLedger(db)
+    rate_limiter = RateLimiter()
+    fetcher = FyersDataFetcher(caller=ResilientCaller(ledger=ledger, wait_for_circuit=True,
+                                                      rate_limiter=rate_limiter))
+    if not fetcher.authenticate(access_token):
+        print("❌ Authentication failed!")
+        return 1
+
+    job = BackfillJob(
+        fetcher, db, symbols, start_date, end_date,
+        resolution=args.resolution,
+        workers=args.workers,
+        window_days=args.window_days,
+        rate_limiter=rate_limiter
+    )
+    success = job.run()
+    db.close()
+
+    if fetcher.caller.retries:
+        print(f"\n🔁 Recovered from transient errors with {fetcher.caller.retries} retries")
+    
+    if job.failed:
+        print(f"\n⚠️  Failures by category: {ledger.summary()}")
+        print("⚠️  Failed units (rerun to retry):")
+        for symbol, window_start, window_end in job.failed:
+            print(f"   - {symbol} {window_start} → {window_end}")
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
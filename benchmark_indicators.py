@@ -0,0 +1,260 @@
+"""
+Benchmark the pandas and numpy indicator backends
+Times every indicator on synthetic OHLC data, measures peak memory, checks
+that both backends agree and compares the run against a saved baseline
+
+Examples:
+    python benchmark_indicators.py
+    python benchmark_indicators.py --sizes 1000000 10000000 --repeat 5
+    python benchmark_indicators.py --output benchmarks/baseline.json
+    python benchmark_indicators.py --compare benchmarks/baseline.json --tolerance 0.2
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.indicators import (
+    BACKENDS,
+    add_all_indicators,
+    calculate_atr,
+    calculate_bollinger_bands,
+    calculate_ema,
+    calculate_macd,
+    calculate_moving_average,
+    calculate_rsi,
+    calculate_stochastic
+)
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Timings below this are dominated by call overhead and timer noise, so
+# they are not reported as regressions
+NOISE_FLOOR = 0.001
+
+
+def make_bars(n, seed=42):
+    """Random-walk OHLC bars"""
+    rng = np.random.default_rng(seed)
+    close = 1300 + np.cumsum(rng.standard_normal(n) * 2)
+    return pd.DataFrame({
+        'open': close + rng.standard_normal(n),
+        'high': close + np.abs(rng.standard_normal(n) * 2),
+        'low': close - np.abs(rng.standard_normal(n) * 2),
+        'close': close,
+        'volume': rng.integers(1000, 100000, n)
+    })
+
+
+def benchmark_cases(df):
+    """
+    Indicator calls to time, keyed by name
+
+    The add_all_indicators results are not kept for comparison: two full
+    frames of 10^7 bars do not fit in memory next to each other, and every
+    column is already compared through the individual cases.
+    """
+    high, low, close = df['high'], df['low'], df['close']
+    return {
+        'rsi': lambda backend: calculate_rsi(close, 14, backend=backend),
+        'ma_200': lambda backend: calculate_moving_average(close, 200, backend=backend),
+        'ema_20': lambda backend: calculate_ema(close, 20, backend=backend),
+        'macd': lambda backend: calculate_macd(close, backend=backend),
+        'bollinger': lambda backend: calculate_bollinger_bands(close, 20, backend=backend),
+        'stochastic': lambda backend: calculate_stochastic(high, low, close, backend=backend),
+        'atr': lambda backend: calculate_atr(high, low, close, backend=backend),
+        'add_all_indicators': lambda backend: add_all_indicators(df, backend=backend).shape
+    }
+
+
+def best_time(func, repeat):
+    """Best wall time of repeat calls, and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def peak_memory(func):
+    """
+    Peak bytes allocated during one call (including its result)
+
+    Measured in a separate call because tracing allocations slows the
+    timed runs down.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def largest_difference(a, b):
+    """Largest absolute difference between two results (Series or tuples of Series)"""
+    if isinstance(a, tuple):
+        if not isinstance(a[0], pd.Series):
+            return float('nan')
+        return max(largest_difference(x, y) for x, y in zip(a, b))
+    return float(np.nanmax(np.abs(np.asarray(a, dtype=float) - np.asarray(b, dtype=float))))
+
+
+def run_benchmark(sizes, repeat=3, backends=BACKENDS, indicators=None, memory=True):
+    """
+    Time every indicator on every size and backend
+
+    Args:
+        sizes (list): Bar counts
+        repeat (int): Runs per measurement (best is reported)
+        backends (tuple): Backends to time; the first is the speedup reference
+        indicators (list): Case names to run (default: all)
+        memory (bool): Also measure peak memory
+
+    Returns:
+        list: One dict per (size, indicator, backend) with seconds, peak_mb,
+            speedup (relative to the first backend) and max_diff
+    """
+    records = []
+    for n in sizes:
+        df = make_bars(n)
+        print(f"\n📊 {n:,} bars")
+        print(f"   {'indicator':<20}" + "".join(f"{b:>10}" for b in backends)
+              + "".join(f"{b + ' MB':>12}" for b in backends) + f"{'speedup':>10}{'max diff':>12}")
+
+        for name, call in benchmark_cases(df).items():
+            if indicators and name not in indicators:
+                continue
+            timings, results, peaks = {}, {}, {}
+            for backend in backends:
+                timings[backend], results[backend] = best_time(lambda: call(backend), repeat)
+                peaks[backend] = peak_memory(lambda: call(backend)) / 2 ** 20 if memory else float('nan')
+
+            reference = backends[0]
+            for backend in backends:
+                records.append({
+                    'size': n, 'indicator': name, 'backend': backend,
+                    'seconds': timings[backend], 'peak_mb': peaks[backend],
+                    'speedup': timings[reference] / timings[backend],
+                    'max_diff': largest_difference(results[reference], results[backend])
+                })
+
+            fastest = backends[-1]
+            diff = records[-1]['max_diff']
+            diff_text = 'n/a' if np.isnan(diff) else f"{diff:.1e}"
+            print(f"   {name:<20}" + "".join(f"{timings[b]:>9.3f}s" for b in backends)
+                  + "".join(f"{peaks[b]:>12.1f}" for b in backends)
+                  + f"{timings[reference] / timings[fastest]:>9.2f}x{diff_text:>12}")
+    return records
+
+
+def save_results(records, path, repeat):
+    """Write records and the environment they were measured in to a JSON file"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        # NaN is not valid JSON; unmeasured values are stored as null
+        'results': [{key: (None if isinstance(value, float) and np.isnan(value) else value)
+                     for key, value in record.items()} for record in records]
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"\n💾 Saved {len(records)} measurements to {path}")
+
+
+def load_results(path):
+    """Records of a file written by save_results"""
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_results(records, baseline, tolerance=0.25):
+    """
+    Find measurements that got worse than a baseline run
+
+    Args:
+        records (list): Current records from run_benchmark
+        baseline (list): Records of an earlier run
+        tolerance (float): Allowed relative slowdown / memory growth
+
+    Returns:
+        list: One dict per regression with size, indicator, backend, metric,
+            baseline, current and ratio
+    """
+    previous = {(r['size'], r['indicator'], r['backend']): r for r in baseline}
+    regressions = []
+    for record in records:
+        base = previous.get((record['size'], record['indicator'], record['backend']))
+        if base is None:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            old, new = base.get(metric), record.get(metric)
+            if old is None or new is None or np.isnan(old) or np.isnan(new) or old <= 0:
+                continue
+            if metric == 'seconds' and new < NOISE_FLOOR:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append({
+                    'size': record['size'], 'indicator': record['indicator'], 'backend': record['backend'],
+                    'metric': metric, 'baseline': old, 'current': new, 'ratio': new / old
+                })
+    return regressions
+
+
+def main(argv=None):
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark indicator backends")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Bar counts")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS,
+                        help="Backends to time; the first is the speedup reference")
+    parser.add_argument('--indicators', nargs='+', help="Only run these cases")
+    parser.add_argument('--no-memory', action='store_true', help="Skip peak memory measurement")
+    parser.add_argument('--output', help="Save results to this JSON file")
+    parser.add_argument('--compare', help="Baseline JSON file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth against the baseline")
+    args = parser.parse_args(argv)
+
+    records = run_benchmark(args.sizes, args.repeat, tuple(args.backends), args.indicators,
+                            memory=not args.no_memory)
+
+    if args.output:
+        save_results(records, args.output, args.repeat)
+
+    if args.compare:
+        regressions = compare_results(records, load_results(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regressions against {args.compare}:")
+            for r in regressions:
+                unit = 's' if r['metric'] == 'seconds' else ' MB'
+                print(f"   {r['indicator']:<20} {r['backend']:<8} {r['size']:>12,} bars  {r['metric']:<8}"
+                      f"{r['baseline']:.3f}{unit} -> {r['current']:.3f}{unit} ({r['ratio']:.2f}x)")
+            return 1
+        print(f"\n✅ No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+    print("\n✅ Benchmark completed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,6 +37,24 @@ SCALPING_MA_LONG = 50
 SCALPING_EMA_SHORT = 12
 SCALPING_EMA_LONG = 26
 
+# Scalping rules in the rule language of modules/rules.py (used by
+# RuleStrategy.from_config; a JSON file with the same keys works too).
+# 'rsi' is the 14-period RSI; a bar signals only once 'warmup' bars have
+# passed and every indicator the rules read is defined.
+SCALPING_RULES = {
+    'name': 'Scalping Options (rules)',
+    'buy': f'rsi < oversold and close > ma_{SCALPING_MA_SHORT}',
+    'sell': 'rsi > overbought',
+    'buy_confidence': (f'0.5 + (oversold - rsi) / oversold * 0.3'
+                       f' + (min((close - ma_{SCALPING_MA_SHORT}) / ma_{SCALPING_MA_SHORT} * 10, 0.1)'
+                       f' if close > ma_{SCALPING_MA_SHORT} else 0)'
+                       f' + (0.1 if ma_{SCALPING_MA_SHORT} > ma_{SCALPING_MA_LONG} else 0)'),
+    'sell_confidence': (f'0.5 + (rsi - overbought) / (100 - overbought) * 0.3'
+                        f' + (0.2 if close < ma_{SCALPING_MA_SHORT} else 0)'),
+    'warmup': SCALPING_MA_LONG,
+    'constants': {'oversold': SCALPING_RSI_OVERSOLD, 'overbought': SCALPING_RSI_OVERBOUGHT}
+}
+
 # ============================================================================
 # BACKTESTING CONFIGURATION
 # ============================================================================
@@ -62,6 +80,21 @@ HISTORICAL_DATA_DAYS = 90
 # Options: '1' (1 min), '5' (5 min), '15' (15 min), '60' (1 hour), 'D' (1 day)
 DATA_RESOLUTION = '5'  # 5-minute candles for scalping
 
+# Exchange time zone and regular NSE equity session (local time). Stored
+# timestamps are naive UTC; sessions are defined in this time zone.
+MARKET_TIMEZONE = 'Asia/Kolkata'
+MARKET_OPEN = '09:15'
+MARKET_CLOSE = '15:30'
+OPENING_RANGE_MINUTES = 15  # Length of the opening range from MARKET_OPEN
+
+# Fyers API limits
+HISTORY_MAX_DAYS_INTRADAY = 100  # Maximum days per history request below 1D
+HISTORY_MAX_DAYS_DAILY = 366  # Maximum days per daily history request
+API_RATE_LIMIT_PER_SECOND = 10
+API_RATE_LIMIT_PER_MINUTE = 200
+QUOTE_BATCH_SIZE = 50  # Maximum symbols per quotes request
+QUOTE_MAX_WORKERS = 4  # Concurrent quotes requests
+
 # ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
@@ -0,0 +1,58 @@
+"""
+Import offline price archives into the database
+Loads vendor CSV dumps and NSE bhavcopy files in parallel and reports throughput
+
+Examples:
+    python import_archives.py archives/bhavcopy/
+    python import_archives.py "dumps/*.csv" --resolution 1 --workers 8
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.bulk_loader import BulkLoader, MARKET_TIMEZONE
+from modules.database import Database
+import config
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="Bulk import of CSV / bhavcopy archives")
+    parser.add_argument('paths', nargs='+', help="Files, directories or glob patterns")
+    parser.add_argument('--format', choices=['bhavcopy', 'bhavcopy_udiff', 'vendor'],
+                        help="Force the file layout (detected from the header by default)")
+    parser.add_argument('--resolution', default=config.DATA_RESOLUTION,
+                        help="Resolution of vendor files (bhavcopy is always D)")
+    parser.add_argument('--tz', default=MARKET_TIMEZONE, help="Time zone of timestamps in the files")
+    parser.add_argument('--series', nargs='*', default=['EQ'],
+                        help="Bhavcopy series to keep (pass no values to keep all)")
+    parser.add_argument('--workers', type=int, help="Parser processes (default: CPU count)")
+    parser.add_argument('--db', default=config.DB_PATH, help="SQLite database path")
+    return parser
+
+
+def main(argv=None):
+    """Run the import and return a process exit code"""
+    args = build_parser().parse_args(argv)
+
+    db = Database(db_path=args.db)
+    loader = BulkLoader(
+        db,
+        workers=args.workers,
+        resolution=args.resolution,
+        source_tz=args.tz,
+        series_filter=tuple(args.series) or None,
+        fmt=args.format
+    )
+    loader.load(args.paths)
+    db.close()
+
+    return 1 if loader.failed_files else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Backfill module for PTIP
+Runs resumable bulk historical fetches, checkpointing every (symbol, window) unit
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.resilience import FyersAPIError
+from modules.rate_limit import RateLimiter
+import config
+
+
+def max_window_days(resolution):
+    """Largest date range Fyers accepts in one history request for a resolution"""
+    if resolution in ('D', '1D'):
+        return config.HISTORY_MAX_DAYS_DAILY
+    return config.HISTORY_MAX_DAYS_INTRADAY
+
+
+# Windows start on multiples of window_days counted from this date, so the
+# same calendar span maps to the same window whatever range is requested
+WINDOW_EPOCH = date(1970, 1, 1)
+
+
+def plan_windows(start_date, end_date, resolution, window_days=None):
+    """
+    Split a date range into request-sized windows
+
+    Window boundaries fall on fixed calendar dates (multiples of window_days
+    since WINDOW_EPOCH) rather than being counted from start_date, so a rerun
+    over a shifted range produces the same interior windows and resumes from
+    its checkpoints. Only the first and last window are clipped to the range.
+
+    Args:
+        start_date (date): First date (inclusive)
+        end_date (date): Last date (inclusive)
+        resolution (str): Data resolution
+        window_days (int): Days per window. If None, uses the API maximum for the resolution
+
+    Returns:
+        list: (window_start, window_end) date tuples, both inclusive
+    """
+    window_days = min(window_days or max_window_days(resolution), max_window_days(resolution))
+    windows = []
+    current = start_date
+    while current <= end_date:
+        offset = (current - WINDOW_EPOCH).days
+        boundary = WINDOW_EPOCH + timedelta(days=(offset // window_days + 1) * window_days)
+        window_end = min(boundary - timedelta(days=1), end_date)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+    return windows
+
+
+def load_symbols_file(path):
+    """
+    Read symbols from a text file, one per line
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+    with open(path, 'r') as f:
+        lines = [line.split('#', 1)[0].strip() for line in f]
+    return [line for line in lines if line]
+
+
+class BackfillJob:
+    """
+    Resumable bulk historical data fetch
+
+    The work is split into (symbol, window) units. Units are fetched by a
+    pool of worker threads sharing one rate limiter; results are written and
+    checkpointed by the calling thread as they complete, so a crash or an
+    expired token loses at most the units that were in flight. Windows that
+    end today or later are written but not checkpointed, since candles are
+    still being added to them; a rerun fetches them again.
+    """
+
+    def __init__(self, fetcher, db, symbols, start_date, end_date, resolution='5',
+                 workers=2, window_days=None, rate_limiter=None):
+        """
+        Initialize the job
+
+        Args:
+            fetcher (FyersDataFetcher): Authenticated data fetcher
+            db (Database): Database receiving candles and checkpoints
+            symbols (list): Symbols to backfill
+            start_date (date): First date (inclusive)
+            end_date (date): Last date (inclusive)
+            resolution (str): Data resolution
+            workers (int): Number of concurrent requests
+            window_days (int): Days per request window (optional)
+            rate_limiter (RateLimiter): Shared limiter (optional, one is created if None).
+                Pass the same limiter to the fetcher's ResilientCaller so that
+                retries are paced too
+        """
+        self.fetcher = fetcher
+        self.db = db
+        self.symbols = list(dict.fromkeys(symbols))
+        self.resolution = resolution
+        self.workers = max(1, workers)
+        self.windows = plan_windows(start_date, end_date, resolution, window_days)
+        self.rate_limiter = rate_limiter or RateLimiter()
+
+        self.rows_written = 0
+        self.completed = 0
+        self.skipped = 0
+        self.failed = []
+        self.aborted = False
+
+    def pending_units(self):
+        """
+        Return the (symbol, window_start, window_end) units not yet checkpointed
+
+        A unit also counts as done when it lies inside a checkpointed window,
+        e.g. the clipped first window of a rerun whose start moved forward.
+        """
+        done = {}
+        for symbol, window_start, window_end in self.db.get_backfill_checkpoints(self.resolution):
+            done.setdefault(symbol, []).append((window_start, window_end))
+
+        units = []
+        for symbol in self.symbols:
+            covered = done.get(symbol, [])
+            for window_start, window_end in self.windows:
+                first, last = window_start.isoformat(), window_end.isoformat()
+                if any(start <= first and last <= end for start, end in covered):
+                    self.skipped += 1
+                else:
+                    units.append((symbol, window_start, window_end))
+        return units
+
+    def _fetch(self, symbol, window_start, window_end):
+        # A caller holding the limiter acquires it before every attempt itself
+        caller = getattr(self.fetcher, 'caller', None)
+        if getattr(caller, 'rate_limiter', None) is not self.rate_limiter:
+            self.rate_limiter.acquire()
+        return self.fetcher.fetch_history(symbol, window_start, window_end, self.resolution)
+
+    def run(self):
+        """
+        Fetch every pending unit
+
+        Returns:
+            bool: True if every unit completed, False if some failed or the job aborted
+        """
+        units = self.pending_units()
+        total = len(units)
+        print(f"📊 Backfill: {len(self.symbols)} symbols x {len(self.windows)} windows, "
+              f"{total} pending, {self.skipped} already done")
+
+        self.db.add_stocks(self.symbols)
+
+        today = date.today()
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = {executor.submit(self._fetch, *unit): unit for unit in units}
+
+        try:
+            for future in as_completed(futures):
+                symbol, window_start, window_end = futures[future]
+                label = f"{symbol} {window_start} → {window_end}"
+
+                try:
+                    df = future.result()
+                except FyersAPIError as e:
+                    if e.is_auth_error:
+                        print(f"❌ Access token rejected ({e}); stopping. Rerun to resume.")
+                        self.aborted = True
+                        break
+                    print(f"❌ {label}: {e}")
+                    self.failed.append((symbol, window_start, window_end))
+                    continue
+                except Exception as e:
+                    print(f"❌ {label}: {e}")
+                    self.failed.append((symbol, window_start, window_end))
+                    continue
+
+                written = self.db.upsert_price_data(df, symbol, self.resolution) if not df.empty else 0
+                if written < 0:
+                    self.failed.append((symbol, window_start, window_end))
+                    continue
+
+                if window_end < today:
+                    self.db.mark_backfill_done(symbol, self.resolution, window_start.isoformat(),
+                                               window_end.isoformat(), written)
+                self.rows_written += written
+                self.completed += 1
+                print(f"✅ [{self.completed}/{total}] {label}: {written} candles")
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - started
+        print(f"\n📊 Backfill finished in {elapsed:.1f}s: {self.completed} units, "
+              f"{self.rows_written:,} candles, {len(self.failed)} failed")
+        return not self.failed and not self.aborted
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD command line date"""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def default_date_range(days, end_date=None):
+    """Return (start_date, end_date) covering the last `days` days"""
+    end_date = end_date or date.today()
+    return end_date - timedelta(days=days), end_date
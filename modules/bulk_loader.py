@@ -0,0 +1,363 @@
+"""
+Bulk Loader module for PTIP
+Imports offline vendor CSV dumps and NSE bhavcopy files into price_data
+"""
+
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.database import Database
+import config
+
+
+# Column mappings of the supported file layouts onto price_data columns
+BHAVCOPY_LEGACY_COLUMNS = {
+    'SYMBOL': 'ticker', 'SERIES': 'series', 'OPEN': 'open', 'HIGH': 'high',
+    'LOW': 'low', 'CLOSE': 'close', 'TOTTRDQTY': 'volume', 'TIMESTAMP': 'date'
+}
+BHAVCOPY_UDIFF_COLUMNS = {
+    'TckrSymb': 'ticker', 'SctySrs': 'series', 'OpnPric': 'open', 'HghPric': 'high',
+    'LwPric': 'low', 'ClsPric': 'close', 'TtlTradgVol': 'volume', 'TradDt': 'date'
+}
+VENDOR_TIME_COLUMNS = ('timestamp', 'datetime', 'date_time', 'time', 'date')
+
+PRICE_COLUMNS = ['symbol', 'resolution', 'timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+MARKET_TIMEZONE = config.MARKET_TIMEZONE
+
+# Worker processes take turns holding the SQLite write lock, one chunk at a
+# time; a worker may wait for every other worker's chunk before its own
+WRITE_LOCK_TIMEOUT = 300.0
+
+
+def detect_format(columns):
+    """
+    Identify the layout of a file from its header
+
+    Args:
+        columns (list): Header column names
+
+    Returns:
+        str: 'bhavcopy', 'bhavcopy_udiff' or 'vendor'
+    """
+    names = {c.strip() for c in columns}
+    if set(BHAVCOPY_UDIFF_COLUMNS) <= names:
+        return 'bhavcopy_udiff'
+    if set(BHAVCOPY_LEGACY_COLUMNS) <= names:
+        return 'bhavcopy'
+
+    lowered = {c.lower() for c in names}
+    if {'open', 'high', 'low', 'close'} <= lowered and lowered & set(VENDOR_TIME_COLUMNS):
+        return 'vendor'
+    raise ValueError(f"Unrecognised file layout: {sorted(names)}")
+
+
+def normalize_symbols(tickers, series=None, exchange='NSE'):
+    """
+    Convert exchange tickers to Fyers symbols (e.g. RELIANCE -> NSE:RELIANCE-EQ)
+
+    Tickers already in Fyers format are kept as they are.
+
+    Args:
+        tickers (pd.Series): Exchange tickers
+        series (pd.Series): Security series per row (default: EQ)
+        exchange (str): Exchange prefix
+
+    Returns:
+        pd.Series: Fyers symbols
+    """
+    tickers = tickers.astype(str).str.strip().str.upper()
+    suffix = series.astype(str).str.strip().str.upper() if series is not None else 'EQ'
+    symbols = exchange + ':' + tickers + '-' + suffix
+    return symbols.where(~tickers.str.contains(':', regex=False), tickers)
+
+
+def to_utc_naive(timestamps, source_tz=MARKET_TIMEZONE):
+    """
+    Convert local exchange timestamps to naive UTC, the price_data convention
+
+    Args:
+        timestamps (pd.Series): Naive timestamps in source_tz (or tz-aware)
+        source_tz (str): Time zone of naive input
+    """
+    timestamps = pd.to_datetime(timestamps)
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize(source_tz)
+    return timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+
+
+def validate_ohlc(df):
+    """
+    Vectorized OHLC sanity check
+
+    A row is valid when all prices are finite and positive, low <= open/close
+    <= high, and volume is not negative.
+
+    Returns:
+        np.ndarray: Boolean mask of valid rows
+    """
+    o = df['open'].to_numpy(dtype=float)
+    h = df['high'].to_numpy(dtype=float)
+    l = df['low'].to_numpy(dtype=float)
+    c = df['close'].to_numpy(dtype=float)
+    v = df['volume'].to_numpy(dtype=float)
+
+    with np.errstate(invalid='ignore'):
+        return (
+            np.isfinite(o) & np.isfinite(h) & np.isfinite(l) & np.isfinite(c)
+            & (l > 0) & (l <= h)
+            & (o >= l) & (o <= h) & (c >= l) & (c <= h)
+            & ~(v < 0)
+        )
+
+
+def _normalize_chunk(chunk, fmt, symbol, resolution, source_tz, series_filter):
+    """Map one raw chunk onto PRICE_COLUMNS"""
+    if fmt in ('bhavcopy', 'bhavcopy_udiff'):
+        mapping = BHAVCOPY_UDIFF_COLUMNS if fmt == 'bhavcopy_udiff' else BHAVCOPY_LEGACY_COLUMNS
+        chunk = chunk.rename(columns=lambda c: c.strip()).rename(columns=mapping)
+        chunk['series'] = chunk['series'].astype(str).str.strip().str.upper()
+        if series_filter:
+            chunk = chunk[chunk['series'].isin(series_filter)].copy()
+        chunk['symbol'] = normalize_symbols(chunk['ticker'], chunk['series'])
+        # Daily candles are stamped at midnight IST, as Fyers returns them
+        date_format = '%Y-%m-%d' if fmt == 'bhavcopy_udiff' else '%d-%b-%Y'
+        dates = pd.to_datetime(chunk['date'].astype(str).str.strip(), format=date_format)
+        chunk['timestamp'] = to_utc_naive(dates, source_tz)
+        chunk['resolution'] = 'D'
+    else:
+        chunk = chunk.rename(columns=lambda c: c.strip().lower())
+        if 'date' in chunk.columns and 'time' in chunk.columns:
+            raw_times = chunk['date'].astype(str) + ' ' + chunk['time'].astype(str)
+        else:
+            raw_times = chunk[next(c for c in VENDOR_TIME_COLUMNS if c in chunk.columns)]
+        chunk['timestamp'] = to_utc_naive(raw_times, source_tz)
+        if 'symbol' in chunk.columns:
+            chunk['symbol'] = normalize_symbols(chunk['symbol'])
+        else:
+            chunk['symbol'] = normalize_symbols(pd.Series(symbol, index=chunk.index))
+        if 'volume' not in chunk.columns:
+            chunk['volume'] = 0
+        chunk['resolution'] = resolution
+
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
+    return chunk[PRICE_COLUMNS]
+
+
+def iter_file_chunks(path, fmt=None, resolution=None, source_tz=MARKET_TIMEZONE,
+                     series_filter=('EQ',), chunksize=250000):
+    """
+    Stream one archive file as normalized, validated price chunks
+
+    Args:
+        path (str): CSV file (plain or compressed, as pandas infers)
+        fmt (str): Force a layout ('bhavcopy', 'bhavcopy_udiff', 'vendor'); detected if None
+        resolution (str): Resolution of vendor files. If None, uses config.DATA_RESOLUTION
+        source_tz (str): Time zone of the timestamps in the file
+        series_filter (tuple): Bhavcopy series to keep (None keeps all)
+        chunksize (int): Rows parsed per chunk
+
+    Yields:
+        tuple: (DataFrame with PRICE_COLUMNS, rows_read, rows_rejected) for each chunk
+    """
+    resolution = resolution or config.DATA_RESOLUTION
+    if fmt is None:
+        fmt = detect_format(pd.read_csv(path, nrows=0).columns)
+
+    # Vendor dumps without a symbol column are named after the ticker
+    file_symbol = os.path.basename(path).split('.')[0]
+
+    for chunk in pd.read_csv(path, chunksize=chunksize, skipinitialspace=True):
+        rows_read = len(chunk)
+        chunk = _normalize_chunk(chunk, fmt, file_symbol, resolution, source_tz, series_filter)
+        valid = validate_ohlc(chunk)
+        yield chunk[valid], rows_read, int((~valid).sum())
+
+
+def parse_file(path, **options):
+    """
+    Read one whole archive file into a normalized, validated price frame
+
+    BulkLoader does not use this: it writes each chunk as it is parsed (see
+    load_file), so a file never has to fit in memory.
+
+    Args:
+        path (str): CSV file
+        **options: As for iter_file_chunks
+
+    Returns:
+        tuple: (DataFrame with PRICE_COLUMNS, rows_read, rows_rejected)
+    """
+    frames = []
+    rows_read = 0
+    rows_rejected = 0
+    for chunk, read, rejected in iter_file_chunks(path, **options):
+        frames.append(chunk)
+        rows_read += read
+        rows_rejected += rejected
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PRICE_COLUMNS)
+    return df, rows_read, rows_rejected
+
+
+def load_file(db, path, **options):
+    """
+    Parse one archive file and upsert it chunk by chunk
+
+    Only one chunk is held in memory at a time. Each chunk is its own
+    transaction; upserts are idempotent, so a file that fails part way is
+    completed by loading it again.
+
+    Args:
+        db (Database): Target database
+        path (str): CSV file
+        **options: As for iter_file_chunks
+
+    Returns:
+        tuple: (rows_read, rows_rejected, rows_written)
+
+    Raises:
+        RuntimeError: If a chunk could not be written
+    """
+    rows_read = 0
+    rows_rejected = 0
+    rows_written = 0
+    for chunk, read, rejected in iter_file_chunks(path, **options):
+        written = db.upsert_price_data(chunk)
+        if written < 0:
+            raise RuntimeError(f"could not write rows {rows_read + 1:,}-{rows_read + read:,}")
+        if written:
+            db.add_stocks(chunk['symbol'].unique().tolist())
+        rows_read += read
+        rows_rejected += rejected
+        rows_written += written
+    return rows_read, rows_rejected, rows_written
+
+
+# Connection of a loader worker process, opened once by _open_worker_db
+_worker_db = None
+
+
+def _open_worker_db(db_path):
+    global _worker_db
+    _worker_db = Database(db_path=db_path, timeout=WRITE_LOCK_TIMEOUT)
+
+
+def _load_file_in_worker(path, options):
+    return load_file(_worker_db, path, **options)
+
+
+def expand_paths(paths):
+    """Expand directories and glob patterns into a sorted list of CSV files"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(glob.glob(os.path.join(path, '**', '*.csv*'), recursive=True))
+        elif any(ch in path for ch in '*?['):
+            files.extend(glob.glob(path, recursive=True))
+        else:
+            files.append(path)
+    return sorted(dict.fromkeys(files))
+
+
+class BulkLoader:
+    """
+    Loads many archive files into price_data
+
+    Files are parsed in a process pool (parsing is CPU bound). Each worker
+    opens its own connection and upserts every chunk as soon as it is parsed,
+    so neither a worker nor the parent ever holds a whole file; only row
+    counts are sent back to the parent.
+    """
+
+    def __init__(self, db, workers=None, resolution=None, source_tz=MARKET_TIMEZONE,
+                 series_filter=('EQ',), fmt=None, chunksize=250000):
+        """
+        Initialize the loader
+
+        Args:
+            db (Database): Target database
+            workers (int): Parser processes (default: CPU count)
+            resolution (str): Resolution of vendor files. If None, uses config.DATA_RESOLUTION
+            source_tz (str): Time zone of file timestamps
+            series_filter (tuple): Bhavcopy series to keep (None keeps all)
+            fmt (str): Force a file layout instead of detecting it
+            chunksize (int): Rows parsed and written per transaction
+        """
+        self.db = db
+        self.workers = workers or os.cpu_count() or 1
+        self.resolution = resolution
+        self.source_tz = source_tz
+        self.series_filter = series_filter
+        self.fmt = fmt
+        self.chunksize = chunksize
+
+        self.files_loaded = 0
+        self.rows_read = 0
+        self.rows_rejected = 0
+        self.rows_written = 0
+        self.failed_files = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        """Rows written per second of wall time over the last load"""
+        return self.rows_written / self.elapsed if self.elapsed else 0.0
+
+    def _record(self, path, rows_read, rows_rejected, written):
+        self.files_loaded += 1
+        self.rows_read += rows_read
+        self.rows_rejected += rows_rejected
+        self.rows_written += written
+        print(f"✅ {os.path.basename(path)}: {written:,} rows ({rows_rejected:,} rejected)")
+
+    def load(self, paths):
+        """
+        Parse and store every file
+
+        Args:
+            paths (list): Files, directories or glob patterns
+
+        Returns:
+            int: Rows written
+        """
+        files = expand_paths(paths)
+        print(f"📂 Importing {len(files)} files with {self.workers} workers...")
+        started = time.perf_counter()
+
+        options = dict(fmt=self.fmt, resolution=self.resolution, source_tz=self.source_tz,
+                       series_filter=self.series_filter, chunksize=self.chunksize)
+
+        if self.workers == 1:
+            for path in files:
+                try:
+                    self._record(path, *load_file(self.db, path, **options))
+                except Exception as e:
+                    print(f"❌ {path}: {e}")
+                    self.failed_files.append(path)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_open_worker_db,
+                                     initargs=(self.db.db_path,)) as executor:
+                futures = {executor.submit(_load_file_in_worker, path, options): path for path in files}
+                for future in as_completed(futures):
+                    path = futures[future]
+                    try:
+                        self._record(path, *future.result())
+                    except Exception as e:
+                        print(f"❌ {path}: {e}")
+                        self.failed_files.append(path)
+
+        self.elapsed = time.perf_counter() - started
+        print(f"\n📊 Imported {self.rows_written:,} rows from {self.files_loaded} files in "
+              f"{self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s), "
+              f"{self.rows_rejected:,} rejected, {len(self.failed_files)} files failed")
+        return self.rows_written
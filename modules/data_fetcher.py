@@ -12,19 +12,27 @@ from fyers_apiv3 import fyersModel
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from modules.resilience import FyersAPIError, ResilientCaller
 import config
 
 
 class FyersDataFetcher:
     """Handles data fetching from Fyers API"""
     
-    def __init__(self):
-        """Initialize Fyers Data Fetcher"""
+    def __init__(self, caller=None):
+        """
+        Initialize Fyers Data Fetcher
+        
+        Args:
+            caller (ResilientCaller): Retry/circuit-breaker layer used for every
+                API call (optional, a default one is created if None)
+        """
         self.client_id = config.FYERS_CLIENT_ID
         self.secret_key = config.FYERS_SECRET_KEY
         self.redirect_uri = config.FYERS_REDIRECT_URI
         self.access_token = None
         self.fyers = None
+        self.caller = caller or ResilientCaller()
         
         print("✅ Fyers Data Fetcher initialized")
     
@@ -87,43 +95,65 @@ class FyersDataFetcher:
             return pd.DataFrame()
         
         try:
-            # Convert dates to YYYY-MM-DD format (required by Fyers API)
-            from_date_str = from_date.strftime("%Y-%m-%d")
-            to_date_str = to_date.strftime("%Y-%m-%d")
-
-            # Prepare data request
-            data = {
-                "symbol": symbol,
-                "resolution": resolution,
-                "date_format": "1",  # Returns Unix timestamp in response
-                "range_from": from_date_str,
-                "range_to": to_date_str,
-                "cont_flag": "1"
-            }
-            
-            # Fetch data
-            print(f"📊 Fetching data for {symbol} from {from_date.date()} to {to_date.date()}...")
-            response = self.fyers.history(data=data)
-            
-            # Check response
-            if response['s'] == 'ok':
-                # Convert to DataFrame
-                df = pd.DataFrame(response['candles'])
-                df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                
-                # Convert timestamp to datetime
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-                
-                print(f"✅ Fetched {len(df)} records for {symbol}")
-                return df
-            else:
-                print(f"❌ Error fetching data: {response.get('message', 'Unknown error')}")
-                return pd.DataFrame()
-                
+            print(f"📊 Fetching data for {symbol} from {from_date.strftime('%Y-%m-%d')} to {to_date.strftime('%Y-%m-%d')}...")
+            df = self.fetch_history(symbol, from_date, to_date, resolution)
+            print(f"✅ Fetched {len(df)} records for {symbol}")
+            return df
+        
+        except FyersAPIError as e:
+            print(f"❌ Error fetching data: {e}")
+            return pd.DataFrame()
         except Exception as e:
             print(f"❌ Exception while fetching data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def fetch_history(self, symbol, from_date, to_date, resolution='5'):
+        """
+        Fetch historical data for a symbol, raising on API errors
+        
+        Unlike fetch_historical_data this does not print or swallow errors, so
+        bulk jobs can tell an empty window apart from a failed request.
+        
+        Args:
+            symbol (str): Stock symbol (e.g., 'NSE:RELIANCE-EQ')
+            from_date (datetime): Start date
+            to_date (datetime): End date
+            resolution (str): Data resolution ('1', '5', '15', '60', 'D')
+            
+        Returns:
+            pd.DataFrame: Historical OHLCV data (empty if the range has no candles)
+            
+        Raises:
+            FyersAPIError: If the API returns an error response after retries
+            CircuitOpenError: If the history endpoint is failing and its circuit is open
+        """
+        if not self.fyers:
+            raise FyersAPIError("Not authenticated. Please authenticate first.")
+        
+        # Convert dates to YYYY-MM-DD format (required by Fyers API)
+        data = {
+            "symbol": symbol,
+            "resolution": resolution,
+            "date_format": "1",  # Returns Unix timestamp in response
+            "range_from": from_date.strftime("%Y-%m-%d"),
+            "range_to": to_date.strftime("%Y-%m-%d"),
+            "cont_flag": "1"
+        }
+        
+        key = f"{symbol} {data['range_from']}..{data['range_to']} ({resolution})"
+        response = self.caller.call('history', self._request, self.fyers.history, data, key=key)
+        
+        if response.get('s') == 'no_data' or not response.get('candles'):
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(response['candles'])
+        df.columns = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        
+        # Convert timestamp to datetime
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df
+    
     def fetch_multiple_stocks(self, symbols, from_date, to_date, resolution='5', delay=1):
         """
         Fetch historical data for multiple stocks
@@ -160,29 +190,49 @@ class FyersDataFetcher:
         """
         Get current quote for symbols (for future real-time implementation)
         
+        Symbols are requested in batches of config.QUOTE_BATCH_SIZE, the
+        per-request cap of the quotes endpoint. For large universes use
+        QuoteSnapshotService, which issues the batches concurrently.
+        
         Args:
             symbols (list): List of stock symbols
             
         Returns:
-            dict: Quote data
+            list: Quote data (empty if nothing could be fetched)
         """
         if not self.fyers:
             print("❌ Not authenticated. Please authenticate first.")
-            return {}
+            return []
         
-        try:
-            data = {"symbols": ",".join(symbols)}
-            response = self.fyers.quotes(data=data)
-            
-            if response['s'] == 'ok':
-                return response['d']
-            else:
-                print(f"❌ Error fetching quotes: {response.get('message', 'Unknown error')}")
-                return {}
+        quotes = []
+        for start in range(0, len(symbols), config.QUOTE_BATCH_SIZE):
+            batch = symbols[start:start + config.QUOTE_BATCH_SIZE]
+            try:
+                data = {"symbols": ",".join(batch)}
+                response = self.caller.call('quotes', self._request, self.fyers.quotes, data, key=batch[0])
+                quotes.extend(response['d'])
                 
-        except Exception as e:
-            print(f"❌ Exception while fetching quotes: {e}")
-            return {}
+            except FyersAPIError as e:
+                print(f"❌ Error fetching quotes: {e}")
+            except Exception as e:
+                print(f"❌ Exception while fetching quotes: {e}")
+        
+        return quotes
+    
+    @staticmethod
+    def _request(method, data):
+        """
+        Call a Fyers SDK method and raise on error responses
+        
+        The SDK never raises: network failures come back as code -99 and HTTP
+        errors as the error payload, so the status field is checked here.
+        """
+        response = method(data=data)
+        if not isinstance(response, dict):
+            raise FyersAPIError(f"Unexpected response: {response!r}")
+        if response.get('s') not in ('ok', 'no_data'):
+            raise FyersAPIError(response.get('message', 'Unknown error'), response.get('code'))
+        return response
 
 
 # Test function
@@ -3,7 +3,9 @@ Database module for PTIP
 Handles SQLite database operations for storing price data, signals, and trades
 """
 
+import json
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -17,12 +19,13 @@ import config
 class Database:
     """Database handler for PTIP application"""
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, timeout=5.0):
         """
         Initialize database connection
         
         Args:
             db_path (str): Path to SQLite database file. If None, uses config.DB_PATH
+            timeout (float): Seconds to wait when another connection holds the write lock
         """
         self.db_path = db_path or config.DB_PATH
         
@@ -30,7 +33,7 @@ class Database:
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
         # Connect to database
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(self.db_path, timeout=timeout, check_same_thread=False)
         
         # Create tables
         self.create_tables()
@@ -52,7 +55,7 @@ class Database:
         ''')
         
         # Price data table - stores historical OHLCV data
-        cursor.execute('''
+        cursor.execute(f'''
             CREATE TABLE IF NOT EXISTS price_data (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 symbol TEXT NOT NULL,
@@ -62,10 +65,12 @@ class Database:
                 low REAL NOT NULL,
                 close REAL NOT NULL,
                 volume INTEGER,
-                UNIQUE(symbol, timestamp),
+                resolution TEXT NOT NULL DEFAULT '{config.DATA_RESOLUTION}',
+                UNIQUE(symbol, resolution, timestamp),
                 FOREIGN KEY (symbol) REFERENCES stocks(symbol)
             )
         ''')
+        self._migrate_price_data_resolution(cursor)
         
         # Create index for faster queries
         cursor.execute('''
@@ -106,9 +111,135 @@ class Database:
             )
         ''')
         
+        # Backfill checkpoints - completed (symbol, window) units of bulk fetches
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                symbol TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                window_start DATE NOT NULL,
+                window_end DATE NOT NULL,
+                rows INTEGER,
+                completed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (symbol, resolution, window_start, window_end)
+            )
+        ''')
+        
+        # Fetch failures - API calls that still failed after retries
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS fetch_failures (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                endpoint TEXT NOT NULL,
+                request_key TEXT,
+                category TEXT NOT NULL,
+                code INTEGER,
+                message TEXT,
+                attempts INTEGER,
+                failed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Indicator blocks - materialized indicator columns, one float64 matrix
+        # (bars x columns) per symbol and trading day
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS indicator_blocks (
+                symbol TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                params_hash TEXT NOT NULL,
+                day DATE NOT NULL,
+                columns TEXT NOT NULL,
+                timestamps BLOB NOT NULL,
+                vals BLOB NOT NULL,
+                PRIMARY KEY (symbol, resolution, params_hash, day)
+            ) WITHOUT ROWID
+        ''')
+        
+        # Indicator checkpoints - state needed to extend indicator_blocks incrementally
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS indicator_checkpoints (
+                symbol TEXT NOT NULL,
+                resolution TEXT NOT NULL,
+                params_hash TEXT NOT NULL,
+                last_timestamp DATETIME,
+                bars INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (symbol, resolution, params_hash)
+            )
+        ''')
+        self._migrate_indicator_values(cursor)
+        
         self.conn.commit()
         print("✅ Database tables created/verified")
     
+    def _migrate_price_data_resolution(self, cursor):
+        """
+        Add the resolution column to a price_data table created before it existed
+        
+        SQLite cannot change a UNIQUE constraint in place, so the table is
+        rebuilt. Existing rows were all fetched at config.DATA_RESOLUTION.
+        The rebuild runs in one transaction and is rolled back on error; a
+        price_data_old table left behind by an interrupted rebuild from an
+        older version is merged back into price_data.
+        """
+        tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(price_data)")]
+        leftover = 'price_data_old' in tables
+        if 'resolution' in columns and not leftover:
+            return
+        
+        if self.conn.in_transaction:
+            self.conn.commit()
+        cursor.execute("BEGIN")
+        try:
+            if leftover:
+                print("⚠️  Found price_data_old from an interrupted migration, restoring its rows...")
+                old_columns = [row[1] for row in cursor.execute("PRAGMA table_info(price_data_old)")]
+                shared = ", ".join(column for column in old_columns if column in columns)
+                cursor.execute(f"INSERT OR IGNORE INTO price_data ({shared}) SELECT {shared} FROM price_data_old")
+                cursor.execute("DROP TABLE price_data_old")
+            
+            if 'resolution' not in columns:
+                print("⚙️  Migrating price_data: adding resolution column...")
+                cursor.execute("ALTER TABLE price_data RENAME TO price_data_old")
+                cursor.execute("DROP INDEX IF EXISTS idx_price_data_symbol_timestamp")
+                cursor.execute(f'''
+                    CREATE TABLE price_data (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        symbol TEXT NOT NULL,
+                        timestamp DATETIME NOT NULL,
+                        open REAL NOT NULL,
+                        high REAL NOT NULL,
+                        low REAL NOT NULL,
+                        close REAL NOT NULL,
+                        volume INTEGER,
+                        resolution TEXT NOT NULL DEFAULT '{config.DATA_RESOLUTION}',
+                        UNIQUE(symbol, resolution, timestamp),
+                        FOREIGN KEY (symbol) REFERENCES stocks(symbol)
+                    )
+                ''')
+                cursor.execute('''
+                    INSERT INTO price_data (id, symbol, timestamp, open, high, low, close, volume)
+                    SELECT id, symbol, timestamp, open, high, low, close, volume FROM price_data_old
+                ''')
+                cursor.execute("DROP TABLE price_data_old")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            print("❌ price_data migration failed, database left unchanged")
+            raise
+    
+    def _migrate_indicator_values(self, cursor):
+        """
+        Drop the one-row-per-value indicator table of older versions
+        
+        Its values are recomputed into indicator_blocks on the next
+        materialize, so only the checkpoints that refer to them are cleared.
+        """
+        if cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='indicator_values'").fetchone():
+            print("⚙️  Migrating indicator_values to indicator_blocks (recomputed on next use)...")
+            cursor.execute("DROP TABLE indicator_values")
+            cursor.execute("DELETE FROM indicator_checkpoints")
+    
     def add_stock(self, symbol, name=None, exchange=None):
         """
         Add a stock to the stocks table
@@ -155,8 +286,79 @@ class Database:
         except Exception as e:
             print(f"❌ Error inserting price data for {symbol}: {e}")
             return False
-    
-    def get_price_data(self, symbol, start_date=None, end_date=None, limit=None):
+
+    def upsert_price_data(self, df, symbol=None, resolution=None):
+        """
+        Insert or update price data in a single batched transaction
+
+        Unlike insert_price_data, rows that already exist for the same
+        (symbol, resolution, timestamp) are overwritten instead of failing the
+        whole batch.
+
+        Args:
+            df (pd.DataFrame): DataFrame with columns: timestamp, open, high, low, close, volume
+                and a symbol column when symbol is None
+            symbol (str): Stock symbol applied to every row (optional)
+            resolution (str): Resolution applied to every row. If None, uses the
+                resolution column when present, else config.DATA_RESOLUTION
+
+        Returns:
+            int: Number of rows written, or -1 on error
+        """
+        if df.empty:
+            return 0
+
+        try:
+            n = len(df)
+            timestamps = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+            symbols = [symbol] * n if symbol else df['symbol'].tolist()
+            if resolution is None and 'resolution' in df.columns:
+                resolutions = df['resolution'].astype(str).tolist()
+            else:
+                resolutions = [resolution or config.DATA_RESOLUTION] * n
+            volume = df['volume']
+            if volume.isna().any():
+                volumes = [None if pd.isna(v) else int(v) for v in volume]
+            else:
+                volumes = volume.astype('int64').tolist()
+            rows = list(zip(
+                symbols,
+                resolutions,
+                timestamps.tolist(),
+                df['open'].astype(float).tolist(),
+                df['high'].astype(float).tolist(),
+                df['low'].astype(float).tolist(),
+                df['close'].astype(float).tolist(),
+                volumes
+            ))
+
+            with self.conn:
+                self.conn.executemany('''
+                    INSERT INTO price_data (symbol, resolution, timestamp, open, high, low, close, volume)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(symbol, resolution, timestamp) DO UPDATE SET
+                        open = excluded.open,
+                        high = excluded.high,
+                        low = excluded.low,
+                        close = excluded.close,
+                        volume = excluded.volume
+                ''', rows)
+                # Materialized indicators from the earliest written candle on are stale
+                first = {}
+                for row in rows:
+                    key = (row[0], row[1])
+                    if key not in first or row[2] < first[key]:
+                        first[key] = row[2]
+                self.conn.executemany('''
+                    DELETE FROM indicator_checkpoints
+                    WHERE symbol = ? AND resolution = ? AND last_timestamp >= ?
+                ''', [(symbol, resolution, timestamp) for (symbol, resolution), timestamp in first.items()])
+            return len(rows)
+        except Exception as e:
+            print(f"❌ Error upserting price data: {e}")
+            return -1
+
+    def get_price_data(self, symbol, start_date=None, end_date=None, limit=None, resolution=None):
         """
         Retrieve price data for a symbol
         
@@ -165,11 +367,13 @@ class Database:
             start_date (str): Start date (YYYY-MM-DD format)
             end_date (str): End date (YYYY-MM-DD format)
             limit (int): Maximum number of records to return
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
             
         Returns:
             pd.DataFrame: Price data
         """
-        query = f"SELECT * FROM price_data WHERE symbol = '{symbol}'"
+        resolution = resolution or config.DATA_RESOLUTION
+        query = f"SELECT * FROM price_data WHERE symbol = '{symbol}' AND resolution = '{resolution}'"
         
         if start_date:
             query += f" AND timestamp >= '{start_date}'"
@@ -189,6 +393,219 @@ class Database:
             print(f"❌ Error retrieving price data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def count_price_data(self, symbol, resolution=None, end_date=None):
+        """
+        Count stored candles for a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+            end_date (str): Only count candles at or before this timestamp (optional)
+            
+        Returns:
+            int: Number of candles
+        """
+        query = "SELECT COUNT(*) FROM price_data WHERE symbol = ? AND resolution = ?"
+        params = [symbol, resolution or config.DATA_RESOLUTION]
+        if end_date:
+            query += " AND timestamp <= ?"
+            params.append(str(end_date))
+        return self.conn.execute(query, params).fetchone()[0]
+
+    def get_price_panel(self, symbols=None, fields=('open', 'high', 'low', 'close', 'volume'),
+                        start_date=None, end_date=None, resolution=None):
+        """
+        Retrieve price data for many symbols as wide time x symbol frames
+
+        Args:
+            symbols (list): Symbols to load. If None, every symbol with candles
+            fields (tuple): Price columns to return
+            start_date (str): Start date (YYYY-MM-DD format)
+            end_date (str): End date (YYYY-MM-DD format)
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+
+        Returns:
+            dict: {field: DataFrame indexed by timestamp with one column per
+                symbol, NaN where a symbol has no candle}
+        """
+        query = f"SELECT symbol, timestamp, {', '.join(fields)} FROM price_data WHERE resolution = ?"
+        params = [resolution or config.DATA_RESOLUTION]
+        if symbols is not None:
+            query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+            params.extend(symbols)
+        if start_date:
+            query += " AND timestamp >= ?"
+            params.append(str(start_date))
+        if end_date:
+            query += " AND timestamp <= ?"
+            params.append(str(end_date))
+
+        try:
+            df = pd.read_sql_query(query, self.conn, params=params)
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            panel = {}
+            for field in fields:
+                wide = df.pivot(index='timestamp', columns='symbol', values=field).astype(float)
+                if symbols is not None:
+                    wide = wide.reindex(columns=list(symbols))
+                wide.columns.name = None
+                panel[field] = wide
+            return panel
+        except Exception as e:
+            print(f"❌ Error retrieving price panel: {e}")
+            return {}
+
+    def upsert_indicator_blocks(self, df, symbol, resolution, params_hash, columns):
+        """
+        Store indicator columns as one float64 matrix per trading day
+        
+        Bars of a day that is already stored are merged into its block (new
+        values win), so extending the latest day rewrites only that block.
+        
+        Args:
+            df (pd.DataFrame): Frame with a timestamp column and the indicator columns,
+                sorted by timestamp
+            symbol (str): Stock symbol
+            resolution (str): Candle resolution
+            params_hash (str): Hash of the indicator set the values belong to
+            columns (list): Indicator columns to store
+            
+        Returns:
+            int: Number of bars written, or -1 on error
+        """
+        if df.empty:
+            return 0
+        
+        try:
+            columns = list(columns)
+            names = json.dumps(columns)
+            timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]')
+            values = df[columns].to_numpy(dtype=np.float64)
+            days = timestamps.astype('datetime64[D]')
+            labels, starts = np.unique(days, return_index=True)
+            labels = np.datetime_as_string(labels)
+            stops = np.append(starts[1:], len(days))
+            
+            stored = {row[0]: row[1:] for row in self.conn.execute('''
+                SELECT day, columns, timestamps, vals FROM indicator_blocks
+                WHERE symbol = ? AND resolution = ? AND params_hash = ? AND day >= ? AND day <= ?
+            ''', (symbol, resolution, params_hash, labels[0], labels[-1]))}
+            
+            rows = []
+            for day, start, stop in zip(labels, starts, stops):
+                block_times = timestamps[start:stop].astype(np.int64)
+                block_values = values[start:stop]
+                if day in stored and stored[day][0] == names:
+                    old_times = np.frombuffer(stored[day][1], dtype=np.int64)
+                    old_values = np.frombuffer(stored[day][2], dtype=np.float64).reshape(-1, len(columns))
+                    keep = ~np.isin(old_times, block_times)
+                    block_times = np.concatenate([old_times[keep], block_times])
+                    block_values = np.concatenate([old_values[keep], block_values])
+                    order = np.argsort(block_times, kind='stable')
+                    block_times, block_values = block_times[order], block_values[order]
+                rows.append((symbol, resolution, params_hash, day, names, block_times.tobytes(),
+                             np.ascontiguousarray(block_values).tobytes()))
+            
+            with self.conn:
+                self.conn.executemany('''
+                    INSERT OR REPLACE INTO indicator_blocks
+                        (symbol, resolution, params_hash, day, columns, timestamps, vals)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+            return len(df)
+        except Exception as e:
+            print(f"❌ Error storing indicators for {symbol}: {e}")
+            return -1
+    
+    def get_indicator_blocks(self, symbol, params_hash, resolution=None, start_date=None, end_date=None):
+        """
+        Retrieve materialized indicators as columns
+        
+        Whole days are read, so the result can extend past start_date and
+        end_date within their first and last day.
+        
+        Args:
+            symbol (str): Stock symbol
+            params_hash (str): Hash of the indicator set to read
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+            start_date (str): Start date (YYYY-MM-DD format)
+            end_date (str): End date (YYYY-MM-DD format)
+            
+        Returns:
+            pd.DataFrame: Indicator columns indexed by timestamp (empty if nothing is stored)
+        """
+        query = '''
+            SELECT columns, timestamps, vals FROM indicator_blocks
+            WHERE symbol = ? AND resolution = ? AND params_hash = ?
+        '''
+        params = [symbol, resolution or config.DATA_RESOLUTION, params_hash]
+        if start_date:
+            query += " AND day >= ?"
+            params.append(str(start_date)[:10])
+        if end_date:
+            query += " AND day <= ?"
+            params.append(str(end_date)[:10])
+        query += " ORDER BY day"
+        
+        blocks = self.conn.execute(query, params).fetchall()
+        if not blocks:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='timestamp'))
+        columns = json.loads(blocks[0][0])
+        timestamps = np.concatenate([np.frombuffer(block[1], dtype=np.int64) for block in blocks])
+        values = np.concatenate([np.frombuffer(block[2], dtype=np.float64).reshape(-1, len(columns))
+                                 for block in blocks])
+        return pd.DataFrame(values, columns=columns,
+                            index=pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='timestamp'))
+    
+    def save_indicator_checkpoint(self, symbol, resolution, params_hash, last_timestamp, bars, state):
+        """
+        Save the state needed to extend stored indicators
+        
+        Args:
+            symbol (str): Stock symbol
+            resolution (str): Candle resolution
+            params_hash (str): Hash of the indicator set the state belongs to
+            last_timestamp (datetime): Timestamp of the last materialized candle
+            bars (int): Number of candles materialized
+            state (dict): JSON-serializable indicator state
+        """
+        try:
+            with self.conn:
+                self.conn.execute('''
+                    INSERT OR REPLACE INTO indicator_checkpoints
+                        (symbol, resolution, params_hash, last_timestamp, bars, state, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (symbol, resolution, params_hash,
+                      pd.Timestamp(last_timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+                      int(bars), json.dumps(state)))
+            return True
+        except Exception as e:
+            print(f"❌ Error saving indicator checkpoint for {symbol}: {e}")
+            return False
+    
+    def get_indicator_checkpoint(self, symbol, resolution, params_hash):
+        """
+        Get the saved indicator state
+        
+        Returns:
+            dict: last_timestamp, bars and state, or None if nothing is materialized
+        """
+        row = self.conn.execute('''
+            SELECT last_timestamp, bars, state FROM indicator_checkpoints
+            WHERE symbol = ? AND resolution = ? AND params_hash = ?
+        ''', (symbol, resolution, params_hash)).fetchone()
+        if row is None:
+            return None
+        return {'last_timestamp': pd.Timestamp(row[0]), 'bars': row[1], 'state': json.loads(row[2])}
+    
+    def clear_indicator_values(self, symbol, resolution):
+        """Delete every stored indicator and checkpoint of a symbol and resolution"""
+        with self.conn:
+            self.conn.execute("DELETE FROM indicator_blocks WHERE symbol = ? AND resolution = ?",
+                              (symbol, resolution))
+            self.conn.execute("DELETE FROM indicator_checkpoints WHERE symbol = ? AND resolution = ?",
+                              (symbol, resolution))
+    
     def insert_signal(self, symbol, strategy, timestamp, action, price, confidence=None):
         """
         Insert a trading signal into the database
@@ -213,6 +630,70 @@ class Database:
             print(f"❌ Error inserting signal: {e}")
             return False
     
+    def insert_signals(self, df, symbol=None, strategy=None, replace=False, period=None, strategies=None):
+        """
+        Insert many signals in a single transaction
+
+        Args:
+            df (pd.DataFrame): Signals with timestamp, action, price and
+                optionally confidence, symbol and strategy columns
+            symbol (str): Symbol applied to every row (default: the symbol column)
+            strategy (str): Strategy applied to every row (default: the strategy column)
+            replace (bool): First delete the stored signals of each
+                (symbol, strategy) over the evaluated period, so re-running a
+                strategy over the same candles does not duplicate them or
+                leave behind signals it no longer produces
+            period (tuple): (first, last) timestamp of the evaluated candles.
+                If None, each (symbol, strategy) is replaced between its first
+                and last new timestamp
+            strategies (list): Strategy names evaluated for ``symbol`` that are
+                replaced over ``period`` even if ``df`` has no rows for them
+
+        Returns:
+            int: Number of signals written, or -1 on error
+        """
+        cleared = list(strategies or []) if replace and period is not None and symbol else []
+        if df.empty and not cleared:
+            return 0
+
+        try:
+            if df.empty:
+                timestamps, symbols, names, rows = [], [], [], []
+            else:
+                n = len(df)
+                timestamps = pd.to_datetime(df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+                symbols = [symbol] * n if symbol else df['symbol'].tolist()
+                names = [strategy] * n if strategy else df['strategy'].tolist()
+                if 'confidence' in df.columns:
+                    confidences = [None if pd.isna(c) else float(c) for c in df['confidence']]
+                else:
+                    confidences = [None] * n
+                rows = list(zip(symbols, names, timestamps, df['action'].tolist(),
+                                df['price'].astype(float).tolist(), confidences))
+
+            with self.conn:
+                if replace:
+                    if period is not None:
+                        first, last = (pd.Timestamp(t).strftime('%Y-%m-%d %H:%M:%S') for t in period)
+                        pairs = dict.fromkeys(list(zip(symbols, names)) + [(symbol, name) for name in cleared])
+                        deletes = [(sym, strat, first, last) for sym, strat in pairs]
+                    else:
+                        ranges = pd.DataFrame({'symbol': symbols, 'strategy': names, 'timestamp': timestamps})
+                        ranges = ranges.groupby(['symbol', 'strategy'])['timestamp'].agg(['min', 'max'])
+                        deletes = [(sym, strat, first, last) for (sym, strat), (first, last) in ranges.iterrows()]
+                    self.conn.executemany('''
+                        DELETE FROM signals
+                        WHERE symbol = ? AND strategy = ? AND timestamp BETWEEN ? AND ?
+                    ''', deletes)
+                self.conn.executemany('''
+                    INSERT INTO signals (symbol, strategy, timestamp, action, price, confidence)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+            return len(rows)
+        except Exception as e:
+            print(f"❌ Error inserting signals: {e}")
+            return -1
+    
     def get_signals(self, symbol=None, strategy=None, limit=None):
         """
         Retrieve trading signals
@@ -246,6 +727,122 @@ class Database:
             print(f"❌ Error retrieving signals: {e}")
             return pd.DataFrame()
     
+    def add_stocks(self, symbols):
+        """
+        Add many stocks in one transaction, deriving name and exchange from the symbol
+        
+        Args:
+            symbols (list): Fyers symbols (e.g. 'NSE:RELIANCE-EQ')
+        """
+        rows = []
+        for symbol in symbols:
+            exchange, _, ticker = symbol.partition(':')
+            rows.append((symbol, ticker.rsplit('-', 1)[0] or symbol, exchange or None))
+        try:
+            with self.conn:
+                self.conn.executemany('''
+                    INSERT OR IGNORE INTO stocks (symbol, name, exchange)
+                    VALUES (?, ?, ?)
+                ''', rows)
+            return True
+        except Exception as e:
+            print(f"❌ Error adding stocks: {e}")
+            return False
+    
+    def mark_backfill_done(self, symbol, resolution, window_start, window_end, rows):
+        """
+        Record a completed backfill unit
+        
+        Args:
+            symbol (str): Stock symbol
+            resolution (str): Data resolution
+            window_start (str): First date of the window (YYYY-MM-DD)
+            window_end (str): Last date of the window (YYYY-MM-DD)
+            rows (int): Number of candles stored for the window
+        """
+        try:
+            with self.conn:
+                self.conn.execute('''
+                    INSERT OR REPLACE INTO backfill_checkpoints
+                        (symbol, resolution, window_start, window_end, rows)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (symbol, resolution, window_start, window_end, rows))
+            return True
+        except Exception as e:
+            print(f"❌ Error saving backfill checkpoint for {symbol}: {e}")
+            return False
+    
+    def get_backfill_checkpoints(self, resolution):
+        """
+        Get the completed backfill units for a resolution
+        
+        Args:
+            resolution (str): Data resolution
+            
+        Returns:
+            set: (symbol, window_start, window_end) tuples
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+            SELECT symbol, window_start, window_end FROM backfill_checkpoints
+            WHERE resolution = ?
+        ''', (resolution,))
+        return set(cursor.fetchall())
+    
+    def clear_backfill_checkpoints(self, resolution=None):
+        """Delete backfill checkpoints (all, or only for one resolution)"""
+        with self.conn:
+            if resolution:
+                self.conn.execute("DELETE FROM backfill_checkpoints WHERE resolution = ?", (resolution,))
+            else:
+                self.conn.execute("DELETE FROM backfill_checkpoints")
+    
+    def record_fetch_failure(self, endpoint, request_key, category, code, message, attempts):
+        """
+        Record an API call that failed after all retries
+        
+        Args:
+            endpoint (str): API endpoint name (e.g. 'history')
+            request_key (str): Identifies the request (e.g. symbol and date range)
+            category (str): Error category ('transient', 'rate_limited', 'auth', ...)
+            code (int): Fyers error code (optional)
+            message (str): Error message
+            attempts (int): Number of attempts made
+        """
+        try:
+            with self.conn:
+                self.conn.execute('''
+                    INSERT INTO fetch_failures (endpoint, request_key, category, code, message, attempts)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (endpoint, request_key, category, code if isinstance(code, int) else None,
+                      message, attempts))
+            return True
+        except Exception as e:
+            print(f"❌ Error recording fetch failure: {e}")
+            return False
+    
+    def get_fetch_failures(self, endpoint=None, limit=None):
+        """
+        Retrieve recorded fetch failures, most recent first
+        
+        Args:
+            endpoint (str): Filter by endpoint (optional)
+            limit (int): Maximum number of records
+            
+        Returns:
+            pd.DataFrame: Failure records
+        """
+        query = "SELECT * FROM fetch_failures"
+        params = []
+        if endpoint:
+            query += " WHERE endpoint = ?"
+            params.append(endpoint)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        return pd.read_sql_query(query, self.conn, params=params)
+    
     def get_all_stocks(self):
         """Get list of all stocks in database"""
         try:
@@ -0,0 +1,286 @@
+"""
+Indicator Kernels module for PTIP
+Pure-NumPy kernels behind the backend='numpy' option of modules/indicators.py
+
+Every kernel works along axis 0, so a 1-D array is one series and a 2-D
+array is one series per column. NaN handling follows pandas
+rolling(min_periods=window): a window containing a NaN gives NaN.
+"""
+
+import numpy as np
+
+
+# Rows per chunk of the centred running sums; bounds both the rounding error
+# of the sums and the size of the temporaries
+CHUNK_SIZE = 4096
+
+
+def _as_2d(x):
+    """Return x as a float (n, k) array plus the shape to restore"""
+    x = np.asarray(x, dtype=float)
+    return x.reshape(x.shape[0], -1), x.shape
+
+
+def _complete_windows(missing, window):
+    """
+    Mask of windows without NaN, for rows window-1 .. n-1
+
+    Returns:
+        np.ndarray: Boolean mask, or True when the series has no NaN at all
+    """
+    if not missing.any():
+        return True
+    counts = np.zeros((missing.shape[0] + 1, missing.shape[1]), dtype=np.int64)
+    np.cumsum(missing, axis=0, out=counts[1:])
+    return counts[window:] == counts[:-window]
+
+
+def rolling_moments_multi(x2, windows, with_std=False):
+    """
+    Rolling means (and sample standard deviations) for several windows at once
+
+    The series is processed in overlapping chunks whose running sums are
+    taken relative to the chunk's own mean, so their rounding error depends
+    on the chunk length and the local price range rather than on the length
+    of the series. The running sums and run lengths of a chunk, and the NaN
+    counts of the series, are computed once and shared by every window.
+
+    Args:
+        x2 (np.ndarray): (n, k) float values
+        windows (list): Window lengths
+        with_std (bool): Also compute the standard deviations
+
+    Returns:
+        tuple: (mean, std) of shape (len(windows), n, k) (std is None unless with_std)
+    """
+    n, k = x2.shape
+    windows = [int(window) for window in windows]
+    mean = np.full((len(windows), n, k), np.nan)
+    std = np.full((len(windows), n, k), np.nan) if with_std else None
+    if not windows or n < min(windows):
+        return mean, std
+
+    missing = np.isnan(x2)
+    has_nan = missing.any()
+    widest = max(windows)
+
+    step = max(CHUNK_SIZE, widest)
+    running = np.zeros((step + widest, k))
+    running_squares = np.zeros((step + widest, k)) if with_std else None
+    positions = np.arange(step + widest)[:, None]
+    for end in range(min(windows) - 1, n, step):
+        stop = min(end + step, n)
+        base = max(end - widest + 1, 0)
+        segment = x2[base:stop]
+        size = len(segment)
+        if has_nan:
+            valid = ~np.isnan(segment)
+            local = np.where(valid, segment, 0.0).sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+            deviations = np.where(valid, segment - local, 0.0)
+        else:
+            local = segment.mean(axis=0)
+            deviations = segment - local
+
+        prefix = running[:size + 1]
+        np.cumsum(deviations, axis=0, out=prefix[1:])
+        if with_std:
+            prefix_squares = running_squares[:size + 1]
+            np.cumsum(deviations * deviations, axis=0, out=prefix_squares[1:])
+
+        # Rows since the value last changed: a window is constant when this
+        # covers it
+        last_change = np.zeros((size, k), dtype=np.int64)
+        last_change[1:] = np.where(segment[1:] != segment[:-1], positions[1:size], 0)
+        np.maximum.accumulate(last_change, axis=0, out=last_change)
+        run = positions[:size] - last_change
+        longest_run = run.max()
+
+        for j, window in enumerate(windows):
+            first = max(end, window - 1)
+            if first >= stop:
+                continue
+            lo = first - base
+            out = mean[j, first:stop]
+            np.subtract(prefix[lo + 1:], prefix[lo + 1 - window:size + 1 - window], out=out)
+
+            if with_std and window > 1:
+                s2 = prefix_squares[lo + 1:] - prefix_squares[lo + 1 - window:size + 1 - window]
+                s2 -= out * out / window
+                s2 /= window - 1
+                np.sqrt(np.maximum(s2, 0.0, out=s2), out=std[j, first:stop])
+
+            out /= window
+            out += local
+
+            # Like pandas, windows of one repeated value are exact (RSI relies on
+            # an all-zero window of losses giving 0, not a rounding residue)
+            if longest_run >= window - 1:
+                constant = run[lo:] >= window - 1
+                np.copyto(out, segment[lo:], where=constant)
+                if with_std and window > 1:
+                    np.copyto(std[j, first:stop], 0.0, where=constant)
+
+    if has_nan:
+        counts = np.zeros((n + 1, k), dtype=np.int64)
+        np.cumsum(missing, axis=0, out=counts[1:])
+        for j, window in enumerate(windows):
+            if window > n:
+                continue
+            incomplete = counts[window:] != counts[:-window]
+            mean[j, window - 1:][incomplete] = np.nan
+            if with_std:
+                std[j, window - 1:][incomplete] = np.nan
+    return mean, std
+
+
+def _rolling_moments(x, window, with_std):
+    """
+    Rolling mean (and sample standard deviation) along axis 0
+
+    Returns:
+        tuple: (mean, std) with the shape of x (std is None unless with_std)
+    """
+    x2, shape = _as_2d(x)
+    mean, std = rolling_moments_multi(x2, [window], with_std)
+    return mean[0].reshape(shape), std[0].reshape(shape) if with_std else None
+
+
+def rolling_mean(x, window):
+    """
+    Simple moving average over a fixed window
+
+    Args:
+        x (np.ndarray): Values, 1-D or 2-D (series along axis 0)
+        window (int): Window length
+
+    Returns:
+        np.ndarray: Same shape as x, NaN until the window is complete
+    """
+    return _rolling_moments(x, window, with_std=False)[0]
+
+
+def rolling_mean_std(x, window):
+    """
+    Moving average and sample standard deviation (ddof=1) in one pass
+
+    Returns:
+        tuple: (mean, std), each with the same shape as x
+    """
+    return _rolling_moments(x, window, with_std=True)
+
+
+def rolling_mean_sweep(x, windows):
+    """
+    Simple moving averages of one series for many windows
+
+    Args:
+        x (np.ndarray): 1-D values
+        windows (list): Window lengths
+
+    Returns:
+        np.ndarray: (n, len(windows)), column j for windows[j]
+    """
+    return rolling_moments_multi(_as_2d(x)[0], windows, with_std=False)[0][:, :, 0].T
+
+
+def rolling_mean_std_sweep(x, windows):
+    """
+    Moving averages and sample standard deviations of one series for many windows
+
+    Returns:
+        tuple: (mean, std), each (n, len(windows))
+    """
+    mean, std = rolling_moments_multi(_as_2d(x)[0], windows, with_std=True)
+    return mean[:, :, 0].T, std[:, :, 0].T
+
+
+def _rolling_extreme(x, window, op, fill):
+    """
+    van Herk/Gil-Werman rolling extreme
+
+    The vectorized form of a monotonic deque: prefix and suffix extremes
+    within blocks of the window length give every window's extreme with two
+    comparisons per value, independent of the window length.
+    """
+    x2, shape = _as_2d(x)
+    n, k = x2.shape
+    out = np.full(x2.shape, np.nan)
+    if n < window:
+        return out.reshape(shape)
+
+    missing = np.isnan(x2)
+    blocks = -(-n // window)
+    padded = np.full((blocks * window, k), fill)
+    padded[:n] = np.where(missing, fill, x2)
+
+    shaped = padded.reshape(blocks, window, k)
+    prefix = op.accumulate(shaped, axis=1).reshape(-1, k)
+    suffix = op.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(-1, k)
+
+    extreme = op(suffix[:n - window + 1], prefix[window - 1:n])
+    complete = _complete_windows(missing, window)
+    out[window - 1:] = np.where(complete, extreme, np.nan)
+    return out.reshape(shape)
+
+
+def rolling_max(x, window):
+    """Rolling maximum along axis 0 (NaN until the window is complete)"""
+    return _rolling_extreme(x, window, np.maximum, -np.inf)
+
+
+def rolling_min(x, window):
+    """Rolling minimum along axis 0 (NaN until the window is complete)"""
+    return _rolling_extreme(x, window, np.minimum, np.inf)
+
+
+def previous(x):
+    """Shift values down one row along axis 0, as Series.shift() does"""
+    x = np.asarray(x, dtype=float)
+    out = np.empty_like(x)
+    out[:1] = np.nan
+    out[1:] = x[:-1]
+    return out
+
+
+def true_range(high, low, close):
+    """
+    True range in one fused expression
+
+    Like DataFrame.max(axis=1), NaN components are skipped, so the first
+    bar's true range is its high - low.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    prev_close = previous(close)
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def rsi(close, period=14):
+    """RSI with rolling-mean gains and losses, as calculate_rsi computes it"""
+    close = np.asarray(close, dtype=float)
+    delta = close - previous(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = rolling_mean(gain, period) / rolling_mean(loss, period)
+        return 100 - (100 / (1 + rs))
+
+
+def stochastic(high, low, close, k_period=14, d_period=3):
+    """Stochastic %K and %D"""
+    lowest_low = rolling_min(low, k_period)
+    highest_high = rolling_max(high, k_period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100 * ((np.asarray(close, dtype=float) - lowest_low) / (highest_high - lowest_low))
+    return k, rolling_mean(k, d_period)
+
+
+def atr(high, low, close, period=14):
+    """Average true range"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def bollinger_bands(close, period=20, num_std=2):
+    """Bollinger Bands (upper, middle, lower) from one mean/std pass"""
+    middle, std = rolling_mean_std(close, period)
+    return middle + std * num_std, middle, middle - std * num_std
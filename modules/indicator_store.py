@@ -0,0 +1,182 @@
+"""
+Indicator Store module for PTIP
+Materializes indicator columns in the database and extends them as candles arrive
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import INDICATOR_PARAMS, add_all_indicators, add_indicators_incremental, indicator_state
+import config
+
+
+def params_hash(indicator, params):
+    """
+    Stable short hash of an indicator and its parameters
+
+    Args:
+        indicator (str): Indicator column name
+        params (dict): JSON-serializable parameters
+
+    Returns:
+        str: 16 hex characters
+    """
+    payload = json.dumps({'indicator': indicator, 'params': params}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# Every column of a day block and the incremental state come from one pass of
+# add_all_indicators, so they are keyed by a hash of the whole parameter set;
+# changing any parameter never serves stale values
+INDICATOR_SET_HASH = params_hash('add_all_indicators', INDICATOR_PARAMS)
+
+
+class IndicatorStore:
+    """
+    Keeps indicator_blocks in step with price_data
+
+    materialize() computes only the candles added since the last call, using
+    the incremental state saved with the values. If candles were inserted or
+    rewritten at or before the saved checkpoint (e.g. an older archive was
+    imported, or a candle was corrected), the symbol is rebuilt from scratch:
+    upsert_price_data drops the checkpoint, and a candle count that no longer
+    matches it catches other writes.
+
+    Values are stored as one float64 matrix per trading day, so load() reads
+    a few blobs per symbol instead of one row per bar and indicator.
+    """
+
+    def __init__(self, db):
+        """
+        Initialize the store
+
+        Args:
+            db (Database): Database holding price_data and indicator_blocks
+        """
+        self.db = db
+        self.columns = list(INDICATOR_PARAMS)
+
+    def materialize(self, symbol, resolution=None):
+        """
+        Bring stored indicators up to date for one symbol
+
+        Args:
+            symbol (str): Stock symbol
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+
+        Returns:
+            int: Number of candles computed (0 if already current), or -1 on error
+        """
+        resolution = resolution or config.DATA_RESOLUTION
+        checkpoint = self.db.get_indicator_checkpoint(symbol, resolution, INDICATOR_SET_HASH)
+
+        if checkpoint is not None:
+            stored = self.db.count_price_data(symbol, resolution, checkpoint['last_timestamp'])
+            if stored != checkpoint['bars']:
+                print(f"⚠️  {symbol}: history changed before the indicator checkpoint, rebuilding")
+                checkpoint = None
+            elif self.db.count_price_data(symbol, resolution) == stored:
+                return 0
+
+        if checkpoint is None:
+            self.db.clear_indicator_values(symbol, resolution)
+            prices = self.db.get_price_data(symbol, resolution=resolution)
+            if prices.empty:
+                return 0
+            df = add_all_indicators(prices)
+            state = indicator_state(df)
+        else:
+            last_timestamp = checkpoint['last_timestamp']
+            prices = self.db.get_price_data(symbol, start_date=str(last_timestamp), resolution=resolution)
+            prices = prices[prices['timestamp'] > last_timestamp]
+            if prices.empty:
+                return 0
+            df, state = add_indicators_incremental(prices, checkpoint['state'])
+
+        if self.db.upsert_indicator_blocks(df, symbol, resolution, INDICATOR_SET_HASH, self.columns) < 0:
+            return -1
+        self.db.save_indicator_checkpoint(symbol, resolution, INDICATOR_SET_HASH,
+                                          df['timestamp'].iloc[-1], state['bars'], state)
+        return len(df)
+
+    def materialize_all(self, symbols=None, resolution=None):
+        """
+        Bring stored indicators up to date for many symbols
+
+        Args:
+            symbols (list): Symbols to update. If None, every symbol in the stocks table
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+
+        Returns:
+            int: Total number of candles computed
+        """
+        if symbols is None:
+            symbols = self.db.get_all_stocks()['symbol'].tolist()
+        total = 0
+        for symbol in symbols:
+            computed = self.materialize(symbol, resolution)
+            if computed > 0:
+                total += computed
+        return total
+
+    def rebuild(self, symbol, resolution=None):
+        """Discard stored indicators for a symbol and compute them again"""
+        resolution = resolution or config.DATA_RESOLUTION
+        self.db.clear_indicator_values(symbol, resolution)
+        return self.materialize(symbol, resolution)
+
+    def load(self, symbol, start_date=None, end_date=None, resolution=None, indicators=None, refresh=True):
+        """
+        Load candles with their stored indicators
+
+        Args:
+            symbol (str): Stock symbol
+            start_date (str): Start date (YYYY-MM-DD format)
+            end_date (str): End date (YYYY-MM-DD format)
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+            indicators (list): Indicator columns to load (default: all)
+            refresh (bool): Materialize new candles before reading
+
+        Returns:
+            pd.DataFrame: price_data rows with indicator columns, as add_all_indicators returns
+        """
+        if refresh:
+            self.materialize(symbol, resolution)
+
+        prices = self.db.get_price_data(symbol, start_date, end_date, resolution=resolution)
+        if prices.empty:
+            return prices
+
+        names = self.columns if indicators is None else list(indicators)
+        values = self.db.get_indicator_blocks(symbol, INDICATOR_SET_HASH, resolution, start_date, end_date)
+        values = values.reindex(index=pd.DatetimeIndex(prices['timestamp']), columns=names)
+        values.index = prices.index
+        return pd.concat([prices, values], axis=1)
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Indicator Store module...")
+
+    from modules.database import Database
+
+    db = Database()
+    store = IndicatorStore(db)
+
+    computed = store.materialize_all()
+    print(f"\nComputed indicators for {computed:,} candles")
+
+    stocks = db.get_all_stocks()
+    if not stocks.empty:
+        df = store.load(stocks['symbol'].iloc[0], refresh=False)
+        print(df[['timestamp', 'close', 'rsi', 'ma_20', 'macd']].tail())
+
+    db.close()
+    print("\n✅ Indicator Store module test completed!")
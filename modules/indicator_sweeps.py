@@ -0,0 +1,140 @@
+"""
+Indicator Sweeps module for PTIP
+Computes one indicator family for many parameter values over the same series
+
+Each sweep shares its intermediates across the whole grid: the price
+changes, gains and losses of an RSI sweep are computed once, and every
+window of a moving-average or Bollinger sweep is read from the same chunked
+running sums (see modules/indicator_kernels.py). Results are 2-D, one
+column per parameter value.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import indicator_kernels as kernels
+
+
+def _values(prices):
+    """Prices as a 1-D float array"""
+    values = np.asarray(prices, dtype=float)
+    if values.ndim != 1:
+        raise ValueError("Sweeps take a single price series")
+    return values
+
+
+def _result(values, prices, columns):
+    """Wrap a sweep result as a DataFrame when the prices were a Series"""
+    if isinstance(prices, pd.Series):
+        return pd.DataFrame(values, index=prices.index, columns=columns)
+    return values
+
+
+def sma_sweep(prices, periods):
+    """
+    Simple moving averages for many periods
+
+    Args:
+        prices (pd.Series or np.ndarray): Price series
+        periods (list): MA periods, e.g. range(10, 201)
+
+    Returns:
+        pd.DataFrame or np.ndarray: One column per period (columns named by
+            period for a Series input), equal to calculate_moving_average
+    """
+    periods = [int(period) for period in periods]
+    means = kernels.rolling_mean_sweep(_values(prices), periods)
+    return _result(means, prices, pd.Index(periods, name='period'))
+
+
+def rsi_sweep(prices, periods):
+    """
+    RSI for many periods
+
+    The price changes and the gain/loss split are computed once; the average
+    gains and losses of every period come from one pass of running sums.
+
+    Args:
+        prices (pd.Series or np.ndarray): Price series
+        periods (list): RSI periods, e.g. range(5, 31)
+
+    Returns:
+        pd.DataFrame or np.ndarray: One column per period, equal to calculate_rsi
+    """
+    periods = [int(period) for period in periods]
+    close = _values(prices)
+    delta = close - kernels.previous(close)
+    moves = np.column_stack([np.where(delta > 0, delta, 0.0), np.where(delta < 0, -delta, 0.0)])
+
+    averages = kernels.rolling_moments_multi(moves, periods)[0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = averages[:, :, 0].T / averages[:, :, 1].T
+        rsi = 100 - (100 / (1 + rs))
+    return _result(rsi, prices, pd.Index(periods, name='period'))
+
+
+def bollinger_sweep(prices, periods=(20,), num_stds=(2,)):
+    """
+    Bollinger Bands for a grid of periods and widths
+
+    The mean and standard deviation of each period are computed once (all
+    periods in one pass) and shared by every width.
+
+    Args:
+        prices (pd.Series or np.ndarray): Price series
+        periods (list): MA periods
+        num_stds (list): Band widths in standard deviations, e.g. [1.5, 2, 2.5, 3]
+
+    Returns:
+        tuple: (upper, middle, lower). upper and lower have one column per
+            (period, num_std) pair, period-major; middle has one per period
+    """
+    periods = [int(period) for period in periods]
+    num_stds = [float(num_std) for num_std in num_stds]
+    middle, std = kernels.rolling_mean_std_sweep(_values(prices), periods)
+
+    widths = np.asarray(num_stds)
+    spread = (std[:, :, None] * widths).reshape(len(middle), -1)
+    centre = np.repeat(middle, len(widths), axis=1)
+
+    grid = pd.MultiIndex.from_product([periods, num_stds], names=['period', 'num_std'])
+    return (_result(centre + spread, prices, grid),
+            _result(middle, prices, pd.Index(periods, name='period')),
+            _result(centre - spread, prices, grid))
+
+
+# Test function
+if __name__ == "__main__":
+    import time
+
+    from modules.indicators import calculate_moving_average, calculate_rsi
+
+    print("Testing Indicator Sweeps module...")
+
+    np.random.seed(42)
+    prices = pd.Series(1000 + np.cumsum(np.random.randn(200_000)))
+
+    start = time.perf_counter()
+    rsi = rsi_sweep(prices, range(5, 31))
+    sma = sma_sweep(prices, range(10, 201))
+    upper, middle, lower = bollinger_sweep(prices, [20, 50], [1.5, 2, 2.5, 3])
+    sweep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for period in range(5, 31):
+        calculate_rsi(prices, period)
+    for period in range(10, 201):
+        calculate_moving_average(prices, period)
+    loop_time = time.perf_counter() - start
+
+    print(f"\nRSI {rsi.shape}, SMA {sma.shape}, Bollinger {upper.shape}")
+    print(f"Sweeps: {sweep_time:.2f}s, one call per parameter: {loop_time:.2f}s")
+    print(f"Largest RSI(14) difference: {np.nanmax(np.abs(rsi[14] - calculate_rsi(prices, 14))):.2e}")
+
+    print("\n✅ Indicator Sweeps module test completed!")
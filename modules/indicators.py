@@ -3,21 +3,122 @@ Technical Indicators module for PTIP
 Calculates various technical indicators for trading strategies
 """
 
+import functools
+import inspect
+import os
+import re
+import sys
+
 import pandas as pd
 import numpy as np
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import indicator_kernels as kernels
+
+
+# 'pandas' uses pandas rolling/ewm; 'numpy' uses the kernels in
+# modules/indicator_kernels.py (EMAs stay on pandas ewm in both)
+BACKENDS = ('pandas', 'numpy')
+
+
+def _check_backend(backend):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+
+
+# Storage precision of indicator outputs. Indicators are always computed in
+# float64; 'float32' rounds each finished value once, so it stays within
+# half a float32 ulp (relative error 2**-24) of the float64 result.
+PRECISIONS = {'float64': np.float64, 'float32': np.float32}
+
+# Price columns stored as float32 by compact_prices=True
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+
+
+def _check_precision(precision):
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}', expected one of {tuple(PRECISIONS)}")
+
+
+def _store(values, precision):
+    """Round finished indicator values to the storage precision"""
+    if precision == 'float64':
+        return values
+    return values.astype(PRECISIONS[precision])
+
+
+def _like(values, reference):
+    """Return kernel output as a Series/DataFrame aligned with a pandas input"""
+    if isinstance(reference, pd.Series):
+        return pd.Series(values, index=reference.index)
+    if isinstance(reference, pd.DataFrame):
+        return pd.DataFrame(values, index=reference.index, columns=reference.columns)
+    return values
+
+
+def _accepts_arrays(function):
+    """
+    Let the pandas backend of an indicator function take NumPy arrays
+    
+    Array arguments (1-D, or 2-D with one series per column) are wrapped in
+    DataFrames and the results are returned as arrays of the input shape.
+    The numpy backend takes arrays natively and is called unchanged.
+    """
+    signature = inspect.signature(function)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if bound.arguments['backend'] != 'pandas':
+            return function(*args, **kwargs)
+
+        shape = None
+        for name, value in bound.arguments.items():
+            if isinstance(value, np.ndarray):
+                shape = value.shape
+                bound.arguments[name] = pd.DataFrame(value.reshape(len(value), -1).astype(float))
+        result = function(*bound.args, **bound.kwargs)
+        if shape is None:
+            return result
+        if isinstance(result, tuple):
+            return tuple(part.to_numpy().reshape(shape) for part in result)
+        return result.to_numpy().reshape(shape)
+
+    return wrapper
+
+
+def _pandas_true_range(high, low, close):
+    """True range of Series or wide DataFrames (one column per symbol)"""
+    tr1 = high - low
+    tr2 = abs(high - close.shift())
+    tr3 = abs(low - close.shift())
+    if isinstance(close, pd.DataFrame):
+        # Element-wise maximum per symbol; fmax skips NaN like max(axis=1)
+        return np.fmax(np.fmax(tr1, tr2), tr3)
+    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
 
-def calculate_rsi(prices, period=14):
+@_accepts_arrays
+def calculate_rsi(prices, period=14, backend='pandas'):
     """
     Calculate Relative Strength Index (RSI)
     
     Args:
-        prices (pd.Series): Price series (typically close prices)
+        prices (pd.Series): Price series (typically close prices), or a wide
+            DataFrame / 2-D array with one column per symbol
         period (int): RSI period (default: 14)
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         pd.Series: RSI values
     """
+    _check_backend(backend)
+    if backend == 'numpy':
+        return _like(kernels.rsi(prices, period), prices)
+    
     # Calculate price changes
     delta = prices.diff()
     
@@ -36,35 +137,49 @@ def calculate_rsi(prices, period=14):
     return rsi
 
 
-def calculate_moving_average(prices, period):
+@_accepts_arrays
+def calculate_moving_average(prices, period, backend='pandas'):
     """
     Calculate Simple Moving Average (SMA)
     
     Args:
         prices (pd.Series): Price series
         period (int): MA period
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         pd.Series: Moving average values
     """
+    _check_backend(backend)
+    if backend == 'numpy':
+        return _like(kernels.rolling_mean(prices, period), prices)
     return prices.rolling(window=period, min_periods=period).mean()
 
 
-def calculate_ema(prices, period):
+def calculate_ema(prices, period, backend='pandas'):
     """
     Calculate Exponential Moving Average (EMA)
     
+    The recursion has no faster vectorized form, so both backends use
+    pandas ewm; the numpy backend also accepts arrays.
+    
     Args:
         prices (pd.Series): Price series
         period (int): EMA period
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         pd.Series: EMA values
     """
+    _check_backend(backend)
+    if not isinstance(prices, (pd.Series, pd.DataFrame)):
+        values = np.asarray(prices, dtype=float)
+        ema = pd.DataFrame(values.reshape(len(values), -1)).ewm(span=period, adjust=False).mean()
+        return ema.to_numpy().reshape(values.shape)
     return prices.ewm(span=period, adjust=False).mean()
 
 
-def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
+def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9, backend='pandas'):
     """
     Calculate MACD (Moving Average Convergence Divergence)
     
@@ -73,19 +188,20 @@ def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
         fast_period (int): Fast EMA period (default: 12)
         slow_period (int): Slow EMA period (default: 26)
         signal_period (int): Signal line period (default: 9)
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         tuple: (macd_line, signal_line, histogram)
     """
     # Calculate EMAs
-    ema_fast = calculate_ema(prices, fast_period)
-    ema_slow = calculate_ema(prices, slow_period)
+    ema_fast = calculate_ema(prices, fast_period, backend)
+    ema_slow = calculate_ema(prices, slow_period, backend)
     
     # MACD line
     macd_line = ema_fast - ema_slow
     
     # Signal line
-    signal_line = calculate_ema(macd_line, signal_period)
+    signal_line = calculate_ema(macd_line, signal_period, backend)
     
     # Histogram
     histogram = macd_line - signal_line
@@ -93,7 +209,8 @@ def calculate_macd(prices, fast_period=12, slow_period=26, signal_period=9):
     return macd_line, signal_line, histogram
 
 
-def calculate_bollinger_bands(prices, period=20, num_std=2):
+@_accepts_arrays
+def calculate_bollinger_bands(prices, period=20, num_std=2, backend='pandas'):
     """
     Calculate Bollinger Bands
     
@@ -101,10 +218,16 @@ def calculate_bollinger_bands(prices, period=20, num_std=2):
         prices (pd.Series): Price series
         period (int): MA period (default: 20)
         num_std (int): Number of standard deviations (default: 2)
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         tuple: (upper_band, middle_band, lower_band)
     """
+    _check_backend(backend)
+    if backend == 'numpy':
+        bands = kernels.bollinger_bands(prices, period, num_std)
+        return tuple(_like(band, prices) for band in bands)
+    
     # Middle band (SMA)
     middle_band = calculate_moving_average(prices, period)
     
@@ -118,7 +241,8 @@ def calculate_bollinger_bands(prices, period=20, num_std=2):
     return upper_band, middle_band, lower_band
 
 
-def calculate_stochastic(high, low, close, k_period=14, d_period=3):
+@_accepts_arrays
+def calculate_stochastic(high, low, close, k_period=14, d_period=3, backend='pandas'):
     """
     Calculate Stochastic Oscillator
     
@@ -128,10 +252,16 @@ def calculate_stochastic(high, low, close, k_period=14, d_period=3):
         close (pd.Series): Close prices
         k_period (int): %K period (default: 14)
         d_period (int): %D period (default: 3)
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         tuple: (%K, %D)
     """
+    _check_backend(backend)
+    if backend == 'numpy':
+        k, d = kernels.stochastic(high, low, close, k_period, d_period)
+        return _like(k, close), _like(d, close)
+    
     # Lowest low and highest high over the period
     lowest_low = low.rolling(window=k_period, min_periods=k_period).min()
     highest_high = high.rolling(window=k_period, min_periods=k_period).max()
@@ -145,7 +275,8 @@ def calculate_stochastic(high, low, close, k_period=14, d_period=3):
     return k, d
 
 
-def calculate_atr(high, low, close, period=14):
+@_accepts_arrays
+def calculate_atr(high, low, close, period=14, backend='pandas'):
     """
     Calculate Average True Range (ATR)
     
@@ -154,17 +285,17 @@ def calculate_atr(high, low, close, period=14):
         low (pd.Series): Low prices
         close (pd.Series): Close prices
         period (int): ATR period (default: 14)
+        backend (str): 'pandas' or 'numpy'
         
     Returns:
         pd.Series: ATR values
     """
-    # True Range components
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
+    _check_backend(backend)
+    if backend == 'numpy':
+        return _like(kernels.atr(high, low, close, period), close)
     
-    # True Range (maximum of the three)
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    # True Range (maximum of high - low and the gaps from the previous close)
+    tr = _pandas_true_range(high, low, close)
     
     # ATR (moving average of TR)
     atr = tr.rolling(window=period, min_periods=period).mean()
@@ -172,44 +303,611 @@ def calculate_atr(high, low, close, period=14):
     return atr
 
 
-def add_all_indicators(df):
+# Indicator registry: every named output declares the columns or other
+# outputs it is computed from, so compute_indicators() evaluates only the
+# subgraph a caller asks for and shares intermediates (close.diff(), EMAs,
+# rolling std) between the outputs that use them.
+
+# Input columns of the OHLCV frame
+SOURCE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Parameters of every column added by add_all_indicators, in column order. The
+# registry entries below, the incremental update and the indicator store all
+# read them from here. ma_/ema_ columns are named after their period.
+INDICATOR_PARAMS = {
+    'rsi': {'function': 'rsi', 'period': 14, 'smoothing': 'sma'},
+    'ma_20': {'function': 'sma', 'period': 20},
+    'ma_50': {'function': 'sma', 'period': 50},
+    'ma_200': {'function': 'sma', 'period': 200},
+    'ema_12': {'function': 'ema', 'period': 12},
+    'ema_26': {'function': 'ema', 'period': 26},
+    'macd': {'function': 'macd', 'output': 'line', 'fast': 12, 'slow': 26, 'signal': 9},
+    'macd_signal': {'function': 'macd', 'output': 'signal', 'fast': 12, 'slow': 26, 'signal': 9},
+    'macd_histogram': {'function': 'macd', 'output': 'histogram', 'fast': 12, 'slow': 26, 'signal': 9},
+    'bb_upper': {'function': 'bollinger', 'output': 'upper', 'period': 20, 'num_std': 2},
+    'bb_middle': {'function': 'bollinger', 'output': 'middle', 'period': 20, 'num_std': 2},
+    'bb_lower': {'function': 'bollinger', 'output': 'lower', 'period': 20, 'num_std': 2},
+    'stoch_k': {'function': 'stochastic', 'output': 'k', 'k_period': 14, 'd_period': 3},
+    'stoch_d': {'function': 'stochastic', 'output': 'd', 'k_period': 14, 'd_period': 3},
+    'atr': {'function': 'atr', 'period': 14}
+}
+
+# Columns added by add_all_indicators, in order
+INDICATOR_COLUMNS = list(INDICATOR_PARAMS)
+
+
+class IndicatorNode:
+    """
+    One named output of the registry
+    
+    Attributes:
+        name (str): Output name, e.g. 'rsi_14'
+        inputs (tuple): Names of the source columns or outputs it depends on
+        compute (callable): compute(*input_values, backend) -> values
+    """
+
+    def __init__(self, name, inputs, compute):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+    def __repr__(self):
+        return f"IndicatorNode({self.name!r}, inputs={self.inputs})"
+
+
+# Fixed names -> (inputs, compute); parametric names are matched by pattern
+_INDICATORS = {}
+_PARAMETRIC_INDICATORS = []
+
+
+def register_indicator(name, inputs):
+    """
+    Decorator registering a fixed-name indicator
+    
+    Args:
+        name (str): Output name
+        inputs (list): Names of the source columns or outputs it depends on
+    """
+    def decorator(compute):
+        _INDICATORS[name] = (tuple(inputs), compute)
+        return compute
+    return decorator
+
+
+def register_parametric_indicator(pattern):
+    """
+    Decorator registering a family of indicators such as 'ma_<period>'
+    
+    The decorated factory receives the integer parameters captured by the
+    pattern and returns (inputs, compute).
+    
+    Args:
+        pattern (str): Regular expression matched against the full name
+    """
+    def decorator(factory):
+        _PARAMETRIC_INDICATORS.append((re.compile(pattern), factory))
+        return factory
+    return decorator
+
+
+def resolve_indicator(name):
+    """
+    Look up the node that computes a named output
+    
+    Args:
+        name (str): Output name, e.g. 'rsi', 'rsi_21', 'ma_100', 'ema_9'
+        
+    Returns:
+        IndicatorNode: The node (inputs and compute function)
+        
+    Raises:
+        KeyError: If no registered indicator produces the name
+    """
+    if name in _INDICATORS:
+        inputs, compute = _INDICATORS[name]
+        return IndicatorNode(name, inputs, compute)
+    for pattern, factory in _PARAMETRIC_INDICATORS:
+        match = pattern.fullmatch(name)
+        if match:
+            inputs, compute = factory(*(int(group) for group in match.groups()))
+            return IndicatorNode(name, inputs, compute)
+    raise KeyError(f"Unknown indicator '{name}'")
+
+
+def indicator_dependencies(columns, available=()):
+    """
+    Every output needed for the requested columns, in evaluation order
+    
+    Args:
+        columns (list): Requested output names
+        available (iterable): Outputs that are already computed; they are
+            used as they are and their own dependencies are not visited
+        
+    Returns:
+        list: Output names (source and available columns excluded), dependencies first
+    """
+    available = set(available)
+    order = []
+
+    def visit(name):
+        if name in SOURCE_COLUMNS or name in available or name in order:
+            return
+        for dependency in resolve_indicator(name).inputs:
+            visit(dependency)
+        order.append(name)
+
+    for column in columns:
+        visit(column)
+    return order
+
+
+def _rolling_std(values, period, backend):
+    if backend == 'numpy':
+        return _like(kernels.rolling_mean_std(values, period)[1], values)
+    return values.rolling(window=period, min_periods=period).std()
+
+
+def _rolling_min(values, period, backend):
+    if backend == 'numpy':
+        return _like(kernels.rolling_min(values, period), values)
+    return values.rolling(window=period, min_periods=period).min()
+
+
+def _rolling_max(values, period, backend):
+    if backend == 'numpy':
+        return _like(kernels.rolling_max(values, period), values)
+    return values.rolling(window=period, min_periods=period).max()
+
+
+@register_indicator('delta', ['close'])
+def _delta(close, backend):
+    if backend == 'numpy':
+        return _like(np.asarray(close, dtype=float) - kernels.previous(close), close)
+    return close.diff()
+
+
+@register_indicator('true_range', ['high', 'low', 'close'])
+def _true_range(high, low, close, backend):
+    if backend == 'numpy':
+        return _like(kernels.true_range(high, low, close), close)
+    return _pandas_true_range(high, low, close)
+
+
+@register_parametric_indicator(r'rsi_(\d+)')
+def _rsi(period):
+    def compute(delta, backend):
+        if backend == 'numpy':
+            values = np.asarray(delta, dtype=float)
+            gain = _like(np.where(values > 0, values, 0.0), delta)
+            loss = _like(np.where(values < 0, -values, 0.0), delta)
+        else:
+            gain = delta.where(delta > 0, 0)
+            loss = -delta.where(delta < 0, 0)
+        avg_gain = calculate_moving_average(gain, period, backend)
+        avg_loss = calculate_moving_average(loss, period, backend)
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+    return ['delta'], compute
+
+
+@register_parametric_indicator(r'ma_(\d+)')
+def _moving_average(period):
+    return ['close'], lambda close, backend: calculate_moving_average(close, period, backend)
+
+
+@register_parametric_indicator(r'ema_(\d+)')
+def _ema(period):
+    return ['close'], lambda close, backend: calculate_ema(close, period, backend)
+
+
+@register_parametric_indicator(r'std_(\d+)')
+def _std(period):
+    return ['close'], lambda close, backend: _rolling_std(close, period, backend)
+
+
+@register_parametric_indicator(r'lowest_low_(\d+)')
+def _lowest_low(period):
+    return ['low'], lambda low, backend: _rolling_min(low, period, backend)
+
+
+@register_parametric_indicator(r'highest_high_(\d+)')
+def _highest_high(period):
+    return ['high'], lambda high, backend: _rolling_max(high, period, backend)
+
+
+@register_parametric_indicator(r'atr_(\d+)')
+def _atr(period):
+    return ['true_range'], lambda tr, backend: calculate_moving_average(tr, period, backend)
+
+
+@register_indicator('rsi', [f"rsi_{INDICATOR_PARAMS['rsi']['period']}"])
+def _default_rsi(rsi, backend):
+    return rsi
+
+
+@register_indicator('atr', [f"atr_{INDICATOR_PARAMS['atr']['period']}"])
+def _default_atr(atr, backend):
+    return atr
+
+
+@register_indicator('macd', [f"ema_{INDICATOR_PARAMS['macd']['fast']}", f"ema_{INDICATOR_PARAMS['macd']['slow']}"])
+def _macd(ema_fast, ema_slow, backend):
+    return ema_fast - ema_slow
+
+
+@register_indicator('macd_signal', ['macd'])
+def _macd_signal(macd, backend):
+    return calculate_ema(macd, INDICATOR_PARAMS['macd_signal']['signal'], backend)
+
+
+@register_indicator('macd_histogram', ['macd', 'macd_signal'])
+def _macd_histogram(macd, signal, backend):
+    return macd - signal
+
+
+@register_indicator('bb_middle', [f"ma_{INDICATOR_PARAMS['bb_middle']['period']}"])
+def _bb_middle(middle, backend):
+    return middle
+
+
+@register_indicator('bb_upper', [f"ma_{INDICATOR_PARAMS['bb_upper']['period']}",
+                                 f"std_{INDICATOR_PARAMS['bb_upper']['period']}"])
+def _bb_upper(middle, std, backend):
+    return middle + (std * INDICATOR_PARAMS['bb_upper']['num_std'])
+
+
+@register_indicator('bb_lower', [f"ma_{INDICATOR_PARAMS['bb_lower']['period']}",
+                                 f"std_{INDICATOR_PARAMS['bb_lower']['period']}"])
+def _bb_lower(middle, std, backend):
+    return middle - (std * INDICATOR_PARAMS['bb_lower']['num_std'])
+
+
+@register_indicator('stoch_k', ['close', f"lowest_low_{INDICATOR_PARAMS['stoch_k']['k_period']}",
+                                f"highest_high_{INDICATOR_PARAMS['stoch_k']['k_period']}"])
+def _stoch_k(close, lowest_low, highest_high, backend):
+    return 100 * ((close - lowest_low) / (highest_high - lowest_low))
+
+
+@register_indicator('stoch_d', ['stoch_k'])
+def _stoch_d(k, backend):
+    return calculate_moving_average(k, INDICATOR_PARAMS['stoch_d']['d_period'], backend)
+
+
+def _evaluate(sources, columns, backend, available=()):
+    """Compute the requested outputs from a mapping of source (and available) columns"""
+    computed = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for name in indicator_dependencies(columns, available):
+            node = resolve_indicator(name)
+            inputs = [computed[dependency] if dependency in computed else sources[dependency]
+                      for dependency in node.inputs]
+            computed[name] = node.compute(*inputs, backend=backend)
+    return {column: computed[column] if column in computed else sources[column] for column in columns}
+
+
+def compute_indicators(df, columns, backend='pandas', precision='float64', compact_prices=False,
+                       reuse=False, copy=True):
+    """
+    Add only the requested indicator columns to a DataFrame
+    
+    Each output is computed at most once per call, so e.g. 'macd' reuses
+    'ema_12'/'ema_26' and the Bollinger bands reuse 'ma_20'. Values equal
+    the matching columns of add_all_indicators.
+    
+    Args:
+        df (pd.DataFrame): DataFrame with OHLCV data
+        columns (list): Output names, e.g. ['rsi', 'ma_20', 'ma_50'];
+            parametric names such as 'rsi_21', 'ma_100', 'ema_9', 'atr_10'
+            are resolved from the registry
+        backend (str): 'pandas' or 'numpy'
+        precision (str): 'float64', or 'float32' to store the added columns
+            in half the memory
+        compact_prices (bool): Also store open/high/low/close as float32
+            (after the indicators have been computed from the originals)
+        reuse (bool): Keep indicator columns that df already has instead of
+            recomputing them; they also feed the outputs that depend on them
+            (e.g. an existing 'macd' column is used for 'macd_signal')
+        copy (bool): Return a copy; if False the columns are added to df itself
+        
+    Returns:
+        pd.DataFrame: df (or its copy) with the requested columns added
+    """
+    _check_backend(backend)
+    _check_precision(precision)
+    if copy:
+        df = df.copy()
+    available = [column for column in df.columns if column not in SOURCE_COLUMNS] if reuse else ()
+    for column, values in _evaluate(df, columns, backend, available).items():
+        if column not in available:
+            df[column] = _store(values, precision)
+    if compact_prices:
+        for column in PRICE_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].astype(np.float32)
+    return df
+
+
+def make_panel(frames, fields=SOURCE_COLUMNS):
+    """
+    Pivot per-symbol OHLCV frames into wide time x symbol frames
+    
+    Args:
+        frames (dict): {symbol: DataFrame with a timestamp column and OHLCV columns}
+        fields (tuple): Columns to pivot
+        
+    Returns:
+        dict: {field: DataFrame indexed by the union of timestamps, one column
+            per symbol, NaN where a symbol has no candle}
+    """
+    panel = {}
+    for field in fields:
+        series = {symbol: df.set_index('timestamp')[field] for symbol, df in frames.items()
+                  if field in df.columns}
+        if series:
+            panel[field] = pd.DataFrame(series).sort_index().astype(float)
+    return panel
+
+
+def history_bounds(close):
+    """
+    First and last row with a close in each column of a panel
+    
+    Args:
+        close (np.ndarray): Time x symbol closes, NaN where a symbol has no candle
+        
+    Returns:
+        tuple: (first, last) row arrays; n and -1 for columns without closes
+    """
+    valid = ~np.isnan(close)
+    n = len(close)
+    has_data = valid.any(axis=0)
+    first = np.where(has_data, valid.argmax(axis=0), n)
+    last = np.where(has_data, n - 1 - valid[::-1].argmax(axis=0), -1)
+    return first, last
+
+
+def _compact_rows(valid):
+    """Row order per column that moves the rows where valid is True to the top, in order"""
+    return np.argsort(~valid, axis=0, kind='stable')
+
+
+def compute_panel_indicators(panel, columns, backend='pandas', precision='float64'):
+    """
+    Compute indicators for many symbols at once
+    
+    Every field is a time x symbol panel, and each indicator runs as one
+    vectorized pass along the time axis for all symbols. A NaN close means
+    the symbol has no candle on that row (not listed yet, delisted, or a
+    gap in its history), so each column's candles are packed together
+    before computing and scattered back afterwards. Every column equals
+    compute_indicators on that symbol's own candles; rows without a candle
+    are NaN.
+    
+    Args:
+        panel (dict): {field: wide DataFrame or 2-D array} for the source
+            columns the indicators need (at least 'close'), e.g. from make_panel
+        columns (list): Output names, as for compute_indicators
+        backend (str): 'pandas' or 'numpy'
+        precision (str): 'float64' or 'float32' (see compute_indicators)
+        
+    Returns:
+        dict: {column: wide DataFrame (or 2-D array if the inputs were arrays)}
+    """
+    _check_backend(backend)
+    _check_precision(precision)
+    reference = panel['close']
+    close = np.asarray(reference, dtype=float)
+    close = close.reshape(len(close), -1)
+    valid = ~np.isnan(close)
+    rows = _compact_rows(valid)
+    packed = np.take_along_axis(valid, rows, axis=0)
+
+    sources = {}
+    for field, values in panel.items():
+        values = np.asarray(values, dtype=float).reshape(close.shape)
+        compacted = np.take_along_axis(values, rows, axis=0)
+        compacted[~packed] = np.nan
+        sources[field] = pd.DataFrame(compacted) if backend == 'pandas' else compacted
+    
+    results = {}
+    for column, values in _evaluate(sources, columns, backend).items():
+        restored = np.empty(close.shape)
+        np.put_along_axis(restored, rows, np.asarray(values, dtype=float), axis=0)
+        restored[~valid] = np.nan
+        restored = _store(restored, precision)
+        if isinstance(reference, pd.DataFrame):
+            restored = pd.DataFrame(restored, index=reference.index, columns=reference.columns)
+        else:
+            restored = restored.reshape(np.shape(reference))
+        results[column] = restored
+    return results
+
+
+def add_all_indicators(df, backend='pandas', precision='float64', compact_prices=False):
     """
     Add all technical indicators to a DataFrame
     
     Args:
         df (pd.DataFrame): DataFrame with OHLCV data
+        backend (str): 'pandas' or 'numpy'
+        precision (str): 'float64', or 'float32' to store the 15 indicator
+            columns in half the memory
+        compact_prices (bool): Also store open/high/low/close as float32
         
     Returns:
         pd.DataFrame: DataFrame with added indicator columns
     """
-    # Make a copy to avoid modifying original
-    df = df.copy()
+    return compute_indicators(df, INDICATOR_COLUMNS, backend=backend,
+                              precision=precision, compact_prices=compact_prices)
+
+
+def _look_back(params):
+    """Bars before the latest one that a rolling indicator reads (EMAs carry their own state)"""
+    if params['function'] in ('ema', 'macd'):
+        return 0
+    if params['function'] == 'stochastic':
+        return params['k_period'] + params['d_period'] - 2
+    # RSI and ATR also read the previous close
+    return params['period'] - (params['function'] not in ('rsi', 'atr'))
+
+
+# Longest look-back of add_all_indicators: ma_200 needs the 199 bars before a new one
+WARMUP_BARS = max(_look_back(params) for params in INDICATOR_PARAMS.values())
+
+# EMAs continued by add_indicators_incremental: the ema_ columns and the MACD legs
+_EMA_PERIODS = sorted({params['period'] for params in INDICATOR_PARAMS.values() if params['function'] == 'ema'} |
+                      {params[leg] for params in INDICATOR_PARAMS.values() if params['function'] == 'macd'
+                       for leg in ('fast', 'slow')})
+
+
+def _trailing_nan_count(values):
+    """Number of NaN values after the last valid one"""
+    valid = np.flatnonzero(~np.isnan(values))
+    return len(values) - 1 - valid[-1] if len(valid) else len(values)
+
+
+def _seeded_ema(prices, period, seed, gap=0):
+    """
+    Continue an EMA from its last value instead of recomputing the history
+
+    Prepending the seed (and the NaN closes that followed it) reproduces the
+    exact weights pandas would carry over in a full recompute.
+    """
+    if seed is None or np.isnan(seed):
+        return calculate_ema(prices, period)
+    seeded = pd.concat([pd.Series([seed] + [np.nan] * gap), prices], ignore_index=True)
+    return pd.Series(calculate_ema(seeded, period).to_numpy()[gap + 1:], index=prices.index)
+
+
+def indicator_state(df):
+    """
+    Capture what add_indicators_incremental needs to continue a computed frame
+    
+    Args:
+        df (pd.DataFrame): Output of add_all_indicators
+        
+    Returns:
+        dict: JSON-serializable state (warm-up bars and EMA carry-over)
+    """
+    tail = df.iloc[-WARMUP_BARS:]
+
+    def last(column):
+        if not len(df):
+            return float('nan')
+        values = df[column] if column in df.columns else calculate_ema(df['close'], int(column[4:]))
+        return float(values.iloc[-1])
+
+    state = {
+        'bars': len(df),
+        'high': tail['high'].astype(float).tolist(),
+        'low': tail['low'].astype(float).tolist(),
+        'close': tail['close'].astype(float).tolist(),
+        'macd_signal': last('macd_signal'),
+        'trailing_nan': int(_trailing_nan_count(df['close'].to_numpy(dtype=float)))
+    }
+    for period in _EMA_PERIODS:
+        state[f'ema_{period}'] = last(f'ema_{period}')
+    return state
+
+
+def add_indicators_incremental(new_rows, state):
+    """
+    Add all technical indicators to newly appended rows only
+    
+    Rolling indicators are computed over the last WARMUP_BARS bars of the
+    state plus the new rows; EMAs and the MACD signal continue from their
+    last values. The result matches add_all_indicators on the full history.
     
+    Args:
+        new_rows (pd.DataFrame): New OHLCV rows, oldest first
+        state (dict): Output of indicator_state (or of a previous call)
+        
+    Returns:
+        tuple: (new_rows with indicator columns, updated state)
+    """
+    df = new_rows.copy()
+    history = pd.DataFrame({column: state[column] for column in ('high', 'low', 'close')}, dtype=float)
+    work = pd.concat([history, df[['high', 'low', 'close']].astype(float)], ignore_index=True)
+    offset = len(history)
+
+    def new_part(series):
+        return series.to_numpy()[offset:]
+
+    params = INDICATOR_PARAMS
+
     # RSI
-    df['rsi'] = calculate_rsi(df['close'], period=14)
+    df['rsi'] = new_part(calculate_rsi(work['close'], period=params['rsi']['period']))
     
     # Moving Averages
-    df['ma_20'] = calculate_moving_average(df['close'], period=20)
-    df['ma_50'] = calculate_moving_average(df['close'], period=50)
-    df['ma_200'] = calculate_moving_average(df['close'], period=200)
+    for column in ('ma_20', 'ma_50', 'ma_200'):
+        df[column] = new_part(calculate_moving_average(work['close'], period=params[column]['period']))
     
-    # EMAs
-    df['ema_12'] = calculate_ema(df['close'], period=12)
-    df['ema_26'] = calculate_ema(df['close'], period=26)
+    # EMAs, continued from the previous bar
+    close = df['close'].astype(float)
+    emas = {period: _seeded_ema(close, period, state[f'ema_{period}'], state['trailing_nan'])
+            for period in _EMA_PERIODS}
+    df['ema_12'] = emas[params['ema_12']['period']]
+    df['ema_26'] = emas[params['ema_26']['period']]
     
     # MACD
-    df['macd'], df['macd_signal'], df['macd_histogram'] = calculate_macd(df['close'])
+    df['macd'] = emas[params['macd']['fast']] - emas[params['macd']['slow']]
+    df['macd_signal'] = _seeded_ema(df['macd'], params['macd_signal']['signal'], state['macd_signal'])
+    df['macd_histogram'] = df['macd'] - df['macd_signal']
     
     # Bollinger Bands
-    df['bb_upper'], df['bb_middle'], df['bb_lower'] = calculate_bollinger_bands(df['close'])
+    bollinger = params['bb_middle']
+    upper, middle, lower = calculate_bollinger_bands(work['close'], bollinger['period'], bollinger['num_std'])
+    df['bb_upper'], df['bb_middle'], df['bb_lower'] = new_part(upper), new_part(middle), new_part(lower)
     
     # Stochastic
-    df['stoch_k'], df['stoch_d'] = calculate_stochastic(df['high'], df['low'], df['close'])
+    stochastic = params['stoch_k']
+    k, d = calculate_stochastic(work['high'], work['low'], work['close'],
+                                stochastic['k_period'], stochastic['d_period'])
+    df['stoch_k'], df['stoch_d'] = new_part(k), new_part(d)
     
     # ATR
-    df['atr'] = calculate_atr(df['high'], df['low'], df['close'])
+    df['atr'] = new_part(calculate_atr(work['high'], work['low'], work['close'], period=params['atr']['period']))
+
+    if df.empty:
+        return df, state
+
+    trailing_nan = _trailing_nan_count(close.to_numpy())
+    if trailing_nan == len(df):
+        trailing_nan += state['trailing_nan']
+
+    tail = work.iloc[-WARMUP_BARS:]
+    new_state = {
+        'bars': state['bars'] + len(df),
+        'high': tail['high'].tolist(),
+        'low': tail['low'].tolist(),
+        'close': tail['close'].tolist(),
+        'macd_signal': float(df['macd_signal'].iloc[-1]),
+        'trailing_nan': int(trailing_nan)
+    }
+    for period, ema in emas.items():
+        new_state[f'ema_{period}'] = float(ema.iloc[-1])
+    return df, new_state
+
+
+def update_indicators(computed_df, new_rows):
+    """
+    Append rows to a frame that already has indicators
     
-    return df
+    Only the new rows are computed; the result equals
+    add_all_indicators(pd.concat([raw history, new_rows])).
+    
+    Args:
+        computed_df (pd.DataFrame): Output of add_all_indicators
+        new_rows (pd.DataFrame): New OHLCV rows, oldest first
+        
+    Returns:
+        pd.DataFrame: Combined frame with a fresh RangeIndex
+    """
+    if computed_df.empty:
+        return add_all_indicators(new_rows).reset_index(drop=True)
+
+    new_df, _ = add_indicators_incremental(new_rows, indicator_state(computed_df))
+    return pd.concat([computed_df, new_df], ignore_index=True)
 
 
 # Test function
@@ -243,5 +941,11 @@ if __name__ == "__main__":
     print("\nSample data with indicators:")
     print(df[['timestamp', 'close', 'rsi', 'ma_20', 'ma_50', 'macd']].tail(10))
     
+    # Append 5 more bars incrementally
+    more = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']].tail(5).copy()
+    more['timestamp'] += pd.Timedelta(days=5)
+    updated = update_indicators(df, more)
+    print(f"\nAfter incremental update: {len(updated)} rows, last RSI {updated['rsi'].iloc[-1]:.2f}")
+    
     print("\n✅ Technical Indicators module test completed!")
 
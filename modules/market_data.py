@@ -0,0 +1,436 @@
+"""
+Market Data module for PTIP
+Streams live ticks from the Fyers data WebSocket and aggregates them into candles
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import pandas as pd
+from fyers_apiv3.FyersWebsocket import data_ws
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+
+# Candle length in seconds for each supported Fyers resolution
+RESOLUTION_SECONDS = {
+    '1': 60,
+    '2': 120,
+    '3': 180,
+    '5': 300,
+    '10': 600,
+    '15': 900,
+    '30': 1800,
+    '60': 3600
+}
+
+
+class Candle:
+    """A single OHLCV candle that is being built from ticks"""
+
+    __slots__ = ('start', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, start, price, volume=0):
+        self.start = start
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+        self.volume = volume
+
+    def update(self, price, volume=0):
+        """Fold one tick into the candle"""
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+    def to_dict(self):
+        """Return the candle as a price_data style record"""
+        return {
+            'timestamp': pd.to_datetime(self.start, unit='s'),
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume
+        }
+
+
+class CandleAggregator:
+    """
+    Aggregates ticks into fixed-interval candles in memory
+
+    Each tick costs two dictionary lookups plus one comparison per resolution,
+    independent of how many ticks or bars have been seen. Closed candles are
+    queued per resolution until they are drained.
+    """
+
+    def __init__(self, resolutions=('1', '5')):
+        """
+        Initialize the aggregator
+
+        Args:
+            resolutions (tuple): Fyers resolutions to build (e.g. ('1', '5'))
+        """
+        self.resolutions = tuple(resolutions)
+        self._seconds = tuple(RESOLUTION_SECONDS[r] for r in self.resolutions)
+        self._current = {}
+        self._last_closed = {}
+        self._closed = {r: [] for r in self.resolutions}
+        self.tick_count = 0
+        self.late_ticks = 0
+
+    def add_tick(self, symbol, timestamp, price, volume=0):
+        """
+        Add a tick to the open candles of a symbol
+
+        Args:
+            symbol (str): Stock symbol
+            timestamp (int): Tick time as Unix seconds
+            price (float): Traded price
+            volume (int): Quantity traded since the previous tick
+        """
+        timestamp = int(timestamp)
+        candles = self._current.get(symbol)
+        if candles is None:
+            candles = [None] * len(self._seconds)
+            self._current[symbol] = candles
+            self._last_closed[symbol] = [None] * len(self._seconds)
+        last_closed = self._last_closed[symbol]
+
+        for i, seconds in enumerate(self._seconds):
+            start = timestamp - timestamp % seconds
+            candle = candles[i]
+            if candle is None:
+                if last_closed[i] is not None and start <= last_closed[i]:
+                    # Candle was closed by close_expired; reopening it would
+                    # overwrite the real bar with this single tick
+                    self.late_ticks += 1
+                else:
+                    candles[i] = Candle(start, price, volume)
+            elif start == candle.start:
+                candle.update(price, volume)
+            elif start > candle.start:
+                self._closed[self.resolutions[i]].append((symbol, candle))
+                last_closed[i] = candle.start
+                candles[i] = Candle(start, price, volume)
+            else:
+                # Tick belongs to a candle that has already been closed
+                self.late_ticks += 1
+
+        self.tick_count += 1
+
+    def close_expired(self, now):
+        """
+        Close candles whose interval has ended, even if no new tick arrived
+
+        Args:
+            now (int): Current time as Unix seconds
+
+        Returns:
+            int: Number of candles closed
+        """
+        closed = 0
+        for symbol, candles in self._current.items():
+            last_closed = self._last_closed[symbol]
+            for i, seconds in enumerate(self._seconds):
+                candle = candles[i]
+                if candle is not None and candle.start + seconds <= now:
+                    self._closed[self.resolutions[i]].append((symbol, candle))
+                    last_closed[i] = candle.start
+                    candles[i] = None
+                    closed += 1
+        return closed
+
+    def close_all(self):
+        """Close every open candle (e.g. at the end of a session or replay)"""
+        return self.close_expired(float('inf'))
+
+    def pending(self, resolution):
+        """Number of closed candles waiting to be drained for a resolution"""
+        return len(self._closed[resolution])
+
+    def drain(self, resolution):
+        """
+        Remove and return the closed candles for a resolution
+
+        Args:
+            resolution (str): Fyers resolution
+
+        Returns:
+            list: (symbol, Candle) tuples in the order they closed
+        """
+        closed = self._closed[resolution]
+        self._closed[resolution] = []
+        return closed
+
+    def current_candle(self, symbol, resolution):
+        """Return the candle currently being built for a symbol, or None"""
+        candles = self._current.get(symbol)
+        if candles is None:
+            return None
+        return candles[self.resolutions.index(resolution)]
+
+
+def candles_to_dataframe(closed):
+    """
+    Convert drained (symbol, Candle) tuples into a price_data DataFrame
+
+    Args:
+        closed (list): Output of CandleAggregator.drain
+
+    Returns:
+        pd.DataFrame: Columns symbol, timestamp, open, high, low, close, volume
+    """
+    df = pd.DataFrame(
+        [(symbol, c.start, c.open, c.high, c.low, c.close, c.volume) for symbol, c in closed],
+        columns=['symbol', 'timestamp', 'open', 'high', 'low', 'close', 'volume']
+    )
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+    return df
+
+
+def parse_tick(message, last_volumes):
+    """
+    Extract a tick from a Fyers data WebSocket message
+
+    The socket reports cumulative traded volume for the day, so the traded
+    quantity of a tick is the difference from the previous message.
+
+    Args:
+        message (dict): Message delivered by FyersDataSocket
+        last_volumes (dict): Last cumulative volume per symbol (updated in place)
+
+    Returns:
+        tuple: (symbol, timestamp, price, volume) or None if not a tick
+    """
+    symbol = message.get('symbol')
+    price = message.get('ltp')
+    if symbol is None or price is None:
+        return None
+
+    timestamp = message.get('last_traded_time') or message.get('exch_feed_time') or time.time()
+
+    volume = 0
+    total = message.get('vol_traded_today')
+    if total is not None:
+        previous = last_volumes.get(symbol)
+        if previous is not None and total > previous:
+            volume = total - previous
+        last_volumes[symbol] = total
+
+    return symbol, timestamp, price, volume
+
+
+class LiveCandleFeed:
+    """
+    Routes tick messages into a CandleAggregator and persists closed bars
+
+    Closed candles at the persisted resolution are written to price_data in
+    batches of batch_size rows, so the database sees one transaction per
+    batch rather than one per bar.
+    """
+
+    def __init__(self, aggregator, db=None, persist_resolution=None, batch_size=500, indicator_store=None):
+        """
+        Initialize the feed
+
+        Args:
+            aggregator (CandleAggregator): Aggregator receiving the ticks
+            db (Database): Database to flush bars into (optional)
+            persist_resolution (str): Resolution written to price_data. If None, uses config.DATA_RESOLUTION
+            batch_size (int): Number of closed bars buffered before a flush
+            indicator_store (IndicatorStore): Extends stored indicators after each flush (optional)
+        """
+        self.aggregator = aggregator
+        self.db = db
+        self.persist_resolution = persist_resolution or config.DATA_RESOLUTION
+        self.batch_size = batch_size
+        self.indicator_store = indicator_store
+        self.bars_written = 0
+        self._last_volumes = {}
+        self._lock = threading.Lock()
+
+        if self.persist_resolution not in aggregator.resolutions:
+            raise ValueError(f"Aggregator does not build resolution {self.persist_resolution}")
+
+    def on_message(self, message):
+        """Handle one message from the socket or a replay source"""
+        tick = parse_tick(message, self._last_volumes)
+        if tick is None:
+            return
+
+        with self._lock:
+            self.aggregator.add_tick(*tick)
+            if self.db is not None and self.aggregator.pending(self.persist_resolution) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self, close_open=False):
+        """
+        Write all closed bars at the persisted resolution to the database
+
+        Args:
+            close_open (bool): Also close the candles still being built
+
+        Returns:
+            int: Number of bars written
+        """
+        with self._lock:
+            if close_open:
+                self.aggregator.close_all()
+            return self._flush_locked()
+
+    def _flush_locked(self):
+        closed = self.aggregator.drain(self.persist_resolution)
+        if not closed or self.db is None:
+            return 0
+
+        written = self.db.upsert_price_data(candles_to_dataframe(closed), resolution=self.persist_resolution)
+        if written > 0:
+            self.bars_written += written
+            if self.indicator_store is not None:
+                for symbol in dict.fromkeys(symbol for symbol, _ in closed):
+                    self.indicator_store.materialize(symbol, self.persist_resolution)
+        return written
+
+
+class TickReplaySource:
+    """Replays recorded tick messages in place of the live WebSocket"""
+
+    def __init__(self, messages):
+        """
+        Initialize the replay source
+
+        Args:
+            messages (iterable): Message dicts in the format sent by FyersDataSocket
+        """
+        self.messages = list(messages)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load messages recorded as JSON lines (see FyersTickStream record_path)"""
+        with open(path, 'r') as f:
+            return cls(json.loads(line) for line in f if line.strip())
+
+    def run(self, on_message):
+        """
+        Deliver every message to the callback in recorded order
+
+        Returns:
+            int: Number of messages delivered
+        """
+        for message in self.messages:
+            on_message(message)
+        return len(self.messages)
+
+
+class FyersTickStream:
+    """Subscribes to the Fyers data WebSocket and forwards tick messages"""
+
+    def __init__(self, access_token, symbols, on_message, litemode=False, record_path=None):
+        """
+        Initialize the stream
+
+        Args:
+            access_token (str): Fyers access token
+            symbols (list): Symbols to subscribe to
+            on_message (callable): Called with every message dict
+            litemode (bool): Subscribe to LTP only (no volume or exchange time)
+            record_path (str): Append raw messages here as JSON lines for later replay (optional)
+        """
+        # The data socket expects "client_id:access_token"
+        if ':' not in access_token:
+            access_token = f"{config.FYERS_CLIENT_ID}:{access_token}"
+
+        self.access_token = access_token
+        self.symbols = list(symbols)
+        self.on_message = on_message
+        self.litemode = litemode
+        self.record_path = record_path
+        self.socket = None
+        self._record_file = None
+
+    def connect(self):
+        """Open the socket, subscribe to all symbols and block while it runs"""
+        if self.record_path:
+            self._record_file = open(self.record_path, 'a')
+
+        self.socket = data_ws.FyersDataSocket(
+            access_token=self.access_token,
+            log_path="",
+            litemode=self.litemode,
+            reconnect=True,
+            on_connect=self._on_connect,
+            on_message=self._on_message,
+            on_error=self._on_error,
+            on_close=self._on_close
+        )
+        self.socket.connect()
+        self.socket.keep_running()
+
+    def close(self):
+        """Close the socket and the recording file"""
+        if self.socket:
+            self.socket.close_connection()
+        if self._record_file:
+            self._record_file.close()
+            self._record_file = None
+
+    def _on_connect(self):
+        self.socket.subscribe(symbols=self.symbols, data_type="SymbolUpdate")
+        print(f"✅ Subscribed to {len(self.symbols)} symbols")
+
+    def _on_message(self, message):
+        if self._record_file:
+            self._record_file.write(json.dumps(message) + "\n")
+        self.on_message(message)
+
+    def _on_error(self, message):
+        print(f"❌ WebSocket error: {message}")
+
+    def _on_close(self, message):
+        print(f"⚠️  WebSocket closed: {message}")
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Market Data module...")
+
+    import numpy as np
+
+    # Replay one synthetic session of ticks for a handful of symbols
+    np.random.seed(42)
+    symbols = config.DEFAULT_STOCKS
+    n_ticks = 200000
+    start = int(pd.Timestamp('2025-10-01 03:45:00').timestamp())
+    times = start + np.sort(np.random.randint(0, 6 * 3600, n_ticks))
+    prices = 1300 + np.cumsum(np.random.randn(n_ticks) * 0.05)
+    volumes = np.cumsum(np.random.randint(1, 100, n_ticks))
+
+    messages = [
+        {'symbol': symbols[i % len(symbols)], 'ltp': float(prices[i]),
+         'vol_traded_today': int(volumes[i]), 'last_traded_time': int(times[i])}
+        for i in range(n_ticks)
+    ]
+
+    aggregator = CandleAggregator(resolutions=('1', '5'))
+    feed = LiveCandleFeed(aggregator)
+
+    started = time.perf_counter()
+    TickReplaySource(messages).run(feed.on_message)
+    elapsed = time.perf_counter() - started
+    aggregator.close_all()
+
+    print(f"\nReplayed {n_ticks:,} ticks in {elapsed:.2f}s ({n_ticks / elapsed:,.0f} ticks/s)")
+    print(f"1m candles: {aggregator.pending('1'):,}, 5m candles: {aggregator.pending('5'):,}")
+    print(candles_to_dataframe(aggregator.drain('5')).head())
+
+    print("\n✅ Market Data module test completed!")
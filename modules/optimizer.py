@@ -0,0 +1,325 @@
+"""
+Optimizer module for PTIP
+Parallel parameter grid search for the scalping strategy
+
+The close prices of every symbol are copied once into shared memory and the
+grid points are split across a process pool. For each symbol a worker
+computes one RSI sweep and one moving-average sweep covering every period
+in its share of the grid (see modules/indicator_sweeps.py), then applies
+the scalping rules and the backtest to each grid point with array
+operations only. Metrics are written straight into a shared output block,
+so nothing but the grid itself is pickled between processes.
+
+For large search spaces, halving() runs successive halving: a random
+sample of the grid is backtested on a short recent slice of history and
+only the best fraction of it is promoted to longer slices, so most
+candidates never pay for a full-history backtest.
+"""
+
+import itertools
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from modules.backtest import METRICS, backtest_windows, bar_returns, bars_per_year, summarize_metrics
+from modules.indicator_sweeps import rsi_sweep, sma_sweep
+from modules.strategy import scalping_masks
+from modules.universe import SharedPanel, run_in_pool, shard_ranges
+
+# Constructor arguments of ScalpingStrategy searched by the optimizer
+PARAMETERS = ['rsi_period', 'rsi_oversold', 'rsi_overbought', 'ma_short', 'ma_long']
+
+
+def scalping_grid(rsi_period=None, rsi_oversold=None, rsi_overbought=None, ma_short=None, ma_long=None):
+    """
+    Every valid combination of scalping parameters
+
+    Args:
+        rsi_period, rsi_oversold, rsi_overbought, ma_short, ma_long (list):
+            Values to try for each parameter. If None, the config value is used
+
+    Returns:
+        pd.DataFrame: One row per combination with the PARAMETERS columns,
+            keeping only rsi_oversold < rsi_overbought and ma_short < ma_long
+    """
+    values = [
+        rsi_period or [config.SCALPING_RSI_PERIOD],
+        rsi_oversold or [config.SCALPING_RSI_OVERSOLD],
+        rsi_overbought or [config.SCALPING_RSI_OVERBOUGHT],
+        ma_short or [config.SCALPING_MA_SHORT],
+        ma_long or [config.SCALPING_MA_LONG]
+    ]
+    grid = pd.DataFrame(list(itertools.product(*values)), columns=PARAMETERS)
+    valid = (grid['rsi_oversold'] < grid['rsi_overbought']) & (grid['ma_short'] < grid['ma_long'])
+    return grid[valid].reset_index(drop=True)
+
+
+def sample_grid(grid, count, seed=None):
+    """
+    Random subset of a parameter grid
+
+    Args:
+        grid (pd.DataFrame): Parameter combinations, e.g. from scalping_grid
+        count (int): Number of combinations to draw (without replacement)
+        seed (int): Random seed for a reproducible sample
+
+    Returns:
+        pd.DataFrame: At most count rows of grid
+    """
+    if count >= len(grid):
+        return grid.reset_index(drop=True)
+    return grid.sample(n=count, random_state=seed).reset_index(drop=True)
+
+
+def _grid_shard(source_spec, output_spec, grid, start, stop, windows, cost, periods_per_year):
+    """Worker: metrics of grid points [start, stop) on every symbol and window"""
+    source = SharedPanel.attach(source_spec)
+    output = SharedPanel.attach(output_spec)
+    try:
+        close = source.field('close')
+        periods = bars_per_year() if periods_per_year is None else periods_per_year
+        points = grid[start:stop]
+        rsi_periods = np.unique(points[:, 0]).astype(int)
+        ma_periods = np.unique(points[:, 3:5]).astype(int)
+
+        for j in range(close.shape[1]):
+            # The symbol's own candles, without rows before listing, after delisting or in gaps
+            rows = np.flatnonzero(~np.isnan(close[:, j]))
+            if len(rows) == 0:
+                continue
+            prices = close[rows, j]
+            filled, returns = bar_returns(prices)
+            # Panel rows to rows of this symbol's history
+            local = np.searchsorted(rows, np.asarray(windows))
+
+            # One sweep per family serves every grid point and window of this shard
+            rsi = rsi_sweep(prices, rsi_periods)
+            ma = sma_sweep(prices, ma_periods)
+            rsi_column = {period: k for k, period in enumerate(rsi_periods)}
+            ma_column = {period: k for k, period in enumerate(ma_periods)}
+
+            for i, (rsi_period, oversold, overbought, ma_short, ma_long) in enumerate(points):
+                buy, sell = scalping_masks(rsi[:, rsi_column[int(rsi_period)]], prices,
+                                           ma[:, ma_column[int(ma_short)]], ma[:, ma_column[int(ma_long)]],
+                                           oversold, overbought, int(ma_long))
+                table = backtest_windows(filled, returns, buy, sell, local, cost, periods)
+                output.values[:, :, start + i, j] = table.T
+    finally:
+        source.close()
+        output.close()
+    return stop - start
+
+
+class ScalpingOptimizer:
+    """
+    Grid search of ScalpingStrategy parameters over many symbols
+    """
+
+    def __init__(self, workers=None, cost=0.0, periods_per_year=None):
+        """
+        Initialize the optimizer
+
+        Args:
+            workers (int): Worker processes (default: CPU count)
+            cost (float): Fractional cost per entry and exit (see backtest_signals)
+            periods_per_year (float): Bars per year for the Sharpe ratio. If
+                None, derived from config.DATA_RESOLUTION and the market hours
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.cost = cost
+        self.periods_per_year = periods_per_year
+        self.results = pd.DataFrame()
+        self.summary = pd.DataFrame()
+        self.rungs = pd.DataFrame()
+        self.budget = 0.0
+        self.elapsed = 0.0
+
+    def run(self, panel, grid, objective='sharpe'):
+        """
+        Backtest every grid point on every symbol
+
+        Args:
+            panel (dict or pd.DataFrame): {field: wide DataFrame} as from
+                Database.get_price_panel (only 'close' is used), or the wide
+                close DataFrame itself
+            grid (pd.DataFrame): Parameter combinations with the PARAMETERS
+                columns, e.g. from scalping_grid
+            objective (str): Metric to rank the grid points by (highest first)
+
+        Returns:
+            pd.DataFrame: One row per grid point with the parameters and the
+                metrics aggregated over symbols (trades and wins summed,
+                win_rate pooled, max_drawdown the worst, others averaged),
+                sorted by objective. The per-symbol rows are kept in self.results
+        """
+        if objective not in METRICS:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {METRICS}")
+
+        started = time.perf_counter()
+        close = panel['close'] if isinstance(panel, dict) else panel
+        self.results = self.evaluate(close, grid).drop(columns='window')
+        self.summary = summarize_metrics(self.results, PARAMETERS, objective)
+
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Backtested {len(grid)} parameter sets on {close.shape[1]} symbols with "
+              f"{len(shard_ranges(len(grid), self.workers))} workers in {self.elapsed:.2f}s")
+        return self.summary
+
+    def evaluate(self, panel, grid, windows=None):
+        """
+        Per-symbol metrics of every grid point over one or more row windows
+
+        The indicators of each symbol are computed once over its whole
+        history and sliced per window, so a window's first bars already have
+        warmed-up indicators and overlapping windows share the work.
+
+        Args:
+            panel (dict or pd.DataFrame): Close prices, as for run
+            grid (pd.DataFrame): Parameter combinations with the PARAMETERS columns
+            windows (list): (start, stop) panel row ranges to backtest
+                separately (default: the whole panel)
+
+        Returns:
+            pd.DataFrame: window (index into windows), PARAMETERS, symbol and
+                METRICS columns, without rows for symbols that have no
+                candles in a window
+        """
+        close = panel['close'] if isinstance(panel, dict) else panel
+        symbols = list(close.columns)
+        windows = [(0, len(close))] if windows is None else [(int(a), int(b)) for a, b in windows]
+        values = grid[PARAMETERS].to_numpy(dtype=float)
+
+        source = SharedPanel.from_panel({'close': close}, ['close'])
+        output = SharedPanel(METRICS, (len(windows), len(values), len(symbols)))
+        output.values[:] = np.nan
+        try:
+            shards = shard_ranges(len(values), self.workers)
+            run_in_pool(_grid_shard, [(source.spec, output.spec, values, start, stop, windows, self.cost,
+                                       self.periods_per_year) for start, stop in shards], self.workers)
+            metrics = output.values.reshape(len(METRICS), -1).T.copy()
+        finally:
+            source.close()
+            output.close()
+
+        per_window = len(values) * len(symbols)
+        results = pd.DataFrame(metrics, columns=METRICS)
+        results.insert(0, 'symbol', np.tile(symbols, len(values) * len(windows)))
+        params = grid[PARAMETERS].reset_index(drop=True)
+        params = params.loc[np.tile(params.index.repeat(len(symbols)), len(windows))].reset_index(drop=True)
+        results = pd.concat([params, results], axis=1)
+        results.insert(0, 'window', np.arange(len(windows)).repeat(per_window))
+        results = results.dropna(subset=['trades']).reset_index(drop=True)
+        results['trades'] = results['trades'].astype(int)
+        results['wins'] = results['wins'].astype(int)
+        return results
+
+    def halving(self, panel, grid, objective='sharpe', eta=3, min_bars=None):
+        """
+        Successive halving: rank candidates on short histories, promote the best
+
+        Every rung backtests the surviving candidates on the most recent
+        bars, with eta times more bars than the previous rung and the last
+        rung on the full history; only the top 1/eta of each rung is
+        promoted. Indicators are always computed on the full history (see
+        evaluate), so the first bars of a short rung trade on warmed-up
+        values as they do in run(). Combine with sample_grid to search a
+        large grid with a small fraction of the work of run().
+
+        Args:
+            panel (dict or pd.DataFrame): Close prices, as for run
+            grid (pd.DataFrame): Candidate parameter combinations
+            objective (str): Metric to rank candidates by (highest first)
+            eta (int): Promotion factor (> 1)
+            min_bars (int): Bars of the first rung (default: 5 x the longest
+                MA of the grid, so every candidate can trade)
+
+        Returns:
+            pd.DataFrame: Full-history summary of the last rung's candidates,
+                as for run. self.rungs has bars, candidates and seconds per
+                rung and self.budget the backtested bars as a fraction of run(grid)
+        """
+        if objective not in METRICS:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {METRICS}")
+        if eta <= 1:
+            raise ValueError("eta must be greater than 1")
+
+        started = time.perf_counter()
+        close = panel['close'] if isinstance(panel, dict) else panel
+        total = len(close)
+        min_bars = min(total, min_bars or 5 * int(grid['ma_long'].max()))
+
+        # Rungs until either the history or the candidates run out
+        count = 1
+        while min_bars * eta ** count <= total and eta ** count < len(grid):
+            count += 1
+        candidates = grid[PARAMETERS].reset_index(drop=True)
+        rungs = []
+        for rung in range(count):
+            bars = total if rung == count - 1 else max(min_bars, int(total / eta ** (count - 1 - rung)))
+            rung_started = time.perf_counter()
+            results = self.evaluate(close, candidates, windows=[(total - bars, total)]).drop(columns='window')
+            summary = summarize_metrics(results, PARAMETERS, objective)
+            rungs.append({'rung': rung, 'bars': bars, 'candidates': len(candidates),
+                          'seconds': time.perf_counter() - rung_started})
+            if rung < count - 1:
+                candidates = summary.head(int(math.ceil(len(candidates) / eta)))[PARAMETERS]
+
+        self.results, self.summary = results, summary
+        self.rungs = pd.DataFrame(rungs)
+        self.budget = float((self.rungs['bars'] * self.rungs['candidates']).sum() / (total * len(grid)))
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Successive halving: {len(grid)} candidates, {count} rungs, "
+              f"{self.budget:.0%} of a full backtest in {self.elapsed:.2f}s")
+        return summary
+
+    def best(self):
+        """
+        Parameters of the top-ranked grid point of the last run
+
+        Returns:
+            dict: Keyword arguments for ScalpingStrategy
+        """
+        if self.summary.empty:
+            raise ValueError("No results yet; call run() first")
+        row = self.summary.iloc[0]
+        return {name: (int(row[name]) if name in ('rsi_period', 'ma_short', 'ma_long') else float(row[name]))
+                for name in PARAMETERS}
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Optimizer module...")
+
+    np.random.seed(42)
+    n, k = 90 * 75, 5
+    index = pd.date_range('2025-01-01 03:45:00', periods=n, freq='5min')
+    close = 1000 + np.cumsum(np.random.randn(n, k) * 2 * np.sin(np.arange(n) / 40)[:, None], axis=0)
+    close = pd.DataFrame(close, index=index, columns=[f"SYM{i}" for i in range(k)])
+
+    grid = scalping_grid(rsi_period=list(range(7, 27)), rsi_oversold=[20, 25, 30, 35, 40],
+                         rsi_overbought=[60, 65, 70, 75, 80], ma_short=[5, 10, 15, 20],
+                         ma_long=[30, 40, 50, 60, 80])
+    print(f"\nGrid: {len(grid)} parameter sets x {k} symbols")
+
+    optimizer = ScalpingOptimizer(cost=0.0005)
+    summary = optimizer.run({'close': close}, grid)
+    print(summary.head(10).to_string())
+    print(f"\nBest: {optimizer.best()}")
+    exhaustive = summary.set_index(PARAMETERS)['sharpe']
+
+    sampled = sample_grid(grid, 1000, seed=0)
+    halved = optimizer.halving({'close': close}, sampled)
+    print(optimizer.rungs.to_string())
+    best = tuple(optimizer.best().values())
+    print(f"\nBest after halving: {optimizer.best()} "
+          f"(rank {int((exhaustive > exhaustive[best]).sum()) + 1} of {len(grid)} in the full grid)")
+
+    print("\n✅ Optimizer module test completed!")
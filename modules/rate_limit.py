@@ -0,0 +1,66 @@
+"""
+Rate Limiter module for PTIP
+Keeps concurrent Fyers API calls inside the per-second and per-minute limits
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window rate limiter
+
+    Each limit is a (max_calls, period_seconds) pair and all limits must hold
+    at once, matching how Fyers enforces both per-second and per-minute caps.
+    """
+
+    def __init__(self, limits=None):
+        """
+        Initialize the rate limiter
+
+        Args:
+            limits (list): (max_calls, period_seconds) pairs. If None, uses the
+                config.API_RATE_LIMIT_PER_SECOND / _PER_MINUTE limits
+        """
+        if limits is None:
+            limits = [
+                (config.API_RATE_LIMIT_PER_SECOND, 1.0),
+                (config.API_RATE_LIMIT_PER_MINUTE, 60.0)
+            ]
+        self.limits = [(int(calls), float(period)) for calls, period in limits]
+        self._calls = [deque() for _ in self.limits]
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a call is allowed, then record it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = 0.0
+                for (max_calls, period), calls in zip(self.limits, self._calls):
+                    while calls and calls[0] <= now - period:
+                        calls.popleft()
+                    if len(calls) >= max_calls:
+                        wait = max(wait, calls[0] + period - now)
+
+                if wait <= 0:
+                    for calls in self._calls:
+                        calls.append(now)
+                    return
+
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,323 @@
+"""
+Resilience module for PTIP
+Retries, backoff and circuit breaking around Fyers API calls
+"""
+
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+import pandas as pd
+import requests
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Fyers error codes that mean the access token is invalid or expired
+AUTH_ERROR_CODES = {-8, -15, -16, -17, 401, 403}
+
+# Codes returned for throttled requests
+RATE_LIMIT_CODES = {429, -429}
+
+# The SDK reports network failures (no HTTP response) as -99
+NETWORK_ERROR_CODES = {-99, 408}
+
+# Error categories
+TRANSIENT = 'transient'
+RATE_LIMITED = 'rate_limited'
+AUTH = 'auth'
+PERMANENT = 'permanent'
+CIRCUIT_OPEN = 'circuit_open'
+
+
+class FyersAPIError(Exception):
+    """Raised when a Fyers API call returns an error response"""
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        self.code = code
+
+    @property
+    def is_auth_error(self):
+        """True if the error means the access token must be regenerated"""
+        return self.code in AUTH_ERROR_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    def __init__(self, endpoint, retry_in):
+        super().__init__(f"Circuit open for '{endpoint}', retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def classify_error(error):
+    """
+    Classify an exception from a Fyers call
+
+    Args:
+        error (Exception): The raised exception
+
+    Returns:
+        str: One of TRANSIENT, RATE_LIMITED, AUTH, PERMANENT or CIRCUIT_OPEN
+    """
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+
+    if isinstance(error, FyersAPIError):
+        code = error.code
+        if code in RATE_LIMIT_CODES:
+            return RATE_LIMITED
+        if code in AUTH_ERROR_CODES:
+            return AUTH
+        if code in NETWORK_ERROR_CODES or (isinstance(code, int) and 500 <= code < 600):
+            return TRANSIENT
+        message = str(error).lower()
+        if 'limit' in message and ('rate' in message or 'request' in message):
+            return RATE_LIMITED
+        return PERMANENT
+
+    # Network failures only; other OSErrors (missing files, permissions, ...)
+    # will fail again on retry. requests' errors derive from OSError, not
+    # from the builtin ConnectionError
+    if isinstance(error, (ConnectionError, TimeoutError, socket.timeout, socket.gaierror,
+                          requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return TRANSIENT
+
+    return PERMANENT
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts=5, base_delay=0.5, max_delay=30.0, rate_limit_delay=1.0):
+        """
+        Initialize the policy
+
+        Args:
+            max_attempts (int): Total attempts per call, including the first
+            base_delay (float): Backoff scale in seconds for transient errors
+            max_delay (float): Upper bound on a single wait
+            rate_limit_delay (float): Backoff scale in seconds after a rate-limit response
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limit_delay = rate_limit_delay
+
+    def delay(self, attempt, category=TRANSIENT):
+        """
+        Seconds to wait before the next attempt
+
+        Args:
+            attempt (int): Number of attempts made so far (1 after the first failure)
+            category (str): Category of the last error
+        """
+        base = self.rate_limit_delay if category == RATE_LIMITED else self.base_delay
+        return random.uniform(0, min(self.max_delay, base * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker
+
+    After failure_threshold consecutive transient failures the circuit opens
+    and calls fail fast for reset_timeout seconds. Then a single trial call is
+    let through (half-open); its success closes the circuit again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return True if a call may be made now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_in(self):
+        """Seconds until the circuit will let a trial call through"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self.clock() - self.opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self._trial_in_flight = False
+
+
+class FailureLedger:
+    """
+    Record of calls that failed after all retries
+
+    Entries are kept in memory and, when a database is given, also written
+    to the fetch_failures table so later runs can see what was dropped.
+    """
+
+    def __init__(self, db=None):
+        self.db = db
+        self.entries = []
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, key, category, error, attempts):
+        """Add one failed call"""
+        entry = {
+            'endpoint': endpoint,
+            'key': key,
+            'category': category,
+            'code': getattr(error, 'code', None),
+            'message': str(error),
+            'attempts': attempts,
+            'failed_at': pd.Timestamp.now()
+        }
+        with self._lock:
+            self.entries.append(entry)
+        if self.db is not None:
+            self.db.record_fetch_failure(endpoint, key, category, entry['code'], entry['message'], attempts)
+
+    def summary(self):
+        """Return the number of failures per category"""
+        counts = {}
+        for entry in self.entries:
+            counts[entry['category']] = counts.get(entry['category'], 0) + 1
+        return counts
+
+    def to_dataframe(self):
+        """Return the in-memory entries as a DataFrame"""
+        return pd.DataFrame(self.entries)
+
+
+class ResilientCaller:
+    """
+    Runs API calls with classified retries and per-endpoint circuit breakers
+
+    Transient and rate-limit errors are retried with jittered exponential
+    backoff; successful calls never wait, so a job recovers at full speed as
+    soon as the endpoint does. Auth and permanent errors are raised at once.
+    Every call that finally fails is written to the failure ledger.
+    """
+
+    def __init__(self, retry_policy=None, failure_threshold=5, reset_timeout=30.0,
+                 ledger=None, rate_limiter=None, wait_for_circuit=False,
+                 sleep=time.sleep, clock=time.monotonic):
+        """
+        Initialize the caller
+
+        Args:
+            retry_policy (RetryPolicy): Backoff policy (optional)
+            failure_threshold (int): Consecutive transient failures that open a circuit
+            reset_timeout (float): Seconds a circuit stays open
+            ledger (FailureLedger): Ledger for final failures (optional, in-memory if None)
+            rate_limiter (RateLimiter): Acquired before every attempt (optional)
+            wait_for_circuit (bool): Wait for an open circuit to half-open instead of
+                failing fast (for bulk jobs that must eventually get through)
+            sleep (callable): Sleep function (injectable for tests)
+            clock (callable): Monotonic clock for the circuit breakers
+        """
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.ledger = ledger or FailureLedger()
+        self.rate_limiter = rate_limiter
+        self.wait_for_circuit = wait_for_circuit
+        self.sleep = sleep
+        self.clock = clock
+        self.breakers = {}
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint):
+        """Return the circuit breaker of an endpoint"""
+        with self._lock:
+            breaker = self.breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout, self.clock)
+                self.breakers[endpoint] = breaker
+            return breaker
+
+    def call(self, endpoint, func, *args, key=None, **kwargs):
+        """
+        Call func(*args, **kwargs) with retries
+
+        Args:
+            endpoint (str): Endpoint name used for the circuit breaker (e.g. 'history')
+            func (callable): The call to make; it should raise on error responses
+            key (str): Identifies the request in the ledger (e.g. the symbol)
+
+        Returns:
+            The return value of func
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            Exception: The last error once retries are exhausted or not applicable
+        """
+        breaker = self.breaker(endpoint)
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                if self.wait_for_circuit:
+                    self.sleep(max(breaker.retry_in(), 0.05))
+                    continue
+                error = CircuitOpenError(endpoint, breaker.retry_in())
+                self.ledger.record(endpoint, key, CIRCUIT_OPEN, error, attempt)
+                raise error
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                category = classify_error(e)
+
+                if category in (TRANSIENT, RATE_LIMITED):
+                    breaker.record_failure()
+                    if attempt < self.retry_policy.max_attempts:
+                        with self._lock:
+                            self.retries += 1
+                        self.sleep(self.retry_policy.delay(attempt, category))
+                        continue
+                else:
+                    # The endpoint answered, so it is healthy
+                    breaker.record_success()
+
+                self.ledger.record(endpoint, key, category, e, attempt)
+                raise
+
+            breaker.record_success()
+            return result
@@ -0,0 +1,252 @@
+"""
+Rules module for PTIP
+A small expression language for strategy rules, compiled to NumPy
+
+Rules are Python-like expressions over indicator and price columns:
+
+    rsi < oversold and close > ma_20
+    0.5 + (oversold - rsi) / oversold * 0.3 + (0.1 if ma_20 > ma_50 else 0)
+
+Supported: numbers, column names, the bar position 'bar', named constants
+substituted at compile time, + - * /, comparisons (also chained), and /
+or / not, 'x if condition else y', and the functions abs, min, max, clip
+and isnan. Everything else (attributes, subscripts, other calls, ...) is
+rejected when the rule is compiled.
+
+A rule is parsed once and rewritten into a single code object whose
+operators are element-wise NumPy calls ('and' becomes logical_and, 'if'
+becomes where, ...), so the same rule evaluates a whole column of bars in
+batch or one bar's scalars in a live stream.
+"""
+
+import ast
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Names that refer to candle fields rather than indicator columns
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Position of the bar in the history (0 for the first bar)
+BAR = 'bar'
+
+FUNCTIONS = {
+    'abs': np.abs,
+    'min': np.minimum,
+    'max': np.maximum,
+    'clip': np.clip,
+    'isnan': np.isnan
+}
+
+# Helpers the compiled code calls; rule names cannot start with '_', so
+# rules cannot reach them directly
+_RUNTIME = {
+    '__builtins__': {},
+    '_and': np.logical_and,
+    '_or': np.logical_or,
+    '_not': np.logical_not,
+    '_where': np.where,
+    **{f'_fn_{name}': function for name, function in FUNCTIONS.items()}
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+    ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Compare, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+    ast.Eq, ast.NotEq, ast.IfExp, ast.Call, ast.Name, ast.Load, ast.Constant
+)
+
+
+class RuleError(ValueError):
+    """A rule that does not parse or uses unsupported syntax"""
+
+
+def _call(name, args):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=args, keywords=[])
+
+
+class _Vectorize(ast.NodeTransformer):
+    """Rewrite Python boolean logic and conditionals into element-wise NumPy calls"""
+
+    def __init__(self, constants):
+        self.constants = constants
+        self.names = []
+
+    def visit_Name(self, node):
+        if node.id in self.constants:
+            return ast.Constant(value=self.constants[node.id])
+        if node.id not in self.names:
+            self.names.append(node.id)
+        return node
+
+    def visit_BoolOp(self, node):
+        values = [self.visit(value) for value in node.values]
+        combine = '_and' if isinstance(node.op, ast.And) else '_or'
+        result = values[0]
+        for value in values[1:]:
+            result = _call(combine, [result, value])
+        return result
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        if isinstance(node.op, ast.Not):
+            return _call('_not', [operand])
+        return ast.UnaryOp(op=node.op, operand=operand)
+
+    def visit_Compare(self, node):
+        # a < b < c -> (a < b) and (b < c)
+        operands = [self.visit(node.left)] + [self.visit(item) for item in node.comparators]
+        parts = [ast.Compare(left=left, ops=[op], comparators=[right])
+                 for left, op, right in zip(operands[:-1], node.ops, operands[1:])]
+        result = parts[0]
+        for part in parts[1:]:
+            result = _call('_and', [result, part])
+        return result
+
+    def visit_IfExp(self, node):
+        return _call('_where', [self.visit(node.test), self.visit(node.body), self.visit(node.orelse)])
+
+    def visit_Call(self, node):
+        return _call(f'_fn_{node.func.id}', [self.visit(arg) for arg in node.args])
+
+
+class Rule:
+    """
+    A compiled rule expression
+    """
+
+    def __init__(self, text, constants=None):
+        """
+        Parse, check and compile a rule
+
+        Args:
+            text (str): Rule expression
+            constants (dict): Names replaced by numbers at compile time,
+                e.g. {'oversold': 30}
+
+        Raises:
+            RuleError: If the rule does not parse or uses unsupported syntax
+        """
+        self.text = text
+        self.constants = dict(constants or {})
+        try:
+            tree = ast.parse(text.strip(), mode='eval')
+        except SyntaxError as e:
+            raise RuleError(f"Invalid rule '{text}': {e.msg}") from None
+        self._check(tree)
+
+        transformer = _Vectorize(self.constants)
+        tree = ast.fix_missing_locations(transformer.visit(tree))
+        self.names = tuple(transformer.names)
+        self._code = compile(tree, f'<rule: {text}>', 'eval')
+
+    def _check(self, tree):
+        """Reject anything outside the rule language"""
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise RuleError(f"Unsupported syntax in rule '{self.text}': {type(node).__name__}")
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                    raise RuleError(f"Unsupported call in rule '{self.text}', "
+                                    f"expected one of {sorted(FUNCTIONS)} with positional arguments")
+            elif isinstance(node, ast.Name) and node.id.startswith('_'):
+                raise RuleError(f"Invalid name '{node.id}' in rule '{self.text}'")
+            elif isinstance(node, ast.Constant) and (isinstance(node.value, (str, bytes))
+                                                     or node.value is None or node.value is Ellipsis):
+                raise RuleError(f"Only numbers are allowed as constants in rule '{self.text}'")
+
+    @property
+    def indicators(self):
+        """Indicator columns the rule reads (names that are not prices or 'bar')"""
+        return tuple(name for name in self.names if name not in PRICE_COLUMNS and name != BAR)
+
+    def evaluate(self, values):
+        """
+        Evaluate the rule
+
+        Args:
+            values (dict): Every name in self.names mapped to an array (one
+                element per bar) or to a scalar (a single bar)
+
+        Returns:
+            np.ndarray or scalar: Result per bar; comparisons with NaN are False
+
+        Raises:
+            RuleError: If a name the rule reads is missing from values
+        """
+        try:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return eval(self._code, _RUNTIME, values)
+        except NameError as e:
+            raise RuleError(f"Rule '{self.text}': {e}") from None
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        return f"Rule({self.text!r})"
+
+
+def compile_rule(text, constants=None):
+    """
+    Compile a rule expression (see Rule)
+
+    Args:
+        text (str): Rule expression
+        constants (dict): Names replaced by numbers at compile time
+
+    Returns:
+        Rule: The compiled rule
+    """
+    return Rule(text, constants)
+
+
+def load_rules(path):
+    """
+    Read a rule set from a JSON file
+
+    The file holds the keyword arguments of RuleStrategy, e.g.
+    {"name": ..., "buy": "...", "sell": "...", "constants": {...}}
+
+    Args:
+        path (str): JSON file path
+
+    Returns:
+        dict: The rule set
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Rules module...")
+
+    import time
+
+    rule = compile_rule("rsi < oversold and close > ma_20", {'oversold': 30})
+    print(f"\n{rule} reads {rule.names}, indicators {rule.indicators}")
+
+    n = 1_000_000
+    rng = np.random.default_rng(42)
+    values = {'rsi': rng.uniform(0, 100, n), 'close': rng.normal(100, 5, n), 'ma_20': rng.normal(100, 5, n)}
+    started = time.perf_counter()
+    mask = rule(values)
+    elapsed = time.perf_counter() - started
+    print(f"Batch: {mask.sum():,} of {n:,} bars match in {elapsed * 1e3:.1f} ms")
+
+    bar = {'rsi': 25.0, 'close': 101.0, 'ma_20': 100.0}
+    started = time.perf_counter()
+    for _ in range(10_000):
+        rule(bar)
+    print(f"Stream: {rule(bar)} in {(time.perf_counter() - started) / 10_000 * 1e6:.1f} µs per bar")
+
+    try:
+        compile_rule("__import__('os').system('ls')")
+    except RuleError as e:
+        print(f"Rejected: {e}")
+
+    print("\n✅ Rules module test completed!")
@@ -0,0 +1,302 @@
+"""
+Sessions module for PTIP
+Tags bars with their exchange trading session and computes session-anchored indicators
+
+Stored timestamps are naive UTC; sessions are defined in config.MARKET_TIMEZONE
+between config.MARKET_OPEN and config.MARKET_CLOSE. Bars are assumed to be
+sorted by time, so each session is one contiguous run of rows and every
+session-anchored value is a grouped cumulative operation over those runs.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import calculate_moving_average
+import config
+
+
+def minute_of_day(hhmm):
+    """'09:15' -> 555"""
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def to_market_time(timestamps, tz=None):
+    """
+    Convert timestamps to naive exchange-local time
+
+    Args:
+        timestamps: Naive UTC (the price_data convention) or tz-aware timestamps
+        tz (str): Exchange time zone. If None, uses config.MARKET_TIMEZONE
+
+    Returns:
+        pd.Series: Naive local timestamps
+    """
+    timestamps = pd.Series(pd.to_datetime(timestamps))
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize('UTC')
+    return timestamps.dt.tz_convert(tz or config.MARKET_TIMEZONE).dt.tz_localize(None)
+
+
+def session_frame(timestamps, tz=None, open_time=None, close_time=None):
+    """
+    Tag each bar with its trading session
+
+    A bar belongs to the session when its start time is within
+    [open_time, close_time) local time; other bars (pre-open, closing
+    session, bad ticks) get no session.
+
+    Args:
+        timestamps (pd.Series): Bar start times, sorted ascending
+        tz (str): Exchange time zone. If None, uses config.MARKET_TIMEZONE
+        open_time (str): Session open 'HH:MM'. If None, uses config.MARKET_OPEN
+        close_time (str): Session close 'HH:MM'. If None, uses config.MARKET_CLOSE
+
+    Returns:
+        pd.DataFrame: Aligned with timestamps, with columns
+            session (local trading date, NaT outside a session),
+            session_id (0, 1, ... per session, -1 outside),
+            in_session (bool),
+            session_bar (position within the session, -1 outside),
+            minutes_from_open (minutes since the session opened)
+    """
+    index = timestamps.index if isinstance(timestamps, pd.Series) else None
+    local = to_market_time(timestamps, tz)
+    minute = (local.dt.hour * 60 + local.dt.minute + local.dt.second / 60).to_numpy(dtype=float)
+    open_minute = minute_of_day(open_time or config.MARKET_OPEN)
+    close_minute = minute_of_day(close_time or config.MARKET_CLOSE)
+
+    in_session = (minute >= open_minute) & (minute < close_minute)
+    session = local.dt.normalize().where(in_session)
+
+    # A new run starts where the session date changes
+    day = session.to_numpy().astype('datetime64[D]').astype(np.int64)
+    rows = np.arange(len(day))
+    starts = in_session.copy()
+    starts[1:] &= (day[1:] != day[:-1]) | ~in_session[:-1]
+    session_id = np.where(in_session, np.cumsum(starts) - 1, -1)
+    first_row = np.maximum.accumulate(np.where(starts, rows, 0))
+    session_bar = np.where(in_session, rows - first_row, -1)
+
+    return pd.DataFrame({
+        'session': session.to_numpy(),
+        'session_id': session_id,
+        'in_session': in_session,
+        'session_bar': session_bar,
+        'minutes_from_open': np.where(in_session, minute - open_minute, np.nan)
+    }, index=index)
+
+
+def session_position(timestamp, tz=None, open_time=None, close_time=None):
+    """
+    Session of a single bar, for code that receives bars one at a time
+
+    Args:
+        timestamp: Bar start, naive UTC or tz-aware
+        tz, open_time, close_time: As for session_frame
+
+    Returns:
+        tuple: (local trading date, minutes since the open), or None outside a session
+    """
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    local = timestamp.tz_convert(tz or config.MARKET_TIMEZONE).tz_localize(None)
+    minute = local.hour * 60 + local.minute + local.second / 60
+    open_minute = minute_of_day(open_time or config.MARKET_OPEN)
+    if not open_minute <= minute < minute_of_day(close_time or config.MARKET_CLOSE):
+        return None
+    return local.normalize(), minute - open_minute
+
+
+def _grouped(values, sessions):
+    """Group values by session (out-of-session rows form group -1)"""
+    return values.groupby(sessions['session_id'].to_numpy())
+
+
+def _outside_to_nan(values, sessions):
+    return values.where(sessions['in_session'].to_numpy())
+
+
+def session_cumulative_volume(volume, sessions):
+    """
+    Volume traded so far in the session, reset at each open
+
+    Args:
+        volume (pd.Series): Bar volumes
+        sessions (pd.DataFrame): Output of session_frame for the same bars
+
+    Returns:
+        pd.Series: Cumulative session volume (NaN outside a session)
+    """
+    volume = _outside_to_nan(volume.astype(float), sessions)
+    return _outside_to_nan(_grouped(volume, sessions).cumsum(), sessions)
+
+
+def calculate_vwap(df, sessions=None, num_stds=(1, 2)):
+    """
+    Session-anchored VWAP with volume-weighted standard deviation bands
+
+    Uses the typical price (high + low + close) / 3. The running sums are
+    taken relative to each session's first typical price, which keeps the
+    variance free of cancellation at any price level.
+
+    Args:
+        df (pd.DataFrame): OHLCV data with a timestamp column
+        sessions (pd.DataFrame): Output of session_frame (computed if None)
+        num_stds (tuple): Band widths in standard deviations
+
+    Returns:
+        pd.DataFrame: vwap plus vwap_upper_<k>/vwap_lower_<k> per width
+            (NaN outside a session and until the session has traded)
+    """
+    if sessions is None:
+        sessions = session_frame(df['timestamp'])
+
+    typical = (df['high'] + df['low'] + df['close']) / 3
+    usable = sessions['in_session'].to_numpy() & typical.notna().to_numpy()
+    weight = df['volume'].astype(float).where(usable, 0.0)
+
+    anchor = _grouped(typical.where(usable), sessions).transform('first')
+    offset = (typical - anchor).where(usable, 0.0)
+    sums = _grouped(pd.DataFrame({
+        'weight': weight,
+        'moment': weight * offset,
+        'square': weight * offset * offset
+    }), sessions).cumsum()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_offset = sums['moment'] / sums['weight']
+        variance = (sums['square'] / sums['weight'] - mean_offset ** 2).clip(lower=0)
+    vwap = _outside_to_nan(anchor + mean_offset, sessions)
+    std = np.sqrt(variance)
+
+    result = pd.DataFrame({'vwap': vwap}, index=df.index)
+    for num_std in num_stds:
+        label = f"{num_std:g}".replace('.', '_')
+        result[f'vwap_upper_{label}'] = vwap + std * num_std
+        result[f'vwap_lower_{label}'] = vwap - std * num_std
+    return result
+
+
+def calculate_opening_range(df, sessions=None, minutes=None):
+    """
+    Opening-range high and low of each session
+
+    Within the range the values are the running high/low so far (no
+    lookahead); afterwards they hold the final range for the rest of the
+    session.
+
+    Args:
+        df (pd.DataFrame): OHLCV data with a timestamp column
+        sessions (pd.DataFrame): Output of session_frame (computed if None)
+        minutes (int): Range length. If None, uses config.OPENING_RANGE_MINUTES
+
+    Returns:
+        tuple: (or_high, or_low) Series (NaN outside a session)
+    """
+    if sessions is None:
+        sessions = session_frame(df['timestamp'])
+    minutes = config.OPENING_RANGE_MINUTES if minutes is None else minutes
+
+    in_range = sessions['in_session'].to_numpy() & (sessions['minutes_from_open'].to_numpy() < minutes)
+    high = _grouped(df['high'].where(in_range), sessions).cummax()
+    low = _grouped(df['low'].where(in_range), sessions).cummin()
+    return (_outside_to_nan(_grouped(high, sessions).ffill(), sessions),
+            _outside_to_nan(_grouped(low, sessions).ffill(), sessions))
+
+
+def session_moving_average(prices, period, sessions, backend='pandas'):
+    """
+    Simple moving average that restarts at every session open
+
+    Equal to a rolling mean computed separately for each session: the
+    continuous rolling mean is kept only where its window lies inside one
+    session.
+
+    Args:
+        prices (pd.Series): Price series
+        period (int): MA period
+        sessions (pd.DataFrame): Output of session_frame for the same bars
+        backend (str): 'pandas' or 'numpy'
+
+    Returns:
+        pd.Series: NaN for the first period - 1 bars of each session
+    """
+    ma = calculate_moving_average(prices, period, backend=backend)
+    return ma.where(sessions['session_bar'].to_numpy() >= period - 1)
+
+
+def add_session_indicators(df, num_stds=(1, 2), opening_range_minutes=None, reset_ma_periods=(),
+                           tz=None, open_time=None, close_time=None, backend='pandas'):
+    """
+    Add session tags and session-anchored indicators to a DataFrame
+
+    Args:
+        df (pd.DataFrame): OHLCV data with a timestamp column, sorted by time
+        num_stds (tuple): VWAP band widths
+        opening_range_minutes (int): If None, uses config.OPENING_RANGE_MINUTES
+        reset_ma_periods (tuple): Periods of session-reset SMAs to add
+            (columns session_ma_<period>)
+        tz (str): Exchange time zone. If None, uses config.MARKET_TIMEZONE
+        open_time (str): Session open. If None, uses config.MARKET_OPEN
+        close_time (str): Session close. If None, uses config.MARKET_CLOSE
+        backend (str): 'pandas' or 'numpy' for the session-reset SMAs
+
+    Returns:
+        pd.DataFrame: Copy of df with session, session_bar, in_session,
+            session_volume, vwap (and bands), or_high, or_low columns
+    """
+    df = df.copy()
+    sessions = session_frame(df['timestamp'], tz, open_time, close_time)
+    sessions.index = df.index
+
+    df['session'] = sessions['session']
+    df['session_bar'] = sessions['session_bar']
+    df['in_session'] = sessions['in_session']
+    df['session_volume'] = session_cumulative_volume(df['volume'], sessions)
+
+    vwap = calculate_vwap(df, sessions, num_stds)
+    for column in vwap.columns:
+        df[column] = vwap[column]
+
+    df['or_high'], df['or_low'] = calculate_opening_range(df, sessions, opening_range_minutes)
+
+    for period in reset_ma_periods:
+        df[f'session_ma_{period}'] = session_moving_average(df['close'], period, sessions, backend)
+    return df
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Sessions module...")
+
+    # Three sessions of 5-minute bars in naive UTC, plus pre-open bars
+    days = pd.date_range('2025-09-01', periods=3, freq='D')
+    timestamps = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta('03:30:00'), day + pd.Timedelta('09:55:00'), freq='5min')
+        for day in days
+    ]))
+    np.random.seed(42)
+    close = 1300 + np.cumsum(np.random.randn(len(timestamps)))
+    df = pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close,
+        'high': close + np.random.rand(len(timestamps)),
+        'low': close - np.random.rand(len(timestamps)),
+        'close': close,
+        'volume': np.random.randint(1000, 5000, len(timestamps))
+    })
+
+    df = add_session_indicators(df, reset_ma_periods=(20,))
+    print(df[['timestamp', 'session_bar', 'close', 'vwap', 'vwap_upper_1', 'or_high', 'or_low',
+              'session_ma_20']].iloc[75:85])
+    print(f"\nSessions: {df['session'].nunique()}, bars outside a session: {(~df['in_session']).sum()}")
+
+    print("\n✅ Sessions module test completed!")
@@ -1,8 +1,9 @@
 """
 Trading Strategy module for PTIP
-Implements the Scalping Options strategy
+Implements the Scalping Options strategy and strategies defined by rules
 """
 
+import numpy as np
 import pandas as pd
 import os
 import sys
@@ -10,93 +11,233 @@ import sys
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.indicators import add_all_indicators
+from modules.indicators import SOURCE_COLUMNS, compute_indicators
+from modules.rules import BAR, PRICE_COLUMNS, compile_rule, load_rules
+from modules.streaming_indicators import streaming_column
 import config
 
 
-class ScalpingStrategy:
+def _scalar_or_array(values):
+    """Plain float for a single row, array otherwise"""
+    return float(values) if np.ndim(values) == 0 else values
+
+
+class BaseStrategy:
     """
-    Scalping Options Trading Strategy
+    Base class of trading strategies
     
-    Strategy Logic:
-    - BUY Signal: RSI < 30 (oversold) AND price > MA20 (uptrend confirmation)
-    - SELL Signal: RSI > 70 (overbought)
-    - HOLD: All other conditions
+    A strategy declares the indicator columns it reads in
+    required_indicators and implements find_signals on a frame that has
+    them; generate_signals adds any that are missing first. Strategies
+    that also implement evaluate_bar can be run bar by bar with stream().
     """
     
-    def __init__(self):
-        """Initialize Scalping Strategy with parameters from config"""
-        self.name = "Scalping Options"
-        self.rsi_period = config.SCALPING_RSI_PERIOD
-        self.rsi_oversold = config.SCALPING_RSI_OVERSOLD
-        self.rsi_overbought = config.SCALPING_RSI_OVERBOUGHT
-        self.ma_short = config.SCALPING_MA_SHORT
-        self.ma_long = config.SCALPING_MA_LONG
+    name = "Base Strategy"
+    
+    # Indicator columns the rules read. Frames that already have them (e.g.
+    # from IndicatorStore.load) are used as they are, without recomputing.
+    required_indicators = ()
+    
+    def prepare(self, df, copy=False):
+        """
+        Add the required indicators that df does not have yet
         
-        print(f"✅ {self.name} strategy initialized")
-        print(f"   RSI Period: {self.rsi_period}")
-        print(f"   RSI Oversold: {self.rsi_oversold}")
-        print(f"   RSI Overbought: {self.rsi_overbought}")
-        print(f"   MA Short: {self.ma_short}, MA Long: {self.ma_long}")
+        Args:
+            df (pd.DataFrame): DataFrame with OHLCV data
+            copy (bool): Work on a copy of df. If False, missing columns are added to df itself
+            
+        Returns:
+            pd.DataFrame: df (or its copy) with every required indicator
+        """
+        return compute_indicators(df, self.required_indicators, reuse=True, copy=copy)
     
-    def generate_signals(self, df):
+    def generate_signals(self, df, copy=False):
         """
         Generate trading signals based on the strategy
         
         Args:
-            df (pd.DataFrame): DataFrame with OHLCV data
+            df (pd.DataFrame): DataFrame with OHLCV data, optionally with
+                precomputed required_indicators columns
+            copy (bool): Work on a copy of df. If False, any required
+                indicator that df lacks is added to df itself
             
         Returns:
             pd.DataFrame: DataFrame with signals (timestamp, action, price, confidence)
         """
-        # Add all technical indicators
-        df = add_all_indicators(df)
-        
-        signals = []
+        return self.find_signals(self.prepare(df, copy))
+    
+    def find_signals(self, df):
+        """
+        Signals of a frame that already has every required indicator
         
-        # Iterate through data to generate signals
-        for i in range(len(df)):
-            # Need enough data for MA_50
-            if i < self.ma_long:
-                continue
+        Args:
+            df (pd.DataFrame): OHLCV data with the required_indicators columns
             
-            row = df.iloc[i]
+        Returns:
+            pd.DataFrame: Signals (timestamp, action, price, confidence, ...)
+        """
+        raise NotImplementedError
+    
+    def evaluate_bar(self, bar, values, position):
+        """
+        Signal of a single bar (see ScalpingStrategy.evaluate_bar)
+        
+        Returns:
+            dict: Signal or None
+        """
+        raise NotImplementedError
+    
+    def stream(self):
+        """
+        Start a bar-by-bar evaluator for one symbol
+        
+        Returns:
+            SignalStream: Evaluator whose on_bar(bar) returns a signal or None
             
-            # Skip if indicators are NaN
-            if pd.isna(row['rsi']) or pd.isna(row['ma_20']) or pd.isna(row['ma_50']):
-                continue
+        Raises:
+            ValueError: If a required indicator has no streaming counterpart
+                (see streaming_indicators.streaming_column)
+        """
+        return SignalStream(self)
+    
+    def get_current_signal(self, df):
+        """
+        Get the most recent signal from the data
+        
+        Args:
+            df (pd.DataFrame): DataFrame with OHLCV data
             
-            # BUY Signal: RSI oversold + price above MA20 (trend confirmation)
-            if row['rsi'] < self.rsi_oversold and row['close'] > row['ma_20']:
-                signals.append({
-                    'timestamp': row['timestamp'],
-                    'action': 'BUY',
-                    'price': row['close'],
-                    'confidence': self._calculate_buy_confidence(row),
-                    'rsi': row['rsi'],
-                    'ma_20': row['ma_20'],
-                    'ma_50': row['ma_50']
-                })
+        Returns:
+            dict: Most recent signal or None
+        """
+        signals = self.generate_signals(df)
+        
+        if signals.empty:
+            return None
+        
+        # Return the most recent signal
+        return signals.iloc[-1].to_dict()
+
+
+def scalping_masks(rsi, close, ma_short, ma_long, rsi_oversold, rsi_overbought, warmup):
+    """
+    BUY and SELL masks of the scalping rules over aligned arrays
+    
+    Args:
+        rsi, close, ma_short, ma_long (np.ndarray): Indicator and price values per bar
+        rsi_oversold (float): BUY below this RSI (with close above the short MA)
+        rsi_overbought (float): SELL above this RSI
+        warmup (int): Bars at the start that never signal
+        
+    Returns:
+        tuple: (buy, sell) boolean arrays; a bar is never both
+    """
+    # Need enough data for the long MA, and skip rows with NaN indicators
+    ready = (np.arange(len(close)) >= warmup) & ~(np.isnan(rsi) | np.isnan(ma_short) | np.isnan(ma_long))
+    
+    # BUY Signal: RSI oversold + price above the short MA (trend confirmation)
+    buy = ready & (rsi < rsi_oversold) & (close > ma_short)
+    # SELL Signal: RSI overbought
+    sell = ready & ~buy & (rsi > rsi_overbought)
+    return buy, sell
+
+
+class ScalpingStrategy(BaseStrategy):
+    """
+    Scalping Options Trading Strategy
+    
+    Strategy Logic (with the config defaults):
+    - BUY Signal: RSI < 30 (oversold) AND price > MA20 (uptrend confirmation)
+    - SELL Signal: RSI > 70 (overbought)
+    - HOLD: All other conditions
+    """
+    
+    def __init__(self, rsi_period=None, rsi_oversold=None, rsi_overbought=None, ma_short=None, ma_long=None,
+                 name=None, verbose=True):
+        """
+        Initialize Scalping Strategy
+        
+        Args:
+            rsi_period (int): RSI period. If None, uses config.SCALPING_RSI_PERIOD
+            rsi_oversold (float): BUY threshold. If None, uses config.SCALPING_RSI_OVERSOLD
+            rsi_overbought (float): SELL threshold. If None, uses config.SCALPING_RSI_OVERBOUGHT
+            ma_short (int): Trend-confirmation MA period. If None, uses config.SCALPING_MA_SHORT
+            ma_long (int): Long MA period (also the warm-up). If None, uses config.SCALPING_MA_LONG
+            name (str): Strategy name (default: "Scalping Options")
+            verbose (bool): Print status messages
+        """
+        self.name = name or "Scalping Options"
+        self.rsi_period = config.SCALPING_RSI_PERIOD if rsi_period is None else rsi_period
+        self.rsi_oversold = config.SCALPING_RSI_OVERSOLD if rsi_oversold is None else rsi_oversold
+        self.rsi_overbought = config.SCALPING_RSI_OVERBOUGHT if rsi_overbought is None else rsi_overbought
+        self.ma_short = config.SCALPING_MA_SHORT if ma_short is None else ma_short
+        self.ma_long = config.SCALPING_MA_LONG if ma_long is None else ma_long
+        self.verbose = verbose
+        
+        # Registry names of the columns the rules read; the default RSI is
+        # the plain 'rsi' column that add_all_indicators and the store provide
+        self.rsi_column = 'rsi' if self.rsi_period == 14 else f'rsi_{self.rsi_period}'
+        self.ma_short_column = f'ma_{self.ma_short}'
+        self.ma_long_column = f'ma_{self.ma_long}'
+        self.required_indicators = tuple(dict.fromkeys([self.rsi_column, self.ma_short_column, self.ma_long_column]))
+        
+        if self.verbose:
+            print(f"✅ {self.name} strategy initialized")
+            print(f"   RSI Period: {self.rsi_period}")
+            print(f"   RSI Oversold: {self.rsi_oversold}")
+            print(f"   RSI Overbought: {self.rsi_overbought}")
+            print(f"   MA Short: {self.ma_short}, MA Long: {self.ma_long}")
+    
+    @property
+    def params(self):
+        """Rule parameters, as accepted by the constructor"""
+        return {'rsi_period': self.rsi_period, 'rsi_oversold': self.rsi_oversold,
+                'rsi_overbought': self.rsi_overbought, 'ma_short': self.ma_short, 'ma_long': self.ma_long}
+    
+    def find_signals(self, df):
+        """
+        Apply the rules to a frame with the RSI and MA columns
+        
+        Args:
+            df (pd.DataFrame): OHLCV data with the required_indicators columns
             
-            # SELL Signal: RSI overbought
-            elif row['rsi'] > self.rsi_overbought:
-                signals.append({
-                    'timestamp': row['timestamp'],
-                    'action': 'SELL',
-                    'price': row['close'],
-                    'confidence': self._calculate_sell_confidence(row),
-                    'rsi': row['rsi'],
-                    'ma_20': row['ma_20'],
-                    'ma_50': row['ma_50']
-                })
-        
-        # Convert to DataFrame
-        signals_df = pd.DataFrame(signals)
-        
-        if not signals_df.empty:
-            print(f"✅ Generated {len(signals_df)} signals ({len(signals_df[signals_df['action']=='BUY'])} BUY, {len(signals_df[signals_df['action']=='SELL'])} SELL)")
-        else:
-            print("⚠️  No signals generated for this data")
+        Returns:
+            pd.DataFrame: DataFrame with signals (timestamp, action, price,
+                confidence and the RSI/MA values, named like their columns)
+        """
+        rsi = df[self.rsi_column].to_numpy(dtype=float)
+        ma_short = df[self.ma_short_column].to_numpy(dtype=float)
+        ma_long = df[self.ma_long_column].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        
+        buy, sell = scalping_masks(rsi, close, ma_short, ma_long,
+                                   self.rsi_oversold, self.rsi_overbought, self.ma_long)
+        
+        rows = np.flatnonzero(buy | sell)
+        if len(rows) == 0:
+            if self.verbose:
+                print("⚠️  No signals generated for this data")
+            return pd.DataFrame()
+        
+        values = {self.rsi_column: rsi[rows], self.ma_short_column: ma_short[rows],
+                  self.ma_long_column: ma_long[rows], 'close': close[rows]}
+        is_buy = buy[rows]
+        confidence = np.where(is_buy, self._calculate_buy_confidence(values),
+                              self._calculate_sell_confidence(values))
+        
+        picked = df.iloc[rows].reset_index(drop=True)
+        signals_df = pd.DataFrame({
+            'timestamp': picked['timestamp'],
+            'action': np.where(is_buy, 'BUY', 'SELL').astype(object),
+            'price': picked['close'],
+            'confidence': confidence
+        })
+        for column in self.required_indicators:
+            signals_df[column] = picked[column]
+        
+        if self.verbose:
+            buys = int(is_buy.sum())
+            print(f"✅ Generated {len(signals_df)} signals ({buys} BUY, {len(signals_df) - buys} SELL)")
         
         return signals_df
     
@@ -106,26 +247,31 @@ class ScalpingStrategy:
         
         Higher confidence when:
         - RSI is more oversold (closer to 0)
-        - Price is well above MA20
-        - MA20 > MA50 (strong uptrend)
+        - Price is well above the short MA
+        - Short MA > long MA (strong uptrend)
+        
+        Args:
+            row: A row (Series or dict) or a mapping of arrays with close and
+                the RSI/MA columns; arrays give one score per element
         """
+        rsi, close, ma_short, ma_long = (np.asarray(row[key], dtype=float) for key in
+                                         (self.rsi_column, 'close', self.ma_short_column, self.ma_long_column))
         confidence = 0.5  # Base confidence
         
         # RSI component (more oversold = higher confidence)
-        rsi_score = (self.rsi_oversold - row['rsi']) / self.rsi_oversold
-        confidence += rsi_score * 0.3
+        rsi_score = (self.rsi_oversold - rsi) / self.rsi_oversold
+        confidence = confidence + rsi_score * 0.3
         
-        # Trend component (price above MA20)
-        if row['close'] > row['ma_20']:
-            price_above_ma = (row['close'] - row['ma_20']) / row['ma_20']
-            confidence += min(price_above_ma * 10, 0.1)  # Cap at 0.1
+        # Trend component (price above the short MA), capped at 0.1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_above_ma = (close - ma_short) / ma_short
+        confidence = confidence + np.where(close > ma_short, np.minimum(price_above_ma * 10, 0.1), 0.0)
         
-        # Strong uptrend component (MA20 > MA50)
-        if row['ma_20'] > row['ma_50']:
-            confidence += 0.1
+        # Strong uptrend component (short MA > long MA)
+        confidence = confidence + np.where(ma_short > ma_long, 0.1, 0.0)
         
         # Ensure confidence is between 0 and 1
-        return max(0.0, min(1.0, confidence))
+        return _scalar_or_array(np.clip(confidence, 0.0, 1.0))
     
     def _calculate_sell_confidence(self, row):
         """
@@ -133,38 +279,347 @@ class ScalpingStrategy:
         
         Higher confidence when:
         - RSI is more overbought (closer to 100)
-        - Price is below MA20 (trend reversal)
+        - Price is below the short MA (trend reversal)
+        
+        Args:
+            row: A row (Series or dict) or a mapping of arrays with close and
+                the RSI/short MA columns; arrays give one score per element
         """
+        rsi, close, ma_short = (np.asarray(row[key], dtype=float) for key in
+                                (self.rsi_column, 'close', self.ma_short_column))
         confidence = 0.5  # Base confidence
         
         # RSI component (more overbought = higher confidence)
-        rsi_score = (row['rsi'] - self.rsi_overbought) / (100 - self.rsi_overbought)
-        confidence += rsi_score * 0.3
+        rsi_score = (rsi - self.rsi_overbought) / (100 - self.rsi_overbought)
+        confidence = confidence + rsi_score * 0.3
         
-        # Trend reversal component (price below MA20)
-        if row['close'] < row['ma_20']:
-            confidence += 0.2
+        # Trend reversal component (price below the short MA)
+        confidence = confidence + np.where(close < ma_short, 0.2, 0.0)
         
         # Ensure confidence is between 0 and 1
-        return max(0.0, min(1.0, confidence))
+        return _scalar_or_array(np.clip(confidence, 0.0, 1.0))
     
-    def get_current_signal(self, df):
+    def evaluate_bar(self, bar, values, position):
         """
-        Get the most recent signal from the data
+        Signal of a single bar, the per-bar form of generate_signals
         
         Args:
-            df (pd.DataFrame): DataFrame with OHLCV data
+            bar (dict): Bar with timestamp and close
+            values (dict): Values of required_indicators at this bar
+            position (int): Number of bars before this one in the history
             
         Returns:
-            dict: Most recent signal or None
+            dict: Signal (timestamp, action, price, confidence and the RSI/MA values) or None
         """
-        signals = self.generate_signals(df)
+        rsi, ma_short, ma_long = values[self.rsi_column], values[self.ma_short_column], values[self.ma_long_column]
         
-        if signals.empty:
+        # Need enough data for the long MA, and skip NaN indicators (NaN != NaN)
+        if position < self.ma_long or rsi != rsi or ma_short != ma_short or ma_long != ma_long:
             return None
         
-        # Return the most recent signal
-        return signals.iloc[-1].to_dict()
+        close = bar['close']
+        row = {self.rsi_column: rsi, 'close': close, self.ma_short_column: ma_short, self.ma_long_column: ma_long}
+        if rsi < self.rsi_oversold and close > ma_short:
+            action, confidence = 'BUY', self._calculate_buy_confidence(row)
+        elif rsi > self.rsi_overbought:
+            action, confidence = 'SELL', self._calculate_sell_confidence(row)
+        else:
+            return None
+        
+        signal = {
+            'timestamp': bar['timestamp'],
+            'action': action,
+            'price': close,
+            'confidence': confidence
+        }
+        for column in self.required_indicators:
+            signal[column] = values[column]
+        return signal
+
+
+class RuleStrategy(BaseStrategy):
+    """
+    Strategy whose BUY/SELL conditions and confidence scores are rule
+    expressions (see modules/rules.py), so variants need no code changes
+    
+    A bar can signal once warmup bars have passed and every indicator the
+    rules read is defined; BUY takes precedence over SELL on the same bar.
+    """
+    
+    def __init__(self, buy, sell, buy_confidence='0.5', sell_confidence='0.5', warmup=0,
+                 constants=None, name=None, verbose=True):
+        """
+        Initialize the strategy
+        
+        Args:
+            buy (str): Condition for a BUY signal, e.g. 'rsi < 30 and close > ma_20'
+            sell (str): Condition for a SELL signal
+            buy_confidence (str): Confidence of a BUY (clipped to 0-1)
+            sell_confidence (str): Confidence of a SELL (clipped to 0-1)
+            warmup (int): Bars at the start of a history that never signal
+            constants (dict): Named numbers the rules may use, e.g. {'oversold': 30}
+            name (str): Strategy name (default: "Rule Strategy")
+            verbose (bool): Print status messages
+            
+        Raises:
+            RuleError: If a rule does not compile
+        """
+        self.name = name or "Rule Strategy"
+        self.warmup = warmup
+        self.verbose = verbose
+        self.buy_rule = compile_rule(buy, constants)
+        self.sell_rule = compile_rule(sell, constants)
+        self.buy_confidence_rule = compile_rule(buy_confidence, constants)
+        self.sell_confidence_rule = compile_rule(sell_confidence, constants)
+        
+        rules = (self.buy_rule, self.sell_rule, self.buy_confidence_rule, self.sell_confidence_rule)
+        self.required_indicators = tuple(dict.fromkeys(name for rule in rules for name in rule.indicators))
+        self.price_columns = tuple(dict.fromkeys(name for rule in rules for name in rule.names
+                                                 if name in PRICE_COLUMNS))
+        
+        if self.verbose:
+            print(f"✅ {self.name} strategy initialized")
+            print(f"   BUY:  {self.buy_rule.text}")
+            print(f"   SELL: {self.sell_rule.text}")
+    
+    @classmethod
+    def from_config(cls, rules=None, **kwargs):
+        """
+        Strategy from a rule set dict
+        
+        Args:
+            rules (dict): Constructor arguments. If None, uses config.SCALPING_RULES
+            **kwargs: Overrides (e.g. verbose=False)
+        """
+        return cls(**{**(config.SCALPING_RULES if rules is None else rules), **kwargs})
+    
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """
+        Strategy from a JSON rule set file (see rules.load_rules)
+        
+        Args:
+            path (str): JSON file path
+            **kwargs: Overrides (e.g. verbose=False)
+        """
+        return cls.from_config(load_rules(path), **kwargs)
+    
+    def find_signals(self, df):
+        """
+        Apply the rules to a frame with the required indicator columns
+        
+        Args:
+            df (pd.DataFrame): OHLCV data with the required_indicators columns
+            
+        Returns:
+            pd.DataFrame: DataFrame with signals (timestamp, action, price,
+                confidence and the indicator values)
+        """
+        n = len(df)
+        values = {name: df[name].to_numpy(dtype=float) for name in self.required_indicators + self.price_columns}
+        values[BAR] = np.arange(n)
+        
+        ready = values[BAR] >= self.warmup
+        for name in self.required_indicators:
+            ready &= ~np.isnan(values[name])
+        buy = ready & np.broadcast_to(self.buy_rule(values), n)
+        sell = ready & ~buy & np.broadcast_to(self.sell_rule(values), n)
+        
+        rows = np.flatnonzero(buy | sell)
+        if len(rows) == 0:
+            if self.verbose:
+                print("⚠️  No signals generated for this data")
+            return pd.DataFrame()
+        
+        picked_values = {name: column[rows] for name, column in values.items()}
+        is_buy = buy[rows]
+        confidence = np.where(is_buy, self.buy_confidence_rule(picked_values),
+                              self.sell_confidence_rule(picked_values))
+        
+        picked = df.iloc[rows].reset_index(drop=True)
+        signals_df = pd.DataFrame({
+            'timestamp': picked['timestamp'],
+            'action': np.where(is_buy, 'BUY', 'SELL').astype(object),
+            'price': picked['close'],
+            'confidence': np.clip(np.broadcast_to(confidence, len(rows)), 0.0, 1.0)
+        })
+        for column in self.required_indicators:
+            signals_df[column] = picked[column]
+        
+        if self.verbose:
+            buys = int(is_buy.sum())
+            print(f"✅ Generated {len(signals_df)} signals ({buys} BUY, {len(signals_df) - buys} SELL)")
+        
+        return signals_df
+    
+    def evaluate_bar(self, bar, values, position):
+        """
+        Signal of a single bar, the per-bar form of generate_signals
+        
+        Args:
+            bar (dict): Bar with timestamp, close and any other price field the rules read
+            values (dict): Values of required_indicators at this bar
+            position (int): Number of bars before this one in the history
+            
+        Returns:
+            dict: Signal (timestamp, action, price, confidence and the indicator values) or None
+        """
+        # Skip the warm-up and NaN indicators (NaN != NaN)
+        if position < self.warmup or any(value != value for value in values.values()):
+            return None
+        
+        # NumPy scalars so that a zero division gives inf like the batch path
+        namespace = {name: np.float64(value) for name, value in values.items()}
+        for name in self.price_columns:
+            namespace[name] = np.float64(bar[name])
+        namespace[BAR] = position
+        
+        if self.buy_rule(namespace):
+            action, rule = 'BUY', self.buy_confidence_rule
+        elif self.sell_rule(namespace):
+            action, rule = 'SELL', self.sell_confidence_rule
+        else:
+            return None
+        
+        signal = {
+            'timestamp': bar['timestamp'],
+            'action': action,
+            'price': bar['close'],
+            'confidence': float(np.clip(rule(namespace), 0.0, 1.0))
+        }
+        for column in self.required_indicators:
+            signal[column] = values[column]
+        return signal
+
+
+class SignalStream:
+    """
+    Evaluates a strategy one bar at a time for one symbol
+    
+    Keeps streaming state for each of the strategy's required_indicators,
+    so every on_bar call is O(1). Fed the bars of a history in order, it
+    returns the signals generate_signals finds on that history (values
+    agree to floating-point rounding).
+    """
+    
+    def __init__(self, strategy):
+        """
+        Initialize the stream
+        
+        Args:
+            strategy: Strategy with required_indicators and evaluate_bar
+            
+        Raises:
+            ValueError: If a required indicator has no streaming counterpart
+        """
+        self.strategy = strategy
+        self.indicators = {}
+        missing = []
+        for name in strategy.required_indicators:
+            try:
+                self.indicators[name] = streaming_column(name)
+            except KeyError:
+                missing.append(name)
+        if missing:
+            raise ValueError(f"{strategy.name} cannot be streamed: no streaming indicator for {missing}; "
+                             f"use generate_signals instead")
+        # Bar fields the indicators read (e.g. high and low for ATR)
+        self.fields = tuple(dict.fromkeys(field for indicator in self.indicators.values()
+                                          for field in indicator.fields))
+        self.bars = 0
+    
+    def on_bar(self, bar):
+        """
+        Add one closed bar
+        
+        Args:
+            bar (dict): timestamp, close, and the other fields in self.fields
+                and any price field the strategy reads
+            
+        Returns:
+            dict: Signal for this bar, or None
+        """
+        values = {name: indicator.update(bar) for name, indicator in self.indicators.items()}
+        signal = self.strategy.evaluate_bar(bar, values, self.bars)
+        self.bars += 1
+        return signal
+    
+    def get_state(self):
+        """Return a JSON-serializable snapshot"""
+        return {'bars': self.bars,
+                'indicators': {name: indicator.get_state() for name, indicator in self.indicators.items()}}
+    
+    def set_state(self, state):
+        """Restore a snapshot taken with get_state"""
+        for name, indicator in self.indicators.items():
+            indicator.set_state(state['indicators'][name])
+        self.bars = state['bars']
+
+
+class SignalRouter:
+    """
+    Routes live bars of many symbols to one SignalStream per symbol
+    """
+    
+    def __init__(self, strategy):
+        """
+        Initialize the router
+        
+        Args:
+            strategy: Strategy shared by every symbol's stream
+        """
+        self.strategy = strategy
+        self.streams = {}
+    
+    def _stream(self, symbol):
+        stream = self.streams.get(symbol)
+        if stream is None:
+            stream = self.streams[symbol] = SignalStream(self.strategy)
+        return stream
+    
+    def on_bar(self, symbol, bar):
+        """
+        Add one closed bar of a symbol
+        
+        Args:
+            symbol (str): Stock symbol
+            bar (dict): timestamp, close (and any other OHLCV fields)
+            
+        Returns:
+            dict: Signal (with a symbol key) for this bar, or None
+        """
+        signal = self._stream(symbol).on_bar(bar)
+        if signal is not None:
+            signal['symbol'] = symbol
+        return signal
+    
+    def warm_up(self, symbol, df):
+        """
+        Feed a symbol's history so live bars continue from its end
+        
+        Args:
+            symbol (str): Stock symbol
+            df (pd.DataFrame): Past bars with timestamp, close and the other
+                OHLCV fields the strategy reads, oldest first
+            
+        Returns:
+            int: Bars seen for the symbol
+        """
+        stream = self._stream(symbol)
+        columns = ['timestamp'] + [field for field in SOURCE_COLUMNS if field in df.columns]
+        for bar in df[columns].to_dict('records'):
+            stream.on_bar(bar)
+        return stream.bars
+    
+    def get_state(self):
+        """Return a JSON-serializable snapshot of every symbol"""
+        return {symbol: stream.get_state() for symbol, stream in self.streams.items()}
+    
+    def set_state(self, state):
+        """Restore a snapshot taken with get_state"""
+        self.streams = {}
+        for symbol, stream_state in state.items():
+            self._stream(symbol).set_state(stream_state)
 
 
 # Test function
@@ -172,8 +627,6 @@ if __name__ == "__main__":
     print("Testing Scalping Strategy module...")
     
     # Create sample data
-    import numpy as np
-    
     dates = pd.date_range(start='2024-01-01', periods=100, freq='5min')
     np.random.seed(42)
     
@@ -205,5 +658,19 @@ if __name__ == "__main__":
         print("\nGenerated Signals:")
         print(signals[['timestamp', 'action', 'price', 'confidence', 'rsi']].head(10))
     
+    # Same signals bar by bar, as a live feed would deliver them
+    import time
+    router = SignalRouter(strategy)
+    bars = df.to_dict('records')
+    started = time.perf_counter()
+    streamed = [signal for bar in bars if (signal := router.on_bar('TEST', bar)) is not None]
+    elapsed = time.perf_counter() - started
+    print(f"\nStreamed {len(streamed)} signals from {len(bars)} bars "
+          f"({elapsed / len(bars) * 1e6:.1f} µs per bar)")
+    
+    # The same strategy written as rules in config.SCALPING_RULES
+    rule_signals = RuleStrategy.from_config().generate_signals(df)
+    print(f"\nRule strategy matches: {rule_signals.equals(signals)}")
+    
     print("\n✅ Scalping Strategy module test completed!")
 
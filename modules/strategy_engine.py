@@ -0,0 +1,187 @@
+"""
+Strategy Engine module for PTIP
+Runs several strategies over the same symbols with one indicator computation
+
+Every registered strategy declares the indicator columns it reads; the
+engine computes the union of those columns once per symbol (reusing any
+that the frame already has) and hands the same frame to each strategy.
+Signals are written to the signals table in one transaction per symbol.
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import compute_indicators
+
+
+class StrategyEngine:
+    """
+    Runs N registered strategies over a symbol in one pass
+    """
+
+    def __init__(self, strategies=(), db=None, store=None, backend='pandas'):
+        """
+        Initialize the engine
+
+        Args:
+            strategies (list): Strategies (BaseStrategy subclasses) to register
+            db (Database): Database to load candles from and store signals in (optional)
+            store (IndicatorStore): Load candles with stored indicators from here
+                instead of db (optional)
+            backend (str): 'pandas' or 'numpy' for indicators that must be computed
+        """
+        self.db = db
+        self.store = store
+        self.backend = backend
+        self.strategies = []
+        for strategy in strategies:
+            self.register(strategy)
+
+    def register(self, strategy):
+        """
+        Add a strategy
+
+        Args:
+            strategy: Strategy with a unique name
+
+        Returns:
+            The strategy
+
+        Raises:
+            ValueError: If a strategy with the same name is already registered
+        """
+        if any(existing.name == strategy.name for existing in self.strategies):
+            raise ValueError(f"A strategy named '{strategy.name}' is already registered")
+        self.strategies.append(strategy)
+        return strategy
+
+    @property
+    def required_indicators(self):
+        """Union of the strategies' indicator columns, in registration order"""
+        return list(dict.fromkeys(name for strategy in self.strategies
+                                  for name in strategy.required_indicators))
+
+    def run(self, df, copy=False):
+        """
+        Run every strategy on one symbol's candles
+
+        Args:
+            df (pd.DataFrame): OHLCV data, optionally with precomputed indicators
+            copy (bool): Work on a copy of df. If False, missing indicator
+                columns are added to df itself
+
+        Returns:
+            dict: {strategy name: signals DataFrame}
+        """
+        df = compute_indicators(df, self.required_indicators, backend=self.backend, reuse=True, copy=copy)
+        return {strategy.name: strategy.find_signals(df) for strategy in self.strategies}
+
+    def _load(self, symbol, start_date=None, end_date=None, resolution=None):
+        if self.store is not None:
+            return self.store.load(symbol, start_date, end_date, resolution=resolution)
+        return self.db.get_price_data(symbol, start_date, end_date, resolution=resolution)
+
+    def save_signals(self, symbol, results, replace=True, period=None):
+        """
+        Write the signals of every strategy for a symbol in one transaction
+
+        Args:
+            symbol (str): Stock symbol
+            results (dict): {strategy name: signals DataFrame} as returned by run
+            replace (bool): Replace stored signals over the same period (see
+                Database.insert_signals)
+            period (tuple): (first, last) timestamp of the evaluated candles;
+                every strategy in results is cleared over it, even one that
+                produced no signals this time
+
+        Returns:
+            int: Number of signals written, or -1 on error
+        """
+        frames = [signals.assign(strategy=name) for name, signals in results.items() if not signals.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self.db.insert_signals(df, symbol=symbol, replace=replace, period=period, strategies=list(results))
+
+    def run_symbol(self, symbol, start_date=None, end_date=None, resolution=None, save=True):
+        """
+        Load a symbol, run every strategy and store the signals
+
+        Args:
+            symbol (str): Stock symbol
+            start_date (str): Start date (YYYY-MM-DD format)
+            end_date (str): End date (YYYY-MM-DD format)
+            resolution (str): Candle resolution. If None, uses config.DATA_RESOLUTION
+            save (bool): Write the signals to the signals table
+
+        Returns:
+            dict: {strategy name: signals DataFrame}
+        """
+        df = self._load(symbol, start_date, end_date, resolution)
+        if df.empty:
+            return {strategy.name: pd.DataFrame() for strategy in self.strategies}
+        results = self.run(df)
+        if save and self.db is not None:
+            self.save_signals(symbol, results, period=(df['timestamp'].iloc[0], df['timestamp'].iloc[-1]))
+        return results
+
+    def run_all(self, symbols=None, start_date=None, end_date=None, resolution=None, save=True):
+        """
+        Run every strategy over many symbols
+
+        Args:
+            symbols (list): Symbols to run. If None, every stock in the database
+            start_date, end_date, resolution: As for run_symbol
+            save (bool): Write the signals to the signals table
+
+        Returns:
+            pd.DataFrame: Signal counts with symbol, strategy, buy and sell columns
+        """
+        if symbols is None:
+            symbols = self.db.get_all_stocks()['symbol'].tolist()
+
+        started = time.perf_counter()
+        counts = []
+        for symbol in symbols:
+            for name, signals in self.run_symbol(symbol, start_date, end_date, resolution, save).items():
+                actions = signals['action'] if not signals.empty else pd.Series(dtype=object)
+                counts.append({'symbol': symbol, 'strategy': name,
+                               'buy': int((actions == 'BUY').sum()), 'sell': int((actions == 'SELL').sum())})
+        counts = pd.DataFrame(counts, columns=['symbol', 'strategy', 'buy', 'sell'])
+
+        elapsed = time.perf_counter() - started
+        print(f"✅ Ran {len(self.strategies)} strategies over {len(symbols)} symbols in {elapsed:.2f}s "
+              f"({int(counts['buy'].sum() + counts['sell'].sum())} signals)")
+        return counts
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Strategy Engine module...")
+
+    import numpy as np
+    from modules.strategy import ScalpingStrategy
+
+    np.random.seed(42)
+    n = 2000
+    close = 1300 + np.cumsum(np.random.randn(n) * 4 * np.sin(np.arange(n) / 40))
+    df = pd.DataFrame({
+        'timestamp': pd.date_range('2025-09-01', periods=n, freq='5min'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000
+    })
+
+    default = ScalpingStrategy()
+    tight = ScalpingStrategy()
+    tight.name = "Scalping Options (25/75)"
+    tight.rsi_oversold, tight.rsi_overbought = 25, 75
+
+    engine = StrategyEngine([default, tight])
+    print(f"\nIndicators computed once: {engine.required_indicators}")
+    for name, signals in engine.run(df).items():
+        print(f"   {name}: {len(signals)} signals")
+
+    print("\n✅ Strategy Engine module test completed!")
@@ -0,0 +1,291 @@
+"""
+Timeframes module for PTIP
+Derives higher-timeframe candles and indicators from the stored base candles
+
+Higher-timeframe bars are anchored at the session open (15-minute bars at
+09:15, 09:30, ...; hourly bars at 09:15, 10:15, ..., with a short last bar
+before the close). A base bar only sees higher-timeframe bars that had
+closed by the end of that base bar, so aligned values never look ahead.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import INDICATOR_COLUMNS, compute_indicators
+from modules.sessions import minute_of_day, session_frame, session_position
+from modules.streaming_indicators import IndicatorSet
+import config
+
+
+def _base_minutes(base_minutes):
+    return int(base_minutes or config.DATA_RESOLUTION)
+
+
+def _to_utc(local_times, tz):
+    """Naive local times -> naive UTC (the price_data convention)"""
+    return local_times.dt.tz_localize(tz).dt.tz_convert('UTC').dt.tz_localize(None)
+
+
+def resample_candles(df, minutes, tz=None, open_time=None, close_time=None):
+    """
+    Aggregate base candles into session-anchored higher-timeframe candles
+
+    Args:
+        df (pd.DataFrame): Base OHLCV candles with a timestamp column, sorted by time
+        minutes (int): Higher timeframe in minutes, e.g. 15 or 60
+        tz, open_time, close_time: Session definition (defaults from config)
+
+    Returns:
+        pd.DataFrame: timestamp (bar start), end_time (when the bar closes,
+            capped at the session close), open, high, low, close, volume and
+            bars (number of base candles aggregated); timestamps are naive UTC
+    """
+    tz = tz or config.MARKET_TIMEZONE
+    open_minute = minute_of_day(open_time or config.MARKET_OPEN)
+    close_minute = minute_of_day(close_time or config.MARKET_CLOSE)
+
+    sessions = session_frame(df['timestamp'], tz, open_time, close_time)
+    inside = sessions['in_session'].to_numpy()
+    candles = df.loc[inside, ['open', 'high', 'low', 'close', 'volume']].copy()
+    candles['session'] = sessions['session'].to_numpy()[inside]
+    candles['bucket'] = (sessions['minutes_from_open'].to_numpy()[inside] // minutes).astype(np.int64)
+
+    bars = candles.groupby(['session', 'bucket'], sort=True).agg(
+        open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+        close=('close', 'last'), volume=('volume', 'sum'), bars=('close', 'size')
+    ).reset_index()
+
+    start = open_minute + bars['bucket'] * minutes
+    end = np.minimum(start + minutes, close_minute)
+    bars['timestamp'] = _to_utc(bars['session'] + pd.to_timedelta(start, unit='min'), tz)
+    bars['end_time'] = _to_utc(bars['session'] + pd.to_timedelta(end, unit='min'), tz)
+    return bars[['timestamp', 'end_time', 'open', 'high', 'low', 'close', 'volume', 'bars']]
+
+
+def timeframe_label(minutes):
+    """Column suffix of a timeframe: 15 -> '15m'"""
+    return f"{minutes}m"
+
+
+def align_to_base(df, higher, columns, minutes, base_minutes=None):
+    """
+    Attach higher-timeframe values to base bars without lookahead
+
+    Each base bar gets the values of the latest higher-timeframe bar whose
+    end_time is at or before the base bar's own close.
+
+    Args:
+        df (pd.DataFrame): Base candles with a timestamp column, sorted by time
+        higher (pd.DataFrame): Higher-timeframe bars with end_time and the columns
+        columns (list): Columns of higher to attach
+        minutes (int): Higher timeframe, used for the column suffix
+        base_minutes (int): Base candle length. If None, uses config.DATA_RESOLUTION
+
+    Returns:
+        pd.DataFrame: Indexed like df, one '<column>_<minutes>m' column per column
+    """
+    suffix = timeframe_label(minutes)
+    base_close = pd.DataFrame({
+        'base_end': df['timestamp'].to_numpy() + np.timedelta64(_base_minutes(base_minutes), 'm')
+    })
+    right = higher[['end_time'] + list(columns)].rename(
+        columns={column: f"{column}_{suffix}" for column in columns})
+    merged = pd.merge_asof(base_close, right, left_on='base_end', right_on='end_time', direction='backward')
+    merged.index = df.index
+    return merged[[f"{column}_{suffix}" for column in columns]]
+
+
+def add_timeframe_indicators(df, minutes, columns=None, base_minutes=None, backend='pandas',
+                             tz=None, open_time=None, close_time=None):
+    """
+    Add indicators computed on a higher timeframe to base candles
+
+    Args:
+        df (pd.DataFrame): Base OHLCV candles with a timestamp column, sorted by time
+        minutes (int): Higher timeframe in minutes
+        columns (list): Indicator names (registry names, e.g. 'rsi', 'ma_20');
+            default: the add_all_indicators columns
+        base_minutes (int): Base candle length. If None, uses config.DATA_RESOLUTION
+        backend (str): 'pandas' or 'numpy'
+        tz, open_time, close_time: Session definition (defaults from config)
+
+    Returns:
+        pd.DataFrame: Copy of df with '<column>_<minutes>m' columns, e.g. 'rsi_15m'
+    """
+    columns = list(INDICATOR_COLUMNS if columns is None else columns)
+    higher = resample_candles(df, minutes, tz, open_time, close_time)
+    higher = compute_indicators(higher, columns, backend=backend)
+
+    df = df.copy()
+    aligned = align_to_base(df, higher, columns, minutes, base_minutes)
+    for column in aligned.columns:
+        df[column] = aligned[column]
+    return df
+
+
+class TimeframeAggregator:
+    """
+    Builds higher-timeframe candles and indicators as base candles close
+
+    Feed base candles in time order with update(); a higher-timeframe bar is
+    completed by the base candle that reaches its end time (or, if candles
+    are missing, by the first candle after it), and its indicators are then
+    advanced once through a streaming IndicatorSet. The values after each
+    update equal add_timeframe_indicators on the same history.
+    """
+
+    def __init__(self, minutes, base_minutes=None, tz=None, open_time=None, close_time=None):
+        """
+        Initialize the aggregator
+
+        Args:
+            minutes (int): Higher timeframe in minutes
+            base_minutes (int): Base candle length. If None, uses config.DATA_RESOLUTION
+            tz, open_time, close_time: Session definition (defaults from config)
+        """
+        self.minutes = int(minutes)
+        self.base_minutes = _base_minutes(base_minutes)
+        self.tz = tz or config.MARKET_TIMEZONE
+        self.open_time = open_time or config.MARKET_OPEN
+        self.close_time = close_time or config.MARKET_CLOSE
+        self.indicators = IndicatorSet()
+        self.forming = None
+        self.last_bar = None
+        self.values = {column: np.nan for column in IndicatorSet.COLUMNS}
+
+    def _bucket(self, timestamp):
+        """(session date, bucket start minute, end minute) of a base candle, or None"""
+        position = session_position(timestamp, self.tz, self.open_time, self.close_time)
+        if position is None:
+            return None
+        session, offset = position
+        open_minute = minute_of_day(self.open_time)
+        start = open_minute + int(offset // self.minutes) * self.minutes
+        return session, start, min(start + self.minutes, minute_of_day(self.close_time))
+
+    def _utc(self, session, minute):
+        local = pd.Timestamp(session) + pd.Timedelta(minutes=minute)
+        return local.tz_localize(self.tz).tz_convert('UTC').tz_localize(None)
+
+    def _complete(self):
+        """Close the forming bar and advance the indicators"""
+        bar = self.forming
+        self.forming = None
+        self.values = self.indicators.update(bar)
+        self.last_bar = dict(bar, **self.values)
+        return self.last_bar
+
+    def update(self, candle):
+        """
+        Add one closed base candle
+
+        Args:
+            candle (dict): timestamp (bar start, naive UTC), open, high, low, close, volume
+
+        Returns:
+            dict: The higher-timeframe bar (with indicator values) completed by
+                this candle, or None
+        """
+        timestamp = pd.Timestamp(candle['timestamp'])
+        completed = None
+        bucket = self._bucket(timestamp)
+
+        # A candle outside the forming bar closes it, even if the candle
+        # that would normally have closed it never arrived
+        if self.forming is not None and (bucket is None or
+                                         self._utc(bucket[0], bucket[1]) != self.forming['timestamp']):
+            completed = self._complete()
+        if bucket is None:
+            return completed
+
+        session, start, end = bucket
+        if self.forming is None:
+            self.forming = {
+                'timestamp': self._utc(session, start), 'end_time': self._utc(session, end),
+                'open': candle['open'], 'high': candle['high'], 'low': candle['low'],
+                'close': candle['close'], 'volume': candle['volume'], 'bars': 1
+            }
+        else:
+            bar = self.forming
+            bar['high'] = np.fmax(bar['high'], candle['high'])
+            bar['low'] = np.fmin(bar['low'], candle['low'])
+            if not pd.isna(candle['close']):
+                bar['close'] = candle['close']
+            if pd.isna(bar['open']):
+                bar['open'] = candle['open']
+            bar['volume'] += candle['volume']
+            bar['bars'] += 1
+
+        if timestamp + pd.Timedelta(minutes=self.base_minutes) >= self.forming['end_time']:
+            completed = self._complete()
+        return completed
+
+    def current(self, columns=None):
+        """
+        Indicator values of the latest completed higher-timeframe bar
+
+        Args:
+            columns (list): Indicator columns (default: all)
+
+        Returns:
+            dict: {'<column>_<minutes>m': value}
+        """
+        suffix = timeframe_label(self.minutes)
+        return {f"{column}_{suffix}": self.values[column] for column in (columns or IndicatorSet.COLUMNS)}
+
+    def get_state(self):
+        """Return a JSON-serializable snapshot (forming bar and indicators)"""
+        forming = None
+        if self.forming is not None:
+            forming = {key: float(value) for key, value in self.forming.items()
+                       if key not in ('timestamp', 'end_time', 'bars')}
+            forming.update(timestamp=str(self.forming['timestamp']),
+                           end_time=str(self.forming['end_time']), bars=int(self.forming['bars']))
+        return {'minutes': self.minutes, 'indicators': self.indicators.get_state(),
+                'forming': forming, 'values': {key: float(value) for key, value in self.values.items()}}
+
+    def set_state(self, state):
+        """Restore a snapshot taken with get_state"""
+        self.indicators.set_state(state['indicators'])
+        self.values = dict(state['values'])
+        forming = state['forming']
+        if forming is not None:
+            forming = dict(forming, timestamp=pd.Timestamp(forming['timestamp']),
+                           end_time=pd.Timestamp(forming['end_time']))
+        self.forming = forming
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Timeframes module...")
+
+    days = pd.bdate_range('2025-09-01', periods=5)
+    timestamps = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta('03:45:00'), day + pd.Timedelta('09:55:00'), freq='5min')
+        for day in days
+    ]))
+    np.random.seed(42)
+    close = 1300 + np.cumsum(np.random.randn(len(timestamps)) * 2)
+    df = pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close,
+        'high': close + np.random.rand(len(timestamps)),
+        'low': close - np.random.rand(len(timestamps)),
+        'close': close,
+        'volume': np.random.randint(1000, 5000, len(timestamps))
+    })
+
+    hourly = resample_candles(df, 60)
+    print(f"\n{len(df)} five-minute candles -> {len(hourly)} hourly candles")
+    print(hourly.head(8))
+
+    df = add_timeframe_indicators(df, 15, columns=['rsi', 'ma_20'])
+    print(df[['timestamp', 'close', 'rsi_15m', 'ma_20_15m']].tail())
+
+    print("\n✅ Timeframes module test completed!")
@@ -0,0 +1,296 @@
+"""
+Universe module for PTIP
+Computes indicators and signals for every symbol across a process pool
+
+The time x symbol panel is copied once into shared memory; each worker
+attaches to it by name, computes a contiguous block of symbol columns and
+writes indicator values straight into a shared output block, so no price
+or indicator arrays are pickled between processes. Only the (small) signal
+tables travel back through the pool.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import SOURCE_COLUMNS, compute_panel_indicators
+
+
+def shard_ranges(count, workers):
+    """
+    Split count items into contiguous [start, stop) ranges, one per worker
+
+    Args:
+        count (int): Number of items (symbols, grid points, ...)
+        workers (int): Number of workers
+
+    Returns:
+        list: (start, stop) tuples; empty ranges are dropped
+    """
+    bounds = np.linspace(0, count, min(workers, count) + 1).astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+
+def run_in_pool(function, calls, workers):
+    """
+    Call function once per argument tuple across a process pool
+
+    Args:
+        function: Picklable module-level function
+        calls (list): Argument tuples
+        workers (int): Worker processes; with one worker (or one call) the
+            calls run in this process
+
+    Returns:
+        list: Results in the order of calls
+    """
+    if workers == 1 or len(calls) <= 1:
+        return [function(*args) for args in calls]
+    with ProcessPoolExecutor(max_workers=min(workers, len(calls))) as executor:
+        futures = [executor.submit(function, *args) for args in calls]
+        return [future.result() for future in futures]
+
+
+class SharedPanel:
+    """
+    A stack of float64 time x symbol arrays in one shared memory block
+
+    The parent creates it with from_panel() and passes spec to workers,
+    which attach() without copying. close() frees the block in the creating process.
+    """
+
+    def __init__(self, fields, shape, name=None):
+        """
+        Create a block, or attach to an existing one
+
+        Args:
+            fields (list): Names of the stacked arrays
+            shape (tuple): (rows, symbols) of each array
+            name (str): Existing block to attach to. If None, a new block is created
+        """
+        self.fields = list(fields)
+        self.shape = tuple(shape)
+        size = max(len(self.fields) * int(np.prod(self.shape)) * 8, 1)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.values = np.ndarray((len(self.fields),) + self.shape, dtype=np.float64, buffer=self.shm.buf)
+
+    @classmethod
+    def from_panel(cls, panel, fields=None):
+        """
+        Copy wide frames (or 2-D arrays) into a new shared block
+
+        Args:
+            panel (dict): {field: time x symbol DataFrame or array}, all the same shape
+            fields (list): Fields to copy (default: every field in panel)
+
+        Returns:
+            SharedPanel: The new block
+        """
+        fields = list(panel if fields is None else fields)
+        shared = cls(fields, np.shape(panel[fields[0]]))
+        for i, field in enumerate(fields):
+            shared.values[i] = np.asarray(panel[field], dtype=np.float64)
+        return shared
+
+    @classmethod
+    def attach(cls, spec):
+        """Attach to the block described by spec"""
+        return cls(spec['fields'], spec['shape'], name=spec['name'])
+
+    @property
+    def spec(self):
+        """Picklable description for workers"""
+        return {'name': self.shm.name, 'fields': self.fields, 'shape': self.shape}
+
+    def field(self, name):
+        """View of one array"""
+        return self.values[self.fields.index(name)]
+
+    def close(self):
+        """Detach (and free the block if this process created it)"""
+        self.values = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _compute_shard(source_spec, output_spec, start, stop, backend, precision):
+    """Worker: indicators for symbol columns [start, stop)"""
+    source = SharedPanel.attach(source_spec)
+    output = SharedPanel.attach(output_spec)
+    try:
+        panel = {field: source.values[i, :, start:stop] for i, field in enumerate(source.fields)}
+        results = compute_panel_indicators(panel, output.fields, backend=backend, precision=precision)
+        for i, column in enumerate(output.fields):
+            output.values[i, :, start:stop] = results[column]
+    finally:
+        source.close()
+        output.close()
+    return stop - start
+
+
+def _signal_shard(source_spec, start, stop, timestamps, symbols, strategy):
+    """Worker: strategy signals for symbol columns [start, stop)"""
+    source = SharedPanel.attach(source_spec)
+    try:
+        close = source.field('close')[:, start:stop]
+        tables = []
+        for j, symbol in enumerate(symbols):
+            # Rows without a candle (before listing, after delisting, gaps)
+            rows = np.flatnonzero(~np.isnan(close[:, j]))
+            if len(rows) == 0:
+                continue
+            df = pd.DataFrame({'timestamp': timestamps[rows]})
+            for i, field in enumerate(source.fields):
+                df[field] = source.values[i, rows, start + j]
+            # Per-symbol progress lines from many processes would interleave
+            with contextlib.redirect_stdout(io.StringIO()):
+                signals = strategy.generate_signals(df)
+            if not signals.empty:
+                signals.insert(0, 'symbol', symbol)
+                tables.append(signals)
+    finally:
+        source.close()
+    return tables
+
+
+class UniverseRunner:
+    """
+    Runs indicator and signal computation over many symbols in parallel
+
+    Symbols are split into one contiguous block of columns per worker; each
+    block is computed with the vectorized panel kernels, so the per-process
+    work is the same as the single-process compute_panel_indicators and the
+    runner scales with the number of cores.
+    """
+
+    def __init__(self, workers=None, backend='numpy', precision='float64'):
+        """
+        Initialize the runner
+
+        Args:
+            workers (int): Worker processes (default: CPU count)
+            backend (str): 'pandas' or 'numpy' for the indicator kernels
+            precision (str): 'float64' or 'float32' for the returned indicators
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.precision = precision
+        self.symbols = 0
+        self.elapsed = 0.0
+
+    def _shards(self, count):
+        """Contiguous [start, stop) column ranges, one per worker"""
+        return shard_ranges(count, self.workers)
+
+    def _run(self, function, calls):
+        """Call function once per argument tuple; in-process when there is one worker"""
+        return run_in_pool(function, calls, self.workers)
+
+    def compute_indicators(self, panel, columns):
+        """
+        Compute indicators for every symbol of a panel
+
+        Args:
+            panel (dict): {field: wide DataFrame} as from Database.get_price_panel
+                or make_panel (at least 'close' and the fields the columns need)
+            columns (list): Indicator names, as for compute_indicators
+
+        Returns:
+            dict: {column: wide DataFrame}, equal to compute_panel_indicators
+        """
+        started = time.perf_counter()
+        reference = panel['close']
+        fields = [field for field in SOURCE_COLUMNS if field in panel]
+        source = SharedPanel.from_panel(panel, fields)
+        output = SharedPanel(columns, source.shape)
+        try:
+            shards = self._shards(source.shape[1])
+            self._run(_compute_shard, [(source.spec, output.spec, start, stop, self.backend, self.precision)
+                                       for start, stop in shards])
+            results = {}
+            for i, column in enumerate(columns):
+                values = output.values[i].astype(np.float32 if self.precision == 'float32' else np.float64)
+                results[column] = pd.DataFrame(values, index=reference.index, columns=reference.columns)
+        finally:
+            source.close()
+            output.close()
+
+        self.symbols = source.shape[1]
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Computed {len(columns)} indicators for {self.symbols} symbols with "
+              f"{len(shards)} workers in {self.elapsed:.2f}s")
+        return results
+
+    def generate_signals(self, panel, strategy):
+        """
+        Run a strategy over every symbol of a panel
+
+        Args:
+            panel (dict): {field: wide DataFrame} with the OHLCV fields the strategy reads
+            strategy: Object with generate_signals(df) (e.g. ScalpingStrategy);
+                must be picklable
+
+        Returns:
+            pd.DataFrame: Signals of all symbols with a leading symbol column
+        """
+        started = time.perf_counter()
+        reference = panel['close']
+        symbols = list(reference.columns)
+        timestamps = reference.index.to_numpy()
+        fields = [field for field in SOURCE_COLUMNS if field in panel]
+        source = SharedPanel.from_panel(panel, fields)
+        try:
+            shards = self._shards(len(symbols))
+            tables = sum(self._run(_signal_shard, [(source.spec, start, stop, timestamps, symbols[start:stop], strategy)
+                                                   for start, stop in shards]), [])
+        finally:
+            source.close()
+
+        signals = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+        self.symbols = len(symbols)
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Generated {len(signals)} signals for {self.symbols} symbols with "
+              f"{len(shards)} workers in {self.elapsed:.2f}s")
+        return signals
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Universe module...")
+
+    from modules.strategy import ScalpingStrategy
+
+    np.random.seed(42)
+    n, k = 2000, 500
+    index = pd.date_range('2025-01-01 03:45:00', periods=n, freq='5min')
+    symbols = [f"SYM{i:03d}" for i in range(k)]
+    close = 1000 + np.cumsum(np.random.randn(n, k), axis=0)
+    panel = {
+        'open': pd.DataFrame(close + np.random.randn(n, k) * 0.5, index=index, columns=symbols),
+        'high': pd.DataFrame(close + np.random.rand(n, k), index=index, columns=symbols),
+        'low': pd.DataFrame(close - np.random.rand(n, k), index=index, columns=symbols),
+        'close': pd.DataFrame(close, index=index, columns=symbols),
+        'volume': pd.DataFrame(np.random.randint(1000, 5000, (n, k)).astype(float), index=index, columns=symbols)
+    }
+
+    runner = UniverseRunner()
+    indicators = runner.compute_indicators(panel, ['rsi', 'ma_20', 'ma_50', 'macd', 'bb_upper', 'atr'])
+    print(indicators['rsi'].iloc[-3:, :5])
+
+    signals = runner.generate_signals({field: frame.iloc[:, :20] for field, frame in panel.items()},
+                                      ScalpingStrategy())
+    print(signals.head())
+
+    print("\n✅ Universe module test completed!")
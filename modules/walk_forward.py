@@ -0,0 +1,301 @@
+"""
+Walk-Forward module for PTIP
+Out-of-sample evaluation of strategy parameters with rolling or anchored windows
+
+The history is split into folds of trading days: each fold picks the best
+candidate on its training window and reports how that candidate did on the
+following test window, which the choice never saw. All folds are evaluated
+in one pass: indicators are computed once over the full history of each
+symbol (they only depend on past bars) and every train and test window is
+a slice of them, so overlapping windows share the work and the first bars
+of a test window trade on warmed-up indicators, as they would live.
+
+Two kinds of candidates are supported:
+- Scalping parameter grids (run_grid), evaluated with the optimizer's
+  sweeps and sharded across processes by grid point
+- Any list of BaseStrategy instances (run_strategies), sharded across
+  processes by symbol
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.backtest import METRICS, backtest_windows, bar_returns, bars_per_year, signal_masks, summarize_metrics
+from modules.indicators import SOURCE_COLUMNS
+from modules.optimizer import PARAMETERS, ScalpingOptimizer
+from modules.strategy_engine import StrategyEngine
+from modules.universe import SharedPanel, run_in_pool, shard_ranges
+
+
+def walk_forward_windows(index, train_days, test_days, step_days=None, anchored=False):
+    """
+    Train/test row ranges of consecutive walk-forward folds
+
+    Args:
+        index (pd.DatetimeIndex): Bar timestamps, sorted
+        train_days (int): Trading days in each training window
+        test_days (int): Trading days in each test window
+        step_days (int): Days between fold starts (default: test_days, so
+            test windows tile the history without overlap)
+        anchored (bool): Start every training window at the first day
+            instead of rolling it forward
+
+    Returns:
+        pd.DataFrame: One row per fold with train_start, train_stop,
+            test_start and test_stop (row positions, stop exclusive) and the
+            train_from, test_from and test_to dates
+    """
+    dates = pd.DatetimeIndex(index).normalize()
+    days = dates.unique()
+    day_rows = np.append(np.searchsorted(dates, days), len(dates))
+    step = step_days or test_days
+
+    folds = []
+    start = 0
+    while start + train_days + test_days <= len(days):
+        train_first = 0 if anchored else start
+        test_first = start + train_days
+        folds.append({
+            'fold': len(folds),
+            'train_start': int(day_rows[train_first]), 'train_stop': int(day_rows[test_first]),
+            'test_start': int(day_rows[test_first]), 'test_stop': int(day_rows[test_first + test_days]),
+            'train_from': days[train_first], 'test_from': days[test_first],
+            'test_to': days[test_first + test_days - 1]
+        })
+        start += step
+    return pd.DataFrame(folds, columns=['fold', 'train_start', 'train_stop', 'test_start', 'test_stop',
+                                        'train_from', 'test_from', 'test_to'])
+
+
+def _strategy_shard(source_spec, start, stop, timestamps, symbols, strategies, windows, cost, periods_per_year):
+    """Worker: metrics of every strategy on symbol columns [start, stop) and every window"""
+    source = SharedPanel.attach(source_spec)
+    try:
+        engine = StrategyEngine(strategies)
+        periods = bars_per_year() if periods_per_year is None else periods_per_year
+        close = source.field('close')[:, start:stop]
+        records = []
+        for j, symbol in enumerate(symbols):
+            # The symbol's own candles, as in universe._signal_shard
+            rows = np.flatnonzero(~np.isnan(close[:, j]))
+            if len(rows) == 0:
+                continue
+            df = pd.DataFrame({'timestamp': timestamps[rows]})
+            for i, field in enumerate(source.fields):
+                df[field] = source.values[i, rows, start + j]
+            filled, returns = bar_returns(df['close'].to_numpy())
+            # Panel rows to rows of this symbol's history
+            local = np.searchsorted(rows, np.asarray(windows))
+
+            # Indicators for every strategy are computed once per symbol
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = engine.run(df)
+            for name, signals in results.items():
+                buy, sell = signal_masks(df, signals)
+                table = backtest_windows(filled, returns, buy, sell, local, cost, periods)
+                for window, metrics in enumerate(table):
+                    if not np.isnan(metrics[0]):
+                        records.append((window, name, symbol, *metrics))
+    finally:
+        source.close()
+    return records
+
+
+class WalkForward:
+    """
+    Walk-forward optimization and out-of-sample reporting
+    """
+
+    def __init__(self, train_days, test_days, step_days=None, anchored=False, objective='sharpe',
+                 workers=None, cost=0.0, periods_per_year=None):
+        """
+        Initialize the walk-forward engine
+
+        Args:
+            train_days (int): Trading days in each training window
+            test_days (int): Trading days in each test window
+            step_days (int): Days between folds (default: test_days)
+            anchored (bool): Grow the training window from the first day
+                instead of rolling it
+            objective (str): Training metric that picks each fold's candidate
+            workers (int): Worker processes (default: CPU count)
+            cost (float): Fractional cost per entry and exit (see backtest_signals)
+            periods_per_year (float): Bars per year for the Sharpe ratio
+        """
+        if objective not in METRICS:
+            raise ValueError(f"Unknown objective '{objective}', expected one of {METRICS}")
+        self.train_days = train_days
+        self.test_days = test_days
+        self.step_days = step_days
+        self.anchored = anchored
+        self.objective = objective
+        self.workers = workers or os.cpu_count() or 1
+        self.cost = cost
+        self.periods_per_year = periods_per_year
+        self.folds = pd.DataFrame()
+        self.results = pd.DataFrame()
+        self.report = pd.DataFrame()
+        self.elapsed = 0.0
+
+    def windows(self, index):
+        """Folds of an index, as for walk_forward_windows"""
+        folds = walk_forward_windows(index, self.train_days, self.test_days, self.step_days, self.anchored)
+        if folds.empty:
+            raise ValueError(f"History of {len(pd.DatetimeIndex(index).normalize().unique())} days is too "
+                             f"short for {self.train_days} train + {self.test_days} test days")
+        return folds
+
+    @staticmethod
+    def _row_windows(folds):
+        """Train windows of every fold, then test windows"""
+        return (list(zip(folds['train_start'], folds['train_stop']))
+                + list(zip(folds['test_start'], folds['test_stop'])))
+
+    def run_grid(self, panel, grid):
+        """
+        Walk-forward optimization of ScalpingStrategy parameters
+
+        Args:
+            panel (dict or pd.DataFrame): {field: wide DataFrame} with 'close',
+                or the wide close DataFrame
+            grid (pd.DataFrame): Parameter combinations, e.g. from scalping_grid
+
+        Returns:
+            pd.DataFrame: One row per fold with its dates, the chosen
+                candidate, its training objective and its out-of-sample
+                metrics (also kept in self.report)
+        """
+        started = time.perf_counter()
+        close = panel['close'] if isinstance(panel, dict) else panel
+        self.folds = self.windows(close.index)
+        optimizer = ScalpingOptimizer(workers=self.workers, cost=self.cost, periods_per_year=self.periods_per_year)
+        self.results = optimizer.evaluate(close, grid, self._row_windows(self.folds))
+        self.report = self._report(PARAMETERS)
+
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Walk-forward: {len(self.folds)} folds x {len(grid)} parameter sets on "
+              f"{close.shape[1]} symbols in {self.elapsed:.2f}s")
+        return self.report
+
+    def run_strategies(self, panel, strategies):
+        """
+        Walk-forward selection among strategy instances
+
+        Args:
+            panel (dict): {field: wide DataFrame} with the OHLCV fields the
+                strategies read, as from Database.get_price_panel
+            strategies (list): BaseStrategy instances with unique names; must
+                be picklable
+
+        Returns:
+            pd.DataFrame: One row per fold with its dates, the chosen
+                candidate, its training objective and its out-of-sample
+                metrics (also kept in self.report)
+        """
+        started = time.perf_counter()
+        reference = panel['close']
+        symbols = list(reference.columns)
+        self.folds = self.windows(reference.index)
+        windows = self._row_windows(self.folds)
+
+        fields = [field for field in SOURCE_COLUMNS if field in panel]
+        source = SharedPanel.from_panel(panel, fields)
+        try:
+            shards = shard_ranges(len(symbols), self.workers)
+            records = sum(run_in_pool(_strategy_shard, [
+                (source.spec, start, stop, reference.index.to_numpy(), symbols[start:stop], strategies, windows,
+                 self.cost, self.periods_per_year) for start, stop in shards], self.workers), [])
+        finally:
+            source.close()
+
+        results = pd.DataFrame(records, columns=['window', 'strategy', 'symbol'] + METRICS)
+        results[['trades', 'wins']] = results[['trades', 'wins']].astype(int)
+        self.results = results
+        self.report = self._report(['strategy'])
+
+        self.elapsed = time.perf_counter() - started
+        print(f"✅ Walk-forward: {len(self.folds)} folds x {len(strategies)} strategies on "
+              f"{len(symbols)} symbols in {self.elapsed:.2f}s")
+        return self.report
+
+    def _report(self, keys):
+        """Pick each fold's best training candidate and collect its test metrics"""
+        count = len(self.folds)
+        rows = []
+        for fold in self.folds.itertuples(index=False):
+            train = self.results[self.results['window'] == fold.fold]
+            test = self.results[self.results['window'] == count + fold.fold]
+            if train.empty:
+                continue
+            # to_dict('records') keeps integer parameters and counts as ints
+            chosen = summarize_metrics(train, keys, self.objective).iloc[:1].to_dict('records')[0]
+            picked = test[(test[keys] == [chosen[key] for key in keys]).all(axis=1)]
+            row = {'fold': fold.fold, 'train_from': fold.train_from, 'test_from': fold.test_from,
+                   'test_to': fold.test_to}
+            row.update({key: chosen[key] for key in keys})
+            row[f'train_{self.objective}'] = chosen[self.objective]
+            if not picked.empty:
+                tested = summarize_metrics(picked, keys, self.objective).iloc[:1].to_dict('records')[0]
+                row.update({name: tested[name] for name in ['symbols'] + METRICS})
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def summary(self):
+        """
+        Out-of-sample metrics over all folds
+
+        Returns:
+            dict: folds, trades and wins summed, win_rate pooled, max_drawdown
+                the worst, and total_return, sharpe and exposure averaged
+        """
+        report = self.report
+        if report.empty:
+            raise ValueError("No results yet; call run_grid() or run_strategies() first")
+        trades, wins = int(report['trades'].sum()), int(report['wins'].sum())
+        return {
+            'folds': len(report), 'trades': trades, 'wins': wins,
+            'win_rate': wins / trades if trades else 0.0,
+            'total_return': float(report['total_return'].mean()),
+            'max_drawdown': float(report['max_drawdown'].min()),
+            'sharpe': float(report['sharpe'].mean()),
+            'exposure': float(report['exposure'].mean())
+        }
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Walk-Forward module...")
+
+    from modules.optimizer import scalping_grid
+    from modules.strategy import ScalpingStrategy
+
+    np.random.seed(42)
+    n, k = 88 * 75, 5
+    index = pd.date_range('2025-01-01', periods=88, freq='B').repeat(75) + pd.to_timedelta(
+        np.tile(np.arange(75) * 5 + 225, 88), unit='min')
+    close = 1000 + np.cumsum(np.random.randn(n, k) * 2 * np.sin(np.arange(n) / 40)[:, None], axis=0)
+    close = pd.DataFrame(close, index=index, columns=[f"SYM{i}" for i in range(k)])
+
+    grid = scalping_grid(rsi_period=[7, 9, 14, 21], rsi_oversold=[20, 25, 30, 35],
+                         rsi_overbought=[65, 70, 75, 80], ma_short=[5, 10, 20], ma_long=[30, 50])
+    walk = WalkForward(train_days=30, test_days=10, cost=0.0005)
+    print(walk.run_grid({'close': close}, grid).to_string())
+    print(f"\nOut of sample: {walk.summary()}")
+
+    panel = {'close': close, 'open': close, 'high': close + 1, 'low': close - 1,
+             'volume': pd.DataFrame(1000.0, index=index, columns=close.columns)}
+    candidates = [ScalpingStrategy(verbose=False),
+                  ScalpingStrategy(rsi_period=9, rsi_oversold=25, rsi_overbought=75, name="Scalping 9/25/75",
+                                   verbose=False)]
+    print(WalkForward(train_days=30, test_days=10, anchored=True).run_strategies(panel, candidates).to_string())
+
+    print("\n✅ Walk-Forward module test completed!")
@@ -0,0 +1,121 @@
+"""
+Grid search of scalping strategy parameters on stored candles
+Backtests every parameter combination on every symbol in parallel and
+writes the ranked results table
+
+Examples:
+    python optimize.py --days 90
+    python optimize.py --rsi-period 7 10 14 21 --oversold 20 25 30 35 --overbought 65 70 75 80 \\
+        --ma-short 5 10 20 --ma-long 30 50 100 --cost 0.0005 --output results/scalping_grid.csv
+    python optimize.py --rsi-period 5 7 9 11 14 17 21 --oversold 20 25 30 35 40 \\
+        --search halving --samples 500 --eta 3 --seed 1
+    python optimize.py --days 120 --rsi-period 7 9 14 21 --oversold 20 25 30 35 \\
+        --search walk-forward --train-days 30 --test-days 10
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.backfill import default_date_range, parse_date
+from modules.backtest import METRICS
+from modules.database import Database
+from modules.optimizer import ScalpingOptimizer, sample_grid, scalping_grid
+from modules.walk_forward import WalkForward
+import config
+
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(description="Scalping strategy parameter grid search")
+    parser.add_argument('--symbols', nargs='+', default=config.DEFAULT_STOCKS, help="Symbols to backtest")
+    parser.add_argument('--start', type=parse_date, help="First date, YYYY-MM-DD")
+    parser.add_argument('--end', type=parse_date, help="Last date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--days', type=int, default=90, help="Days before --end when --start is not given")
+    parser.add_argument('--resolution', default=config.DATA_RESOLUTION, help="Candle resolution")
+
+    parser.add_argument('--rsi-period', type=int, nargs='+', help="RSI periods to try")
+    parser.add_argument('--oversold', type=float, nargs='+', help="RSI oversold thresholds to try")
+    parser.add_argument('--overbought', type=float, nargs='+', help="RSI overbought thresholds to try")
+    parser.add_argument('--ma-short', type=int, nargs='+', help="Short MA periods to try")
+    parser.add_argument('--ma-long', type=int, nargs='+', help="Long MA periods to try")
+
+    parser.add_argument('--search', default='grid', choices=['grid', 'halving', 'walk-forward'],
+                        help="Backtest every combination, successive halving from short to full history, "
+                             "or walk-forward out-of-sample evaluation")
+    parser.add_argument('--samples', type=int, help="Random sample of combinations to search (default: all)")
+    parser.add_argument('--seed', type=int, help="Random seed for --samples")
+    parser.add_argument('--eta', type=int, default=3, help="Halving: keep the top 1/eta per rung")
+    parser.add_argument('--min-bars', type=int, help="Halving: bars of the first rung")
+    parser.add_argument('--train-days', type=int, default=30, help="Walk-forward: training days per fold")
+    parser.add_argument('--test-days', type=int, default=10, help="Walk-forward: test days per fold")
+    parser.add_argument('--step-days', type=int, help="Walk-forward: days between folds (default: --test-days)")
+    parser.add_argument('--anchored', action='store_true', help="Walk-forward: train from the first day")
+    parser.add_argument('--objective', default='sharpe', choices=METRICS, help="Metric to rank by")
+    parser.add_argument('--cost', type=float, default=0.0, help="Fractional cost per entry and exit")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=20, help="Rows of the ranking to print")
+    parser.add_argument('--output', help="Write the ranked table to this CSV file")
+    parser.add_argument('--db', default=config.DB_PATH, help="SQLite database path")
+    return parser
+
+
+def main(argv=None):
+    """Run the grid search and return a process exit code"""
+    args = build_parser().parse_args(argv)
+
+    if args.start:
+        start_date, end_date = args.start, args.end
+    else:
+        start_date, end_date = default_date_range(args.days, args.end)
+
+    db = Database(db_path=args.db)
+    try:
+        panel = db.get_price_panel(args.symbols, fields=('close',), start_date=str(start_date),
+                                   end_date=str(end_date) if end_date else None, resolution=args.resolution)
+    finally:
+        db.close()
+    if panel['close'].empty:
+        print("❌ No candles found for the selected symbols and dates")
+        return 2
+
+    grid = scalping_grid(args.rsi_period, args.oversold, args.overbought, args.ma_short, args.ma_long)
+    print(f"📊 {len(grid)} parameter sets x {panel['close'].shape[1]} symbols x "
+          f"{panel['close'].shape[0]} bars")
+    if args.samples:
+        grid = sample_grid(grid, args.samples, seed=args.seed)
+        print(f"🎲 Sampled {len(grid)} parameter sets")
+
+    if args.search == 'walk-forward':
+        walk = WalkForward(args.train_days, args.test_days, args.step_days, args.anchored, args.objective,
+                           workers=args.workers, cost=args.cost)
+        report = walk.run_grid(panel, grid)
+        print(report.to_string())
+        print(f"\n📈 Out of sample: {walk.summary()}")
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            report.to_csv(args.output, index=False)
+            print(f"💾 Saved {len(report)} folds to {args.output}")
+        return 0
+
+    optimizer = ScalpingOptimizer(workers=args.workers, cost=args.cost)
+    if args.search == 'halving':
+        summary = optimizer.halving(panel, grid, objective=args.objective, eta=args.eta, min_bars=args.min_bars)
+        print(optimizer.rungs.to_string(index=False))
+    else:
+        summary = optimizer.run(panel, grid, objective=args.objective)
+    print(summary.head(args.top).to_string())
+    print(f"\n🏆 Best parameters: {optimizer.best()}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        summary.to_csv(args.output, index=False)
+        print(f"💾 Saved {len(summary)} rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
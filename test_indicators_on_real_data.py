@@ -8,11 +8,29 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.database import Database
-from modules.indicators import add_all_indicators
+from modules.indicator_store import IndicatorStore
 from modules.strategy import ScalpingStrategy
+from modules.universe import UniverseRunner
 import config
 
 
+def scan_universe(db):
+    """Latest RSI and trend of every symbol, computed as one panel across all cores"""
+    panel = db.get_price_panel(fields=('high', 'low', 'close'))
+    if not panel or panel['close'].empty:
+        print("⚠️  No candles to scan")
+        return
+
+    values = UniverseRunner().compute_indicators(panel, ['rsi', 'ma_20', 'ma_50', 'atr'])
+    latest = {column: frame.ffill().iloc[-1] for column, frame in values.items()}
+    latest['close'] = panel['close'].ffill().iloc[-1]
+
+    print(f"\n📊 Universe scan ({panel['close'].shape[1]} symbols, {len(panel['close'])} timestamps):")
+    for symbol, rsi in latest['rsi'].sort_values().items():
+        trend = "⬆️ " if latest['ma_20'][symbol] > latest['ma_50'][symbol] else "⬇️ "
+        print(f"   {trend} {symbol}: RSI={rsi:.2f} | Close=₹{latest['close'][symbol]:.2f} | ATR={latest['atr'][symbol]:.2f}")
+
+
 def main():
     print("="*80)
     print("TESTING INDICATORS & STRATEGY ON REAL DATA")
@@ -20,6 +38,7 @@ def main():
     
     db = Database()
     strategy = ScalpingStrategy()
+    store = IndicatorStore(db)
     
     # Get all stocks
     stocks_df = db.get_all_stocks()
@@ -34,19 +53,16 @@ def main():
         print(f"[{idx+1}/{len(stocks_df)}] {stock_name} ({symbol})")
         print('='*80)
         
-        # Get price data
-        df = db.get_price_data(symbol)
+        # Get price data with stored indicators (computed only for new candles)
+        print(f"\n📊 Loading indicators...")
+        df_with_indicators = store.load(symbol)
         
-        if df.empty:
+        if df_with_indicators.empty:
             print(f"❌ No data for {symbol}")
             continue
         
-        print(f"✅ Loaded {len(df)} records")
-        print(f"   Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
-        
-        # Add indicators
-        print(f"\n📊 Calculating indicators...")
-        df_with_indicators = add_all_indicators(df.copy())
+        print(f"✅ Loaded {len(df_with_indicators)} records")
+        print(f"   Date range: {df_with_indicators['timestamp'].min()} to {df_with_indicators['timestamp'].max()}")
         
         # Check if indicators were added
         indicator_cols = ['rsi', 'ma_20', 'ma_50', 'ma_200', 'ema_12', 'ema_26', 
@@ -70,7 +86,7 @@ def main():
         
         # Generate signals
         print(f"\n🎯 Generating trading signals...")
-        signals_df = strategy.generate_signals(df_with_indicators.copy())
+        signals_df = strategy.generate_signals(df_with_indicators)
 
         if signals_df.empty:
             print(f"⚠️  No signals generated (all HOLD)")
@@ -102,24 +118,21 @@ def main():
             emoji = "🟢" if signal_type == 'BUY' else "🔴"
             print(f"   {emoji} {signal_type} at {timestamp} | Price: ₹{price:.2f} | Confidence: {confidence:.2f}")
 
-        # Store signals in database
+        # Store signals in database (one transaction; reruns replace the same period)
         print(f"\n💾 Storing signals in database...")
-        signals_to_store = signals_df.copy()
-        
-        if not signals_to_store.empty:
-            for _, sig_row in signals_to_store.iterrows():
-                db.insert_signal(
-                    symbol=symbol,
-                    strategy='Scalping Options',
-                    timestamp=sig_row['timestamp'],
-                    action=sig_row['action'],
-                    price=sig_row['price'],
-                    confidence=sig_row.get('confidence', 0.0)
-                )
-            print(f"✅ Stored {len(signals_to_store)} signals in database")
+        period = (df_with_indicators['timestamp'].min(), df_with_indicators['timestamp'].max())
+        stored = db.insert_signals(signals_df, symbol=symbol, strategy=strategy.name, replace=True, period=period)
+        if stored > 0:
+            print(f"✅ Stored {stored} signals in database")
         else:
             print(f"⚠️  No signals to store")
 
+    # Universe-wide scan in one vectorized pass
+    print(f"\n{'='*80}")
+    print("UNIVERSE SCAN")
+    print('='*80)
+    scan_universe(db)
+
     # Overall summary
     print(f"\n{'='*80}")
     print("OVERALL SUMMARY")
@@ -0,0 +1,193 @@
+"""
+Test suite for backfill module
+"""
+
+import sys
+import os
+import threading
+import pytest
+import pandas as pd
+from datetime import date, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.backfill import WINDOW_EPOCH, BackfillJob, plan_windows, load_symbols_file
+from modules.data_fetcher import FyersAPIError
+from modules.database import Database
+from modules.rate_limit import RateLimiter
+from modules.resilience import ResilientCaller
+
+
+class FakeFetcher:
+    """Returns one candle per day in the requested window"""
+
+    def __init__(self, fail=None, expire_after=None):
+        self.fail = fail or set()
+        self.expire_after = expire_after
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def fetch_history(self, symbol, from_date, to_date, resolution='5'):
+        with self._lock:
+            self.calls.append((symbol, from_date, to_date))
+            calls = len(self.calls)
+        if self.expire_after is not None and calls > self.expire_after:
+            raise FyersAPIError("token expired", code=-16)
+        if symbol in self.fail:
+            raise FyersAPIError("bad symbol", code=-300)
+        days = pd.date_range(from_date, to_date, freq='D') + pd.Timedelta(hours=3, minutes=45)
+        return pd.DataFrame({
+            'timestamp': days,
+            'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 1000
+        })
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary database"""
+    db = Database(db_path=str(tmp_path / "backfill.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def limiter():
+    """Rate limiter that never blocks in tests"""
+    return RateLimiter(limits=[(10000, 1.0)])
+
+
+class TestPlanWindows:
+    """Test request window planning"""
+
+    def test_windows_cover_range_without_overlap(self):
+        """Test that windows tile the date range"""
+        windows = plan_windows(date(2025, 1, 1), date(2025, 12, 31), '5')
+
+        assert windows[0][0] == date(2025, 1, 1)
+        assert windows[-1][1] == date(2025, 12, 31)
+        for (_, prev_end), (next_start, _) in zip(windows, windows[1:]):
+            assert (next_start - prev_end).days == 1
+        assert all((end - start).days < 100 for start, end in windows)
+
+    def test_boundaries_do_not_depend_on_range(self):
+        """Test that windows start on fixed calendar dates, whatever the requested start"""
+        windows = plan_windows(date(2025, 1, 1), date(2025, 12, 31), '5')
+        assert all((start - WINDOW_EPOCH).days % 100 == 0 for start, _ in windows[1:])
+
+        shifted = plan_windows(date(2025, 1, 2), date(2026, 1, 1), '5')
+        assert shifted[1:-1] == windows[1:-1]
+        assert shifted[0][1] == windows[0][1]
+
+    def test_daily_resolution_uses_larger_windows(self):
+        """Test that daily data uses the longer API limit"""
+        daily = plan_windows(date(2025, 1, 1), date(2025, 12, 31), 'D')
+        assert len(daily) < len(plan_windows(date(2025, 1, 1), date(2025, 12, 31), '5'))
+        assert all((end - start).days < 366 for start, end in daily)
+
+    def test_window_days_capped_at_api_limit(self):
+        """Test that a too-large window is capped"""
+        windows = plan_windows(date(2025, 1, 1), date(2025, 12, 31), '5', window_days=1000)
+        assert all((end - start).days < 100 for start, end in windows)
+
+
+class TestBackfillJob:
+    """Test checkpointed backfill runs"""
+
+    def test_run_stores_data_and_checkpoints(self, db, limiter):
+        """Test a complete run"""
+        job = BackfillJob(FakeFetcher(), db, ["NSE:TCS-EQ", "NSE:INFY-EQ"],
+                          date(2025, 1, 2), date(2025, 1, 31), workers=3,
+                          window_days=10, rate_limiter=limiter)
+
+        assert job.run() is True
+        assert job.completed == 6
+        assert len(db.get_price_data("NSE:TCS-EQ")) == 30
+        assert len(db.get_backfill_checkpoints('5')) == 6
+
+    def test_resume_after_token_expiry(self, db, limiter):
+        """Test that a rerun only fetches units that did not complete"""
+        symbols = ["NSE:TCS-EQ", "NSE:INFY-EQ"]
+        first = BackfillJob(FakeFetcher(expire_after=2), db, symbols,
+                            date(2025, 1, 2), date(2025, 1, 31), workers=1,
+                            window_days=10, rate_limiter=limiter)
+        assert first.run() is False
+        assert first.aborted is True
+        assert first.completed == 2
+
+        fetcher = FakeFetcher()
+        second = BackfillJob(fetcher, db, symbols, date(2025, 1, 2), date(2025, 1, 31),
+                             workers=2, window_days=10, rate_limiter=limiter)
+        assert second.run() is True
+        assert second.skipped == 2
+        assert len(fetcher.calls) == 4
+        assert len(db.get_price_data("NSE:INFY-EQ")) == 30
+
+    def test_resume_with_shifted_range(self, db, limiter):
+        """Test that a rerun a day later only fetches the days it has not checkpointed"""
+        first = BackfillJob(FakeFetcher(), db, ["NSE:TCS-EQ"], date(2025, 1, 2), date(2025, 3, 2),
+                            window_days=10, rate_limiter=limiter)
+        assert first.run() is True
+        assert first.completed == 6
+
+        fetcher = FakeFetcher()
+        second = BackfillJob(fetcher, db, ["NSE:TCS-EQ"], date(2025, 1, 3), date(2025, 3, 3),
+                             window_days=10, rate_limiter=limiter)
+        assert second.run() is True
+        assert second.skipped == 6
+        assert fetcher.calls == [("NSE:TCS-EQ", date(2025, 3, 3), date(2025, 3, 3))]
+        assert len(db.get_price_data("NSE:TCS-EQ")) == 61
+
+    def test_failed_units_are_not_checkpointed(self, db, limiter):
+        """Test that failures are reported and retried on the next run"""
+        job = BackfillJob(FakeFetcher(fail={"NSE:BAD-EQ"}), db, ["NSE:TCS-EQ", "NSE:BAD-EQ"],
+                          date(2025, 1, 1), date(2025, 1, 10), rate_limiter=limiter)
+
+        assert job.run() is False
+        assert job.failed == [("NSE:BAD-EQ", date(2025, 1, 1), date(2025, 1, 10))]
+        assert db.get_backfill_checkpoints('5') == {("NSE:TCS-EQ", "2025-01-01", "2025-01-10")}
+
+    def test_windows_ending_today_are_not_checkpointed(self, db, limiter):
+        """Test that a window still receiving candles is fetched again on the next run"""
+        today = date.today()
+        job = BackfillJob(FakeFetcher(), db, ["NSE:TCS-EQ"], today - timedelta(days=19), today,
+                          window_days=10, rate_limiter=limiter)
+
+        assert job.run() is True
+        assert job.completed == len(job.windows)
+        assert db.get_backfill_checkpoints('5') == {
+            ("NSE:TCS-EQ", start.isoformat(), end.isoformat()) for start, end in job.windows[:-1]}
+        assert job.pending_units() == [("NSE:TCS-EQ", *job.windows[-1])]
+
+    def test_caller_limiter_paces_every_attempt(self, db):
+        """Test that a limiter shared with the caller is not acquired twice per unit"""
+        class CountingLimiter(RateLimiter):
+            acquired = 0
+
+            def acquire(self):
+                CountingLimiter.acquired += 1
+
+        limiter = CountingLimiter()
+        fetcher = FakeFetcher()
+        fetcher.caller = ResilientCaller(rate_limiter=limiter)
+        fetch_history = fetcher.fetch_history
+        fetcher.fetch_history = lambda *args: fetcher.caller.call('history', fetch_history, *args)
+
+        job = BackfillJob(fetcher, db, ["NSE:TCS-EQ"], date(2025, 1, 2), date(2025, 1, 31),
+                          window_days=10, rate_limiter=limiter)
+        assert job.run() is True
+        assert CountingLimiter.acquired == 3
+
+
+class TestSymbolsFile:
+    """Test symbol list loading"""
+
+    def test_load_symbols_file(self, tmp_path):
+        """Test comments and blank lines are ignored"""
+        path = tmp_path / "symbols.txt"
+        path.write_text("# universe\nNSE:TCS-EQ\n\nNSE:INFY-EQ  # IT\n")
+        assert load_symbols_file(path) == ["NSE:TCS-EQ", "NSE:INFY-EQ"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
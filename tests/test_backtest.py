@@ -0,0 +1,104 @@
+"""
+Test suite for backtest module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.backtest import backtest, backtest_signals, bars_per_year, positions_from_signals
+from modules.strategy import ScalpingStrategy
+
+
+def masks(n, buys=(), sells=()):
+    buy = np.zeros(n, dtype=bool)
+    sell = np.zeros(n, dtype=bool)
+    buy[list(buys)] = True
+    sell[list(sells)] = True
+    return buy, sell
+
+
+class TestPositions:
+    """Test turning signals into a long-only position"""
+
+    def test_buy_holds_until_sell(self):
+        """Test that repeated signals in the same direction are ignored"""
+        buy, sell = masks(8, buys=[1, 2, 6], sells=[4, 5])
+        np.testing.assert_array_equal(positions_from_signals(buy, sell), [0, 1, 1, 1, 0, 0, 1, 1])
+
+    def test_no_signals(self):
+        """Test that no signals means no position"""
+        buy, sell = masks(5)
+        assert positions_from_signals(buy, sell).sum() == 0
+
+
+class TestBacktestSignals:
+    """Test the metrics of known trades"""
+
+    def test_round_trips(self):
+        """Test trade counting, returns and drawdown on hand-made prices"""
+        close = np.array([100, 100, 110, 99, 99, 90, 95, 100.0])
+        buy, sell = masks(8, buys=[1, 4], sells=[3])
+        result = backtest_signals(close, buy, sell, periods_per_year=1)
+
+        assert result['trades'] == 2
+        assert result['wins'] == 1
+        assert result['win_rate'] == 0.5
+        # 100 -> 99 and 99 -> 100 (the open trade is closed on the last bar)
+        assert result['avg_trade_return'] == pytest.approx((-0.01 + 100 / 99 - 1) / 2)
+        assert result['total_return'] == pytest.approx(0.99 * 100 / 99 - 1)
+        # Equity peaks at 1.1 and bottoms at 0.99 * 90 / 99
+        assert result['max_drawdown'] == pytest.approx(0.9 / 1.1 - 1)
+        assert result['exposure'] == pytest.approx(6 / 8)
+
+    def test_costs_reduce_returns(self):
+        """Test that every entry and exit is charged"""
+        close = np.linspace(100, 120, 50)
+        buy, sell = masks(50, buys=[5], sells=[40])
+        free = backtest_signals(close, buy, sell)
+        costly = backtest_signals(close, buy, sell, cost=0.001)
+        assert costly['avg_trade_return'] == pytest.approx(free['avg_trade_return'] - 0.002)
+        assert costly['total_return'] < free['total_return']
+
+    def test_missing_prices_carry_forward(self):
+        """Test that NaN bars keep the previous price"""
+        close = np.array([100, 101, np.nan, 103, 104.0])
+        buy, sell = masks(5, buys=[1], sells=[4])
+        result = backtest_signals(close, buy, sell)
+        assert result['total_return'] == pytest.approx(104 / 101 - 1)
+
+    def test_empty(self):
+        """Test that empty input gives zero metrics"""
+        buy, sell = masks(0)
+        assert backtest_signals(np.array([]), buy, sell)['trades'] == 0
+
+    def test_bars_per_year(self):
+        """Test the annualisation factor for 5-minute NSE bars"""
+        assert bars_per_year('5') == 252 * 75
+
+
+class TestBacktestTable:
+    """Test backtesting a strategy's signals table"""
+
+    def test_matches_masks(self):
+        """Test that a signals table gives the same metrics as its masks"""
+        np.random.seed(3)
+        n = 3000
+        close = 1300 + np.cumsum(np.random.randn(n) * 4 * np.sin(np.arange(n) / 40))
+        df = pd.DataFrame({'timestamp': pd.date_range('2025-09-01', periods=n, freq='5min'), 'close': close})
+        signals = ScalpingStrategy(verbose=False).generate_signals(df, copy=True)
+        assert not signals.empty
+
+        rows = pd.Index(df['timestamp']).get_indexer(signals['timestamp'])
+        buy, sell = masks(n, rows[signals['action'] == 'BUY'], rows[signals['action'] == 'SELL'])
+        assert backtest(df, signals) == backtest_signals(close, buy, sell)
+        assert backtest(df, pd.DataFrame())['trades'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,65 @@
+"""
+Test suite for the indicator benchmark script
+"""
+
+import sys
+import os
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmark_indicators import compare_results, load_results, main, run_benchmark, save_results
+
+
+def record(seconds, peak_mb, backend='numpy', size=100000, indicator='rsi'):
+    return {'size': size, 'indicator': indicator, 'backend': backend,
+            'seconds': seconds, 'peak_mb': peak_mb}
+
+
+class TestBenchmark:
+    """Test measurement, persistence and regression checks"""
+
+    def test_run_and_round_trip(self, tmp_path):
+        """Test that every case is measured on every backend and survives a save/load"""
+        records = run_benchmark([500], repeat=1)
+        assert len(records) == 8 * 2
+        assert all(r['seconds'] > 0 and r['peak_mb'] > 0 for r in records)
+        assert all(r['max_diff'] < 1e-6 for r in records if r['indicator'] == 'rsi')
+
+        path = tmp_path / 'bench.json'
+        save_results(records, str(path), repeat=1)
+        loaded = load_results(str(path))
+        assert [r['indicator'] for r in loaded] == [r['indicator'] for r in records]
+        assert loaded[-1]['max_diff'] is None
+
+    def test_compare_flags_slowdown_and_memory(self):
+        """Test that only changes beyond the tolerance are reported"""
+        baseline = [record(0.100, 10.0), record(0.100, 10.0, backend='pandas')]
+        current = [record(0.120, 13.0), record(0.140, 10.0, backend='pandas')]
+        regressions = compare_results(current, baseline, tolerance=0.25)
+
+        assert {(r['backend'], r['metric']) for r in regressions} == {('numpy', 'peak_mb'), ('pandas', 'seconds')}
+        assert regressions[1]['ratio'] == pytest.approx(1.4)
+
+    def test_compare_ignores_noise_and_new_cases(self):
+        """Test sub-millisecond timings and cases missing from the baseline"""
+        baseline = [record(0.0001, 1.0)]
+        current = [record(0.0005, 1.0), record(1.0, 1.0, indicator='atr')]
+        assert compare_results(current, baseline) == []
+
+    def test_main_exit_code(self, tmp_path):
+        """Test that a regression against a baseline fails the run"""
+        path = str(tmp_path / 'bench.json')
+        assert main(['--sizes', '500', '--repeat', '1', '--indicators', 'rsi', '--output', path]) == 0
+
+        baseline = load_results(path)
+        for r in baseline:
+            r['seconds'] /= 1000
+            r['peak_mb'] /= 1000
+        save_results(baseline, path, repeat=1)
+        assert main(['--sizes', '500', '--repeat', '1', '--indicators', 'rsi', '--compare', path]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,157 @@
+"""
+Test suite for bulk_loader module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.bulk_loader import (
+    BulkLoader,
+    detect_format,
+    load_file,
+    normalize_symbols,
+    parse_file,
+    validate_ohlc
+)
+from modules.database import Database
+
+
+LEGACY_BHAVCOPY = """SYMBOL,SERIES,OPEN,HIGH,LOW,CLOSE,LAST,PREVCLOSE,TOTTRDQTY,TOTTRDVAL,TIMESTAMP,TOTALTRADES,ISIN,
+RELIANCE,EQ,1370.0,1385.5,1365.1,1380.2,1380.0,1368.9,5123456,7.05E9,01-OCT-2025,120345,INE002A01018,
+TCS,EQ,2900.0,2950.0,2890.0,2940.5,2941.0,2899.0,1234567,3.6E9,01-OCT-2025,80321,INE467B01029,
+TCS,BL,2900.0,2900.0,2900.0,2900.0,2900.0,2899.0,1000,2.9E6,01-OCT-2025,1,INE467B01029,
+BADROW,EQ,100.0,90.0,95.0,99.0,99.0,98.0,1000,1.0E5,01-OCT-2025,10,INE000000000,
+"""
+
+UDIFF_BHAVCOPY = """TradDt,BizDt,Sgmt,Src,FinInstrmTp,FinInstrmId,ISIN,TckrSymb,SctySrs,OpnPric,HghPric,LwPric,ClsPric,LastPric,PrvsClsgPric,TtlTradgVol
+2025-10-03,2025-10-03,CM,NSE,STK,2885,INE002A01018,RELIANCE,EQ,1381.0,1390.0,1375.0,1388.0,1388.1,1380.2,4000000
+"""
+
+VENDOR_INTRADAY = """Date,Time,Open,High,Low,Close,Volume
+2025-10-01,09:15:00,1370.0,1372.0,1369.0,1371.0,1000
+2025-10-01,09:20:00,1371.0,1374.0,1370.5,1373.0,1500
+2025-10-01,09:25:00,1373.0,,1372.0,1372.5,900
+"""
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    """Directory with one file of every supported layout"""
+    (tmp_path / "cm01OCT2025bhav.csv").write_text(LEGACY_BHAVCOPY)
+    (tmp_path / "BhavCopy_NSE_CM_20251003.csv").write_text(UDIFF_BHAVCOPY)
+    (tmp_path / "INFY.csv").write_text(VENDOR_INTRADAY)
+    return tmp_path
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary database"""
+    db = Database(db_path=str(tmp_path / "bulk.db"))
+    yield db
+    db.close()
+
+
+class TestParsing:
+    """Test layout detection, normalization and validation"""
+
+    def test_detect_format(self):
+        """Test that each header is recognised"""
+        assert detect_format(LEGACY_BHAVCOPY.splitlines()[0].split(',')) == 'bhavcopy'
+        assert detect_format(UDIFF_BHAVCOPY.splitlines()[0].split(',')) == 'bhavcopy_udiff'
+        assert detect_format(VENDOR_INTRADAY.splitlines()[0].split(',')) == 'vendor'
+        with pytest.raises(ValueError):
+            detect_format(['a', 'b'])
+
+    def test_normalize_symbols(self):
+        """Test conversion to Fyers symbols"""
+        tickers = pd.Series(['reliance', 'TCS', 'NSE:INFY-EQ'])
+        series = pd.Series(['EQ', 'BE', 'EQ'])
+        assert normalize_symbols(tickers, series).tolist() == [
+            'NSE:RELIANCE-EQ', 'NSE:TCS-BE', 'NSE:INFY-EQ'
+        ]
+
+    def test_validate_ohlc(self):
+        """Test that inconsistent bars are rejected"""
+        df = pd.DataFrame({
+            'open': [10.0, 10.0, 10.0, -1.0],
+            'high': [11.0, 9.0, 11.0, 11.0],
+            'low': [9.0, 9.5, 9.0, -2.0],
+            'close': [10.5, 9.6, 12.0, 10.0],
+            'volume': [100, 100, 100, 100]
+        })
+        assert validate_ohlc(df).tolist() == [True, False, False, False]
+
+    def test_parse_legacy_bhavcopy(self, archive_dir):
+        """Test series filtering, validation and daily timestamps"""
+        df, rows_read, rows_rejected = parse_file(str(archive_dir / "cm01OCT2025bhav.csv"))
+
+        assert rows_read == 4
+        assert rows_rejected == 1
+        assert df['symbol'].tolist() == ['NSE:RELIANCE-EQ', 'NSE:TCS-EQ']
+        assert (df['resolution'] == 'D').all()
+        # Midnight IST is 18:30 UTC on the previous day
+        assert df['timestamp'].iloc[0] == pd.Timestamp('2025-09-30 18:30:00')
+
+    def test_parse_vendor_file(self, archive_dir):
+        """Test symbol from file name and IST to UTC conversion"""
+        df, rows_read, rows_rejected = parse_file(str(archive_dir / "INFY.csv"), resolution='5')
+
+        assert rows_read == 3
+        assert rows_rejected == 1
+        assert (df['symbol'] == 'NSE:INFY-EQ').all()
+        assert df['timestamp'].iloc[0] == pd.Timestamp('2025-10-01 03:45:00')
+
+
+class TestBulkLoader:
+    """Test parallel loading into the database"""
+
+    def test_load_directory(self, db, archive_dir):
+        """Test that all files are parsed in parallel and upserted"""
+        loader = BulkLoader(db, workers=2, resolution='5')
+        written = loader.load([str(archive_dir)])
+
+        assert written == 5
+        assert loader.files_loaded == 3
+        assert loader.rows_rejected == 2
+        assert loader.rows_per_second > 0
+
+        daily = db.get_price_data('NSE:RELIANCE-EQ', resolution='D')
+        assert len(daily) == 2
+        assert daily['close'].tolist() == [1380.2, 1388.0]
+
+        intraday = db.get_price_data('NSE:INFY-EQ', resolution='5')
+        assert len(intraday) == 2
+        assert 'NSE:TCS-EQ' in db.get_all_stocks()['symbol'].tolist()
+
+    def test_load_file_writes_each_chunk(self, db, archive_dir, monkeypatch):
+        """Test that a file is upserted chunk by chunk instead of as one frame"""
+        batches = []
+        upsert = db.upsert_price_data
+
+        def recording(df, *args, **kwargs):
+            batches.append(len(df))
+            return upsert(df, *args, **kwargs)
+
+        monkeypatch.setattr(db, 'upsert_price_data', recording)
+        counts = load_file(db, str(archive_dir / "cm01OCT2025bhav.csv"), chunksize=2)
+
+        assert counts == (4, 1, 2)
+        assert batches == [2, 0]
+        assert len(db.get_price_data('NSE:TCS-EQ', resolution='D')) == 1
+
+    def test_reload_is_idempotent(self, db, archive_dir):
+        """Test that importing the same files twice does not duplicate rows"""
+        BulkLoader(db, workers=1).load([str(archive_dir / "*.csv")])
+        BulkLoader(db, workers=1).load([str(archive_dir / "*.csv")])
+
+        count = db.conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0]
+        assert count == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
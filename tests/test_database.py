@@ -79,6 +79,90 @@ class TestDatabaseCreation:
         assert cursor.fetchone() is not None
 
 
+class TestMigrations:
+    """Test upgrades of databases created by older versions"""
+    
+    def test_price_data_gains_resolution_column(self, tmp_path):
+        """Test that an old price_data table is rebuilt with its rows intact"""
+        import sqlite3
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE price_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                timestamp DATETIME NOT NULL,
+                open REAL NOT NULL,
+                high REAL NOT NULL,
+                low REAL NOT NULL,
+                close REAL NOT NULL,
+                volume INTEGER,
+                UNIQUE(symbol, timestamp)
+            )
+        ''')
+        conn.execute("INSERT INTO price_data (symbol, timestamp, open, high, low, close, volume) "
+                     "VALUES ('NSE:TCS-EQ', '2025-10-01 03:45:00', 1, 2, 0.5, 1.5, 10)")
+        conn.commit()
+        conn.close()
+        
+        db = Database(db_path=path)
+        df = db.get_price_data("NSE:TCS-EQ")
+        assert len(df) == 1
+        assert df['resolution'].iloc[0] == config.DATA_RESOLUTION
+        
+        # Same timestamp at another resolution no longer collides
+        daily = pd.DataFrame({'timestamp': ['2025-10-01 03:45:00'], 'open': [1.0], 'high': [2.0],
+                              'low': [0.5], 'close': [1.5], 'volume': [10]})
+        assert db.upsert_price_data(daily, "NSE:TCS-EQ", resolution='D') == 1
+        assert len(db.get_price_data("NSE:TCS-EQ")) == 1
+        db.close()
+    
+    def test_failed_migration_rolls_back(self, tmp_path):
+        """Test that an error during the rebuild leaves the old table untouched"""
+        import sqlite3
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE price_data (id INTEGER PRIMARY KEY, symbol TEXT, timestamp DATETIME, "
+                     "open REAL, high REAL, low REAL, close REAL, volume INTEGER)")
+        # A NULL open cannot be copied into the new NOT NULL column
+        conn.execute("INSERT INTO price_data (symbol, timestamp, open, high, low, close, volume) "
+                     "VALUES ('NSE:TCS-EQ', '2025-10-01 03:45:00', NULL, 2, 0.5, 1.5, 10)")
+        conn.commit()
+        conn.close()
+        
+        with pytest.raises(sqlite3.IntegrityError):
+            Database(db_path=path)
+        
+        conn = sqlite3.connect(path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(price_data)")]
+        assert conn.execute("SELECT COUNT(*) FROM price_data").fetchone()[0] == 1
+        conn.close()
+        assert 'price_data_old' not in tables
+        assert 'resolution' not in columns
+    
+    def test_leftover_price_data_old_is_restored(self, tmp_path):
+        """Test that rows stranded by an interrupted migration are merged back"""
+        import sqlite3
+        path = str(tmp_path / "interrupted.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE price_data_old (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL, "
+                     "timestamp DATETIME NOT NULL, open REAL NOT NULL, high REAL NOT NULL, low REAL NOT NULL, "
+                     "close REAL NOT NULL, volume INTEGER, UNIQUE(symbol, timestamp))")
+        conn.execute("INSERT INTO price_data_old (symbol, timestamp, open, high, low, close, volume) "
+                     "VALUES ('NSE:TCS-EQ', '2025-10-01 03:45:00', 1, 2, 0.5, 1.5, 10)")
+        conn.commit()
+        conn.close()
+        
+        db = Database(db_path=path)
+        df = db.get_price_data("NSE:TCS-EQ")
+        tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        db.close()
+        assert len(df) == 1
+        assert df['resolution'].iloc[0] == config.DATA_RESOLUTION
+        assert 'price_data_old' not in tables
+
+
 class TestStockOperations:
     """Test stock CRUD operations"""
     
@@ -181,6 +265,33 @@ class TestPriceDataOperations:
         count = cursor.fetchone()[0]
         assert count == 10
 
+    def test_upsert_price_data(self, db, sample_price_data):
+        """Test that upserting overlapping data overwrites instead of failing"""
+        db.add_stock("NSE:RELIANCE-EQ", "Reliance Industries", "NSE")
+        assert db.upsert_price_data(sample_price_data, "NSE:RELIANCE-EQ") == 10
+
+        updated = sample_price_data.copy()
+        updated['close'] = updated['close'] + 1
+        assert db.upsert_price_data(updated, "NSE:RELIANCE-EQ") == 10
+
+        df = db.get_price_data("NSE:RELIANCE-EQ")
+        assert len(df) == 10
+        assert df['close'].iloc[0] == 1306
+
+    def test_get_price_panel(self, db, sample_price_data):
+        """Test loading several symbols as wide frames with ragged histories"""
+        db.add_stock("NSE:RELIANCE-EQ", "Reliance Industries", "NSE")
+        db.add_stock("NSE:TCS-EQ", "Tata Consultancy Services", "NSE")
+        db.upsert_price_data(sample_price_data, "NSE:RELIANCE-EQ")
+        db.upsert_price_data(sample_price_data.iloc[4:], "NSE:TCS-EQ")
+
+        panel = db.get_price_panel(["NSE:RELIANCE-EQ", "NSE:TCS-EQ"], fields=('close',))
+        close = panel['close']
+        assert list(close.columns) == ["NSE:RELIANCE-EQ", "NSE:TCS-EQ"]
+        assert len(close) == 10
+        assert close["NSE:TCS-EQ"].isna().sum() == 4
+        assert close["NSE:RELIANCE-EQ"].iloc[0] == 1305
+
 
 class TestSignalOperations:
     """Test signal storage and retrieval"""
@@ -0,0 +1,101 @@
+"""
+Test suite for indicator_kernels module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import indicator_kernels as kernels
+
+
+@pytest.fixture
+def prices():
+    """Random walk with a few gaps and a flat stretch"""
+    np.random.seed(21)
+    values = 1300 + np.cumsum(np.random.randn(5000) * 2)
+    values[[100, 101, 2500]] = np.nan
+    values[3000:3040] = 1310.0
+    return values
+
+
+class TestRollingWindows:
+    """Test rolling kernels against pandas"""
+
+    @pytest.mark.parametrize("window", [1, 2, 14, 20, 200, 4999, 6000])
+    def test_mean_max_min(self, prices, window):
+        """Test mean, max and min, including NaN windows and short series"""
+        series = pd.Series(prices)
+        np.testing.assert_allclose(kernels.rolling_mean(prices, window),
+                                   series.rolling(window).mean().to_numpy(), rtol=1e-10, atol=1e-9)
+        np.testing.assert_array_equal(kernels.rolling_max(prices, window),
+                                      series.rolling(window).max().to_numpy())
+        np.testing.assert_array_equal(kernels.rolling_min(prices, window),
+                                      series.rolling(window).min().to_numpy())
+
+    def test_std_matches_pandas_and_is_exact(self, prices):
+        """Test std against pandas and against a direct computation"""
+        mean, std = kernels.rolling_mean_std(prices, 20)
+        np.testing.assert_allclose(std, pd.Series(prices).rolling(20).std().to_numpy(), rtol=1e-6, atol=1e-6)
+
+        clean = prices[200:2400]
+        exact = sliding_window_view(clean, 20).std(axis=1, ddof=1)
+        np.testing.assert_allclose(kernels.rolling_mean_std(clean, 20)[1][19:], exact, rtol=1e-9, atol=1e-10)
+
+    def test_constant_windows_are_exact(self, prices):
+        """Test that windows of one repeated value give exactly that value and zero std"""
+        mean, std = kernels.rolling_mean_std(prices, 20)
+        assert (mean[3019:3040] == 1310.0).all()
+        assert (std[3019:3040] == 0.0).all()
+
+    def test_long_series_precision(self):
+        """Test that rounding error does not grow with the series length"""
+        np.random.seed(4)
+        values = 1300 + np.cumsum(np.random.randn(2_000_000))
+        tail = values[-5000:]
+        exact = sliding_window_view(tail, 50).mean(axis=1)
+        np.testing.assert_allclose(kernels.rolling_mean(values, 50)[-len(exact):], exact, rtol=0, atol=1e-10)
+
+    def test_two_dimensional_input(self, prices):
+        """Test that each column is an independent series along axis 0"""
+        panel = np.column_stack([prices, prices[::-1], np.arange(5000.0)])
+        result = kernels.rolling_max(panel, 14)
+        assert result.shape == panel.shape
+        for column in range(3):
+            np.testing.assert_array_equal(result[:, column], kernels.rolling_max(panel[:, column], 14))
+        np.testing.assert_allclose(kernels.rolling_mean(panel, 20)[:, 1], kernels.rolling_mean(prices[::-1], 20))
+
+    def test_moments_for_many_windows_and_columns(self, prices):
+        """Test that one pass over several series and windows matches the single-window kernels"""
+        panel = np.column_stack([prices, prices[::-1]])
+        mean, std = kernels.rolling_moments_multi(panel, [5, 20], with_std=True)
+        assert mean.shape == std.shape == (2, 5000, 2)
+        for i, window in enumerate([5, 20]):
+            expected_mean, expected_std = kernels.rolling_mean_std(panel, window)
+            np.testing.assert_allclose(mean[i], expected_mean, rtol=1e-10, atol=1e-9)
+            np.testing.assert_allclose(std[i], expected_std, rtol=1e-6, atol=1e-6)
+        assert kernels.rolling_moments_multi(panel, [5])[1] is None
+
+
+class TestTrueRange:
+    """Test the fused true range"""
+
+    def test_matches_three_column_max(self):
+        """Test against the pandas concat/max formulation"""
+        np.random.seed(2)
+        close = pd.Series(100 + np.cumsum(np.random.randn(300)))
+        high = close + np.random.rand(300)
+        low = close - np.random.rand(300)
+        expected = pd.concat([high - low, (high - close.shift()).abs(), (low - close.shift()).abs()],
+                             axis=1).max(axis=1)
+        np.testing.assert_array_equal(kernels.true_range(high, low, close), expected.to_numpy())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,142 @@
+"""
+Test suite for indicator_store module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.database import Database
+from modules.indicators import INDICATOR_PARAMS, add_all_indicators
+from modules.indicator_store import (
+    INDICATOR_SET_HASH,
+    IndicatorStore,
+    params_hash
+)
+
+SYMBOL = "NSE:TCS-EQ"
+
+
+def make_candles(n, start='2025-09-01 03:45:00', seed=5):
+    """Create n five-minute candles"""
+    np.random.seed(seed)
+    closes = 3000 + np.cumsum(np.random.randn(n) * 5)
+    return pd.DataFrame({
+        'timestamp': pd.date_range(start=start, periods=n, freq='5min'),
+        'open': closes + np.random.randn(n),
+        'high': closes + np.abs(np.random.randn(n) * 3),
+        'low': closes - np.abs(np.random.randn(n) * 3),
+        'close': closes,
+        'volume': np.random.randint(1000, 5000, n)
+    })
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary database"""
+    db = Database(db_path=str(tmp_path / "indicators.db"))
+    db.add_stock(SYMBOL, "TCS", "NSE")
+    yield db
+    db.close()
+
+
+def assert_matches_recompute(stored, db):
+    """Compare stored indicators with add_all_indicators on the full history"""
+    expected = add_all_indicators(db.get_price_data(SYMBOL))
+    assert len(stored) == len(expected)
+    for column in INDICATOR_PARAMS:
+        np.testing.assert_allclose(stored[column].to_numpy(dtype=float),
+                                   expected[column].to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-8, err_msg=column)
+
+
+class TestParamsHash:
+    """Test indicator keys"""
+
+    def test_hash_is_stable_and_parameter_sensitive(self):
+        """Test that equal parameters hash equally and different ones do not"""
+        assert params_hash('rsi', {'period': 14}) == params_hash('rsi', {'period': 14})
+        assert params_hash('rsi', {'period': 14}) != params_hash('rsi', {'period': 21})
+
+    def test_set_hash_follows_indicator_params(self):
+        """Test that the store key changes with any parameter add_all_indicators uses"""
+        params = {name: dict(p) for name, p in INDICATOR_PARAMS.items()}
+        params['stoch_d']['d_period'] = 5
+        assert params_hash('add_all_indicators', params) != INDICATOR_SET_HASH
+        assert list(add_all_indicators(make_candles(30)).columns[-len(INDICATOR_PARAMS):]) == list(INDICATOR_PARAMS)
+
+
+class TestIndicatorStore:
+    """Test materialization and reads"""
+
+    def test_initial_materialization(self, db):
+        """Test that the first run computes and stores every candle"""
+        db.upsert_price_data(make_candles(300), SYMBOL)
+        store = IndicatorStore(db)
+
+        assert store.materialize(SYMBOL) == 300
+        assert store.materialize(SYMBOL) == 0
+        assert_matches_recompute(store.load(SYMBOL, refresh=False), db)
+
+    def test_incremental_extension(self, db):
+        """Test that only new candles are computed and results match a recompute"""
+        candles = make_candles(320)
+        db.upsert_price_data(candles.iloc[:300], SYMBOL)
+        store = IndicatorStore(db)
+        store.materialize(SYMBOL)
+
+        db.upsert_price_data(candles.iloc[300:], SYMBOL)
+        assert store.materialize(SYMBOL) == 20
+
+        checkpoint = db.get_indicator_checkpoint(SYMBOL, '5', INDICATOR_SET_HASH)
+        assert checkpoint['bars'] == 320
+        assert_matches_recompute(store.load(SYMBOL), db)
+
+    def test_rebuild_when_older_history_is_added(self, db):
+        """Test that candles inserted before the checkpoint trigger a rebuild"""
+        candles = make_candles(260)
+        db.upsert_price_data(candles.iloc[10:], SYMBOL)
+        store = IndicatorStore(db)
+        store.materialize(SYMBOL)
+
+        db.upsert_price_data(candles.iloc[:10], SYMBOL)
+        assert store.materialize(SYMBOL) == 260
+        assert_matches_recompute(store.load(SYMBOL, refresh=False), db)
+
+    def test_rebuild_when_a_candle_is_corrected(self, db):
+        """Test that rewriting a stored candle in place makes its indicators stale"""
+        candles = make_candles(300)
+        db.upsert_price_data(candles, SYMBOL)
+        store = IndicatorStore(db)
+        store.materialize(SYMBOL)
+
+        corrected = candles.iloc[[150]].copy()
+        corrected['close'] += 50
+        db.upsert_price_data(corrected, SYMBOL)
+        assert db.count_price_data(SYMBOL) == 300
+        assert store.materialize(SYMBOL) == 300
+        assert_matches_recompute(store.load(SYMBOL, refresh=False), db)
+
+    def test_load_selected_indicators_and_range(self, db):
+        """Test reading a subset of columns for a date range"""
+        db.upsert_price_data(make_candles(300), SYMBOL)
+        store = IndicatorStore(db)
+
+        df = store.load(SYMBOL, start_date='2025-09-01 12:00:00', indicators=['rsi', 'ma_50'])
+        assert {'rsi', 'ma_50'} <= set(df.columns)
+        assert 'macd' not in df.columns
+        assert df['timestamp'].min() >= pd.Timestamp('2025-09-01 12:00:00')
+        assert df['rsi'].notna().all()
+
+    def test_load_without_candles(self, db):
+        """Test that a symbol without candles returns an empty frame"""
+        assert IndicatorStore(db).load("NSE:NONE-EQ").empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+Test suite for indicator_sweeps module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import calculate_bollinger_bands, calculate_moving_average, calculate_rsi
+from modules.indicator_sweeps import bollinger_sweep, rsi_sweep, sma_sweep
+
+
+@pytest.fixture
+def prices():
+    """Random walk longer than one kernel chunk, with gaps and a flat stretch"""
+    np.random.seed(21)
+    values = 1500 + np.cumsum(np.random.randn(10000) * 2)
+    values[[100, 101, 5000]] = np.nan
+    values[7000:7060] = 1500.0
+    return pd.Series(values)
+
+
+def assert_columns_match(sweep, column, expected):
+    """Compare one sweep column with a single-parameter result"""
+    np.testing.assert_allclose(sweep[column].to_numpy(dtype=float), expected.to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-7, err_msg=str(column))
+
+
+class TestSweeps:
+    """Test parity with the single-parameter functions"""
+
+    def test_sma_sweep(self, prices):
+        """Test every period against calculate_moving_average"""
+        periods = [1, 2, 10, 50, 200]
+        sweep = sma_sweep(prices, periods)
+        assert list(sweep.columns) == periods
+        for period in periods:
+            assert_columns_match(sweep, period, calculate_moving_average(prices, period))
+
+    def test_rsi_sweep(self, prices):
+        """Test every period against calculate_rsi, flat stretch included"""
+        periods = range(5, 31, 5)
+        sweep = rsi_sweep(prices, periods)
+        for period in periods:
+            assert_columns_match(sweep, period, calculate_rsi(prices, period))
+        assert (sweep[5].iloc[7010:7060] != 100).all()
+
+    def test_bollinger_sweep(self, prices):
+        """Test every (period, width) pair against calculate_bollinger_bands"""
+        upper, middle, lower = bollinger_sweep(prices, [20, 50], [1.5, 2, 3])
+        assert upper.shape == (len(prices), 6)
+        for period in [20, 50]:
+            for num_std in [1.5, 2, 3]:
+                expected_upper, expected_middle, expected_lower = calculate_bollinger_bands(prices, period, num_std)
+                assert_columns_match(upper, (period, num_std), expected_upper)
+                assert_columns_match(lower, (period, num_std), expected_lower)
+            assert_columns_match(middle, period, expected_middle)
+
+    def test_array_input(self, prices):
+        """Test that arrays give arrays with one column per period"""
+        sweep = sma_sweep(prices.to_numpy(), [5, 20])
+        assert isinstance(sweep, np.ndarray)
+        assert sweep.shape == (len(prices), 2)
+
+    def test_period_longer_than_series(self):
+        """Test that a period longer than the data gives an all-NaN column"""
+        sweep = rsi_sweep(pd.Series([1.0, 2.0, 3.0]), [2, 10])
+        assert sweep[10].isna().all()
+        assert sweep[2].notna().sum() == 2
+
+    def test_rejects_panels(self, prices):
+        """Test that sweeps take one series"""
+        with pytest.raises(ValueError):
+            sma_sweep(np.column_stack([prices, prices]), [5])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -19,7 +19,15 @@ from modules.indicators import (
     calculate_bollinger_bands,
     calculate_stochastic,
     calculate_atr,
-    add_all_indicators
+    add_all_indicators,
+    add_indicators_incremental,
+    compute_indicators,
+    compute_panel_indicators,
+    indicator_dependencies,
+    indicator_state,
+    make_panel,
+    resolve_indicator,
+    update_indicators
 )
 
 
@@ -249,6 +257,339 @@ class TestAllIndicators:
         assert 'close' in df.columns
 
 
+class TestIncrementalIndicators:
+    """Test computing indicators for appended rows only"""
+
+    @pytest.fixture
+    def long_price_data(self):
+        """Create enough bars for ma_200 to warm up"""
+        np.random.seed(11)
+        n = 600
+        closes = 1300 + np.cumsum(np.random.randn(n) * 4)
+        return pd.DataFrame({
+            'timestamp': pd.date_range(start='2025-09-01', periods=n, freq='5min'),
+            'open': closes + np.random.randn(n),
+            'high': closes + np.abs(np.random.randn(n) * 3),
+            'low': closes - np.abs(np.random.randn(n) * 3),
+            'close': closes,
+            'volume': np.random.randint(50000, 150000, n)
+        })
+
+    @staticmethod
+    def assert_frames_match(result, expected):
+        assert list(result.columns) == list(expected.columns)
+        for column in expected.columns[6:]:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-8, err_msg=column)
+
+    @pytest.mark.parametrize("split", [0, 1, 30, 199, 250, 599])
+    def test_matches_full_recompute(self, long_price_data, split):
+        """Test that appending to a computed frame equals recomputing everything"""
+        expected = add_all_indicators(long_price_data)
+        computed = add_all_indicators(long_price_data.iloc[:split])
+        result = update_indicators(computed, long_price_data.iloc[split:])
+
+        assert len(result) == len(long_price_data)
+        self.assert_frames_match(result, expected)
+
+    def test_chained_updates_from_persisted_state(self, long_price_data):
+        """Test bar-by-bar style updates through a JSON round trip of the state"""
+        import json
+        expected = add_all_indicators(long_price_data)
+        long_price_data.loc[[298, 299], 'close'] = np.nan
+        expected_with_gaps = add_all_indicators(long_price_data)
+
+        state = indicator_state(add_all_indicators(long_price_data.iloc[:250]))
+        parts = []
+        for start in range(250, 600, 7):
+            part, state = add_indicators_incremental(long_price_data.iloc[start:start + 7], state)
+            state = json.loads(json.dumps(state))
+            parts.append(part)
+
+        assert state['bars'] == 600
+        assert len(state['close']) == 199
+        self.assert_frames_match(pd.concat(parts), expected_with_gaps.iloc[250:])
+        assert not np.allclose(expected['ema_12'].iloc[300:], expected_with_gaps['ema_12'].iloc[300:])
+
+
+class TestNumpyBackend:
+    """Test parity of backend='numpy' with the pandas path"""
+
+    @pytest.fixture
+    def gappy_price_data(self, sample_price_data):
+        """Sample data with missing closes and a flat stretch"""
+        df = pd.concat([sample_price_data] * 3, ignore_index=True)
+        df.loc[[10, 11, 150], 'close'] = np.nan
+        df.loc[200:230, ['high', 'low', 'close']] = 1300.0
+        return df
+
+    def test_add_all_indicators_parity(self, gappy_price_data):
+        """Test every indicator column against the pandas backend"""
+        expected = add_all_indicators(gappy_price_data)
+        result = add_all_indicators(gappy_price_data, backend='numpy')
+
+        assert list(result.columns) == list(expected.columns)
+        for column in expected.columns[6:]:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-7, err_msg=column)
+
+    def test_series_in_series_out(self, sample_price_data):
+        """Test that Series inputs keep their index"""
+        prices = sample_price_data['close'].copy()
+        prices.index = prices.index + 1000
+        result = calculate_rsi(prices, backend='numpy')
+        assert isinstance(result, pd.Series)
+        assert result.index.equals(prices.index)
+
+    def test_array_input(self, sample_price_data):
+        """Test that arrays are accepted and returned as arrays"""
+        close = sample_price_data['close'].to_numpy()
+        ma = calculate_moving_average(close, 20, backend='numpy')
+        ema = calculate_ema(close, 12, backend='numpy')
+        assert isinstance(ma, np.ndarray) and isinstance(ema, np.ndarray)
+        np.testing.assert_allclose(ema, calculate_ema(sample_price_data['close'], 12).to_numpy())
+
+    def test_unknown_backend(self, sample_price_data):
+        """Test that an unknown backend is rejected"""
+        with pytest.raises(ValueError):
+            add_all_indicators(sample_price_data, backend='cuda')
+
+
+class TestIndicatorRegistry:
+    """Test on-demand computation of named indicators"""
+
+    def test_only_requested_columns_are_added(self, sample_price_data):
+        """Test that unrequested outputs and intermediates are not added"""
+        result = compute_indicators(sample_price_data, ['rsi', 'ma_20', 'ma_50'])
+        added = set(result.columns) - set(sample_price_data.columns)
+        assert added == {'rsi', 'ma_20', 'ma_50'}
+
+    def test_matches_add_all_indicators(self, sample_price_data):
+        """Test that registry outputs equal the add_all_indicators columns"""
+        expected = add_all_indicators(sample_price_data)
+        for column in ['rsi', 'ma_20', 'macd_histogram', 'bb_lower', 'stoch_d', 'atr']:
+            result = compute_indicators(sample_price_data, [column])
+            pd.testing.assert_series_equal(result[column], expected[column])
+
+    def test_parametric_names(self, sample_price_data):
+        """Test that parameters are read from the name"""
+        close = sample_price_data['close']
+        result = compute_indicators(sample_price_data, ['rsi_21', 'ma_30', 'ema_9'])
+        pd.testing.assert_series_equal(result['rsi_21'], calculate_rsi(close, 21), check_names=False)
+        pd.testing.assert_series_equal(result['ma_30'], calculate_moving_average(close, 30), check_names=False)
+        pd.testing.assert_series_equal(result['ema_9'], calculate_ema(close, 9), check_names=False)
+
+    def test_shared_intermediates_resolved_once(self):
+        """Test that dependencies appear once, before their consumers"""
+        order = indicator_dependencies(['macd_histogram', 'rsi', 'rsi_21', 'bb_upper', 'bb_middle'])
+        assert len(order) == len(set(order))
+        assert order.count('delta') == 1 and order.count('ema_12') == 1
+        assert order.index('ema_12') < order.index('macd') < order.index('macd_signal')
+        assert order.index('ma_20') < order.index('bb_upper')
+        assert 'ma_200' not in order and 'true_range' not in order
+
+    def test_numpy_backend(self, sample_price_data):
+        """Test the registry with backend='numpy'"""
+        expected = add_all_indicators(sample_price_data)
+        result = compute_indicators(sample_price_data, ['rsi', 'bb_upper', 'atr'], backend='numpy')
+        for column in ['rsi', 'bb_upper', 'atr']:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float),
+                                       expected[column].to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-7, err_msg=column)
+
+    def test_reuse_precomputed_columns(self, sample_price_data):
+        """Test that existing indicator columns are kept and feed their dependents"""
+        df = sample_price_data.copy()
+        df['macd'] = 1.0
+        df['rsi'] = 50.0
+        assert indicator_dependencies(['macd_signal', 'rsi'], available=['macd', 'rsi']) == ['macd_signal']
+
+        result = compute_indicators(df, ['rsi', 'macd_signal'], reuse=True)
+        assert (result['rsi'] == 50.0).all()
+        assert result['macd_signal'].iloc[-1] == pytest.approx(1.0)
+        recomputed = compute_indicators(df, ['rsi'])
+        assert (recomputed['rsi'] != 50.0).any()
+
+    def test_copy_false_adds_in_place(self, sample_price_data):
+        """Test that copy=False returns the same frame with the columns added"""
+        df = sample_price_data.copy()
+        result = compute_indicators(df, ['ma_20'], copy=False)
+        assert result is df
+        assert 'ma_20' in df.columns
+        assert 'ma_20' not in compute_indicators(sample_price_data, ['ma_5']).columns
+
+    def test_unknown_indicator(self, sample_price_data):
+        """Test that an unknown name is rejected"""
+        with pytest.raises(KeyError):
+            resolve_indicator('vwap_x')
+        with pytest.raises(KeyError):
+            compute_indicators(sample_price_data, ['supertrend'])
+
+
+class TestPanelIndicators:
+    """Test indicators over many symbols at once"""
+
+    @pytest.fixture
+    def ragged_frames(self):
+        """Five symbols with different listing and delisting dates, one with a gap"""
+        np.random.seed(11)
+        timestamps = pd.date_range(start='2025-09-01', periods=320, freq='5min')
+        frames = {}
+        for j in range(5):
+            start, n = j * 15, 320 - j * 35
+            closes = 1000 + np.cumsum(np.random.randn(n) * 3)
+            frames[f"NSE:S{j}-EQ"] = pd.DataFrame({
+                'timestamp': timestamps[start:start + n],
+                'open': closes,
+                'high': closes + np.abs(np.random.randn(n)),
+                'low': closes - np.abs(np.random.randn(n)),
+                'close': closes,
+                'volume': np.random.randint(1000, 5000, n)
+            })
+        frames["NSE:S2-EQ"] = frames["NSE:S2-EQ"].drop(range(60, 72)).reset_index(drop=True)
+        return frames
+
+    @pytest.mark.parametrize("backend", ["pandas", "numpy"])
+    def test_each_column_matches_single_symbol(self, ragged_frames, backend):
+        """Test that every symbol equals its own computation, NaN outside its history"""
+        columns = ['rsi', 'ma_50', 'macd_signal', 'bb_upper', 'stoch_d', 'atr']
+        panel = compute_panel_indicators(make_panel(ragged_frames), columns, backend=backend)
+
+        for symbol, df in ragged_frames.items():
+            single = compute_indicators(df, columns, backend=backend).set_index('timestamp')
+            for column in columns:
+                wide = panel[column][symbol]
+                np.testing.assert_allclose(wide.reindex(single.index).to_numpy(dtype=float),
+                                           single[column].to_numpy(dtype=float),
+                                           rtol=1e-9, atol=1e-8, err_msg=f"{symbol} {column}")
+                assert wide.drop(single.index).isna().all()
+
+    def test_interior_gap_does_not_leak(self, ragged_frames):
+        """Test that bars after a gap are not NaN-poisoned by the missing rows"""
+        panel = compute_panel_indicators(make_panel(ragged_frames), ['ma_20', 'rsi'])
+        gap = ragged_frames["NSE:S2-EQ"]['timestamp'].iloc[60]
+        after = panel['ma_20']["NSE:S2-EQ"].loc[gap:].iloc[:20]
+
+        assert after.notna().all()
+        assert panel['rsi']["NSE:S2-EQ"].loc[gap:].iloc[:14].notna().all()
+
+    def test_array_panel(self, ragged_frames):
+        """Test that 2-D arrays give the same values as wide DataFrames"""
+        frames = make_panel(ragged_frames)
+        arrays = {field: frame.to_numpy() for field, frame in frames.items()}
+        from_frames = compute_panel_indicators(frames, ['rsi', 'atr'])
+        from_arrays = compute_panel_indicators(arrays, ['rsi', 'atr'])
+        assert isinstance(from_arrays['rsi'], np.ndarray)
+        np.testing.assert_array_equal(from_arrays['atr'], from_frames['atr'].to_numpy())
+
+    def test_calculate_functions_accept_panels(self, ragged_frames):
+        """Test the calculate_* functions on wide DataFrames and 2-D arrays"""
+        panel = make_panel(ragged_frames)
+        atr = calculate_atr(panel['high'], panel['low'], panel['close'])
+        assert isinstance(atr, pd.DataFrame)
+        assert atr.shape == panel['close'].shape
+
+        close = panel['close'].to_numpy()
+        for backend in ['pandas', 'numpy']:
+            rsi = calculate_rsi(close, backend=backend)
+            assert isinstance(rsi, np.ndarray) and rsi.shape == close.shape
+            np.testing.assert_allclose(rsi, calculate_rsi(panel['close']).to_numpy(),
+                                       rtol=1e-9, atol=1e-8)
+
+
+class TestFloat32Precision:
+    """Test the compact float32 output mode and its error bounds"""
+
+    # Relative rounding error of float32 (half an ulp)
+    EPS32 = 2.0 ** -24
+
+    @pytest.fixture
+    def long_price_data(self, sample_price_data):
+        """3000 bars with gaps, so every indicator has plenty of values"""
+        np.random.seed(8)
+        n = 3000
+        closes = 1300 + np.cumsum(np.random.randn(n) * 4)
+        df = pd.DataFrame({
+            'timestamp': pd.date_range(start='2025-09-01', periods=n, freq='5min'),
+            'open': closes + np.random.randn(n),
+            'high': closes + np.abs(np.random.randn(n) * 3),
+            'low': closes - np.abs(np.random.randn(n) * 3),
+            'close': closes,
+            'volume': np.random.randint(50000, 150000, n)
+        })
+        df.loc[[500, 501, 2000], 'close'] = np.nan
+        return df
+
+    def test_columns_are_float32_and_smaller(self, long_price_data):
+        """Test dtypes and the memory saving"""
+        full = add_all_indicators(long_price_data)
+        compact = add_all_indicators(long_price_data, precision='float32')
+        smallest = add_all_indicators(long_price_data, precision='float32', compact_prices=True)
+
+        assert all(compact[column].dtype == np.float32 for column in full.columns[6:])
+        assert compact['close'].dtype == np.float64
+        assert all(smallest[column].dtype == np.float32 for column in ['open', 'high', 'low', 'close'])
+        assert smallest['volume'].dtype == long_price_data['volume'].dtype
+
+        indicator_bytes = full[full.columns[6:]].memory_usage(index=False).sum()
+        compact_bytes = compact[compact.columns[6:]].memory_usage(index=False).sum()
+        assert compact_bytes * 2 == indicator_bytes
+        assert smallest.memory_usage().sum() < compact.memory_usage().sum() < full.memory_usage().sum()
+
+    @pytest.mark.parametrize("backend", ["pandas", "numpy"])
+    def test_rounding_bound(self, long_price_data, backend):
+        """Test that every value is within 2**-24 relative of float64"""
+        full = add_all_indicators(long_price_data, backend=backend)
+        compact = add_all_indicators(long_price_data, backend=backend, precision='float32',
+                                     compact_prices=True)
+
+        for column in full.columns[1:]:
+            exact = full[column].to_numpy(dtype=float)
+            rounded = compact[column].to_numpy(dtype=float)
+            assert np.array_equal(np.isnan(exact), np.isnan(rounded)), column
+            finite = ~np.isnan(exact)
+            assert (np.abs(rounded[finite] - exact[finite]) <= self.EPS32 * np.abs(exact[finite])).all(), column
+
+    def test_recompute_from_float32_prices(self, long_price_data):
+        """Test per-indicator bounds when prices themselves were stored as float32"""
+        exact = add_all_indicators(long_price_data)
+        stored = add_all_indicators(long_price_data, precision='float32', compact_prices=True)
+        recomputed = add_all_indicators(stored[['timestamp', 'open', 'high', 'low', 'close', 'volume']])
+
+        # u bounds the rounding of any stored price
+        u = self.EPS32 * np.nanmax(np.abs(long_price_data[['high', 'low', 'close']].to_numpy()))
+        # RSI = 100 * G / (G + L): each averaged move is off by at most 2u
+        # (missing moves count as 0, as in calculate_rsi)
+        moves = long_price_data['close'].diff().abs().fillna(0).rolling(14).mean()
+        # %K = 100 * (close - low14) / (high14 - low14)
+        price_range = (long_price_data['high'].rolling(14).max() - long_price_data['low'].rolling(14).min())
+        bounds = {
+            'rsi': 200 * u / moves, 'ma_20': u, 'ma_50': u, 'ma_200': u, 'ema_12': u, 'ema_26': u,
+            'macd': 2 * u, 'macd_signal': 2 * u, 'macd_histogram': 4 * u,
+            'bb_upper': 3.1 * u, 'bb_middle': u, 'bb_lower': 3.1 * u,
+            'stoch_k': 400 * u / price_range, 'stoch_d': 400 * u / price_range.rolling(3).min(),
+            'atr': 2 * u
+        }
+        for column, bound in bounds.items():
+            error = (recomputed[column] - exact[column]).abs()
+            allowed = (bound * 1.01 + 1e-9) if np.isscalar(bound) else (bound * 1.01 + 1e-9).to_numpy()
+            finite = exact[column].notna().to_numpy()
+            assert (error.to_numpy()[finite] <= np.broadcast_to(allowed, error.shape)[finite]).all(), column
+
+    def test_panel_precision(self, long_price_data):
+        """Test float32 panels"""
+        panel = make_panel({'NSE:A-EQ': long_price_data, 'NSE:B-EQ': long_price_data.iloc[100:]})
+        result = compute_panel_indicators(panel, ['rsi', 'atr'], precision='float32')
+        assert result['rsi'].dtypes.eq(np.float32).all()
+
+    def test_unknown_precision(self, sample_price_data):
+        """Test that an unknown precision is rejected"""
+        with pytest.raises(ValueError):
+            add_all_indicators(sample_price_data, precision='float16')
+
+
 class TestEdgeCases:
     """Test edge cases and error handling"""
 
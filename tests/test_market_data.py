@@ -0,0 +1,187 @@
+"""
+Test suite for market_data module
+"""
+
+import sys
+import os
+import json
+import pytest
+import pandas as pd
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.market_data import (
+    CandleAggregator,
+    LiveCandleFeed,
+    TickReplaySource,
+    candles_to_dataframe,
+    parse_tick
+)
+from modules.database import Database
+
+
+# 2025-10-01 03:45:00 UTC (09:15 IST)
+SESSION_START = int(pd.Timestamp('2025-10-01 03:45:00').timestamp())
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary database"""
+    db = Database(db_path=str(tmp_path / "market_data.db"))
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def tick_messages():
+    """Ten minutes of ticks for two symbols, one tick every 30 seconds"""
+    messages = []
+    for i in range(20):
+        for j, symbol in enumerate(["NSE:RELIANCE-EQ", "NSE:TCS-EQ"]):
+            messages.append({
+                'symbol': symbol,
+                'ltp': 1300.0 + j * 2000 + (i % 7) - 3,
+                'vol_traded_today': 1000 + i * 10,
+                'last_traded_time': SESSION_START + i * 30
+            })
+    return messages
+
+
+class TestCandleAggregator:
+    """Test tick-to-candle aggregation"""
+
+    def test_single_candle_ohlcv(self):
+        """Test that ticks inside one interval build one candle"""
+        agg = CandleAggregator(resolutions=('1',))
+        for offset, price in [(0, 100.0), (10, 103.0), (20, 98.0), (50, 101.0)]:
+            agg.add_tick("NSE:TCS-EQ", SESSION_START + offset, price, 5)
+
+        candle = agg.current_candle("NSE:TCS-EQ", '1')
+        assert (candle.open, candle.high, candle.low, candle.close) == (100.0, 103.0, 98.0, 101.0)
+        assert candle.volume == 20
+        assert agg.pending('1') == 0
+
+    def test_candle_closes_on_next_interval(self):
+        """Test that a tick in a new interval closes the previous candle"""
+        agg = CandleAggregator(resolutions=('1', '5'))
+        agg.add_tick("NSE:TCS-EQ", SESSION_START, 100.0, 1)
+        agg.add_tick("NSE:TCS-EQ", SESSION_START + 61, 101.0, 1)
+
+        assert agg.pending('1') == 1
+        assert agg.pending('5') == 0
+
+        symbol, candle = agg.drain('1')[0]
+        assert symbol == "NSE:TCS-EQ"
+        assert candle.start == SESSION_START
+        assert agg.pending('1') == 0
+
+    def test_late_tick_is_dropped(self):
+        """Test that ticks for an already closed candle are counted and ignored"""
+        agg = CandleAggregator(resolutions=('1',))
+        agg.add_tick("NSE:TCS-EQ", SESSION_START + 70, 100.0)
+        agg.add_tick("NSE:TCS-EQ", SESSION_START + 10, 200.0)
+
+        assert agg.late_ticks == 1
+        assert agg.current_candle("NSE:TCS-EQ", '1').high == 100.0
+
+    def test_close_expired(self):
+        """Test closing quiet symbols by wall clock"""
+        agg = CandleAggregator(resolutions=('1', '5'))
+        agg.add_tick("NSE:TCS-EQ", SESSION_START, 100.0)
+
+        assert agg.close_expired(SESSION_START + 60) == 1
+        assert agg.pending('1') == 1
+        assert agg.close_all() == 1
+        assert agg.pending('5') == 1
+
+    def test_late_tick_after_close_expired(self):
+        """Test that a tick for a candle closed by the wall clock does not reopen it"""
+        agg = CandleAggregator(resolutions=('1',))
+        for offset, price in [(0, 100.0), (10, 110.0), (20, 90.0)]:
+            agg.add_tick("NSE:TCS-EQ", SESSION_START + offset, price, 5)
+        assert agg.close_expired(SESSION_START + 60) == 1
+
+        agg.add_tick("NSE:TCS-EQ", SESSION_START + 30, 95.0, 1)
+        assert agg.late_ticks == 1
+        assert agg.current_candle("NSE:TCS-EQ", '1') is None
+        assert agg.close_all() == 0
+
+        candle = agg.drain('1')[0][1]
+        assert (candle.open, candle.high, candle.low, candle.close, candle.volume) == (100.0, 110.0, 90.0, 90.0, 15)
+
+        agg.add_tick("NSE:TCS-EQ", SESSION_START + 60, 96.0, 1)
+        assert agg.current_candle("NSE:TCS-EQ", '1').start == SESSION_START + 60
+
+    def test_matches_pandas_resample(self, tick_messages):
+        """Test that 5m candles match a pandas resample of the same ticks"""
+        agg = CandleAggregator(resolutions=('5',))
+        for m in tick_messages:
+            agg.add_tick(m['symbol'], m['last_traded_time'], m['ltp'], 1)
+        agg.close_all()
+
+        bars = candles_to_dataframe(agg.drain('5'))
+        ticks = pd.DataFrame(tick_messages)
+        ticks['timestamp'] = pd.to_datetime(ticks['last_traded_time'], unit='s')
+
+        for symbol, group in ticks.groupby('symbol'):
+            expected = group.set_index('timestamp')['ltp'].resample('5min').ohlc()
+            actual = bars[bars['symbol'] == symbol].set_index('timestamp')
+            assert list(actual.index) == list(expected.index)
+            for col in ['open', 'high', 'low', 'close']:
+                assert list(actual[col]) == list(expected[col])
+
+
+class TestParseTick:
+    """Test WebSocket message parsing"""
+
+    def test_volume_is_delta_of_cumulative(self):
+        """Test that tick volume is derived from cumulative day volume"""
+        last = {}
+        first = parse_tick({'symbol': 'NSE:TCS-EQ', 'ltp': 1.0, 'vol_traded_today': 100,
+                            'last_traded_time': SESSION_START}, last)
+        second = parse_tick({'symbol': 'NSE:TCS-EQ', 'ltp': 1.0, 'vol_traded_today': 130,
+                             'last_traded_time': SESSION_START + 1}, last)
+
+        assert first[3] == 0
+        assert second[3] == 30
+
+    def test_non_tick_message(self):
+        """Test that control messages are ignored"""
+        assert parse_tick({'type': 'cn', 's': 'ok'}, {}) is None
+
+
+class TestLiveCandleFeed:
+    """Test replaying ticks into the database"""
+
+    def test_replay_flushes_bars_to_database(self, db, tick_messages, tmp_path):
+        """Test that replayed ticks are persisted as 5m candles"""
+        path = tmp_path / "ticks.jsonl"
+        with open(path, 'w') as f:
+            for m in tick_messages:
+                f.write(json.dumps(m) + "\n")
+
+        feed = LiveCandleFeed(CandleAggregator(resolutions=('1', '5')), db=db,
+                              persist_resolution='5', batch_size=1)
+        delivered = TickReplaySource.from_file(path).run(feed.on_message)
+
+        assert delivered == len(tick_messages)
+        # First 5m bar per symbol closed during replay
+        assert feed.bars_written == 2
+
+        feed.flush(close_open=True)
+        assert feed.bars_written == 4
+
+        df = db.get_price_data("NSE:RELIANCE-EQ")
+        assert len(df) == 2
+        assert df['timestamp'].iloc[0] == pd.Timestamp('2025-10-01 03:45:00')
+        assert df['volume'].sum() == 190
+
+    def test_invalid_persist_resolution(self):
+        """Test that persisting a resolution that is not built is rejected"""
+        with pytest.raises(ValueError):
+            LiveCandleFeed(CandleAggregator(resolutions=('1',)), persist_resolution='5')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
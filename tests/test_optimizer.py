@@ -0,0 +1,154 @@
+"""
+Test suite for optimizer module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.backtest import backtest, summarize_metrics
+from modules.optimizer import PARAMETERS, ScalpingOptimizer, sample_grid, scalping_grid
+from modules.strategy import ScalpingStrategy
+
+
+@pytest.fixture
+def close():
+    """Four symbols of oscillating 5-minute closes, one listed late and one with a gap"""
+    np.random.seed(11)
+    n, k = 2000, 4
+    index = pd.date_range('2025-01-01 03:45:00', periods=n, freq='5min')
+    values = 1000 + np.cumsum(np.random.randn(n, k) * 3 * np.sin(np.arange(n) / 30)[:, None], axis=0)
+    values[:300, 3] = np.nan
+    values[900:930, 1] = np.nan
+    return pd.DataFrame(values, index=index, columns=[f"SYM{i}" for i in range(k)])
+
+
+@pytest.fixture
+def grid():
+    return scalping_grid(rsi_period=[9, 14], rsi_oversold=[25, 35], rsi_overbought=[65, 75],
+                         ma_short=[10, 20], ma_long=[20, 50])
+
+
+class TestGrid:
+    """Test building parameter grids"""
+
+    def test_invalid_combinations_dropped(self, grid):
+        """Test that only oversold < overbought and short < long MA remain"""
+        assert list(grid.columns) == PARAMETERS
+        assert len(grid) == 2 * 2 * 2 * 3
+        assert (grid['ma_short'] < grid['ma_long']).all()
+
+    def test_config_defaults(self):
+        """Test that an empty grid is the configured strategy"""
+        grid = scalping_grid()
+        assert len(grid) == 1
+        assert grid.iloc[0].to_dict() == ScalpingStrategy(verbose=False).params
+
+
+class TestScalpingOptimizer:
+    """Test the grid search against the strategy and backtest run directly"""
+
+    def test_matches_strategy_backtest(self, close, grid):
+        """Test that every grid point's metrics equal ScalpingStrategy + backtest"""
+        optimizer = ScalpingOptimizer(workers=1)
+        optimizer.run(close, grid)
+        assert len(optimizer.results) == len(grid) * 4
+
+        for _, row in optimizer.results.iloc[::7].iterrows():
+            params = {name: row[name] for name in PARAMETERS}
+            strategy = ScalpingStrategy(**{k: int(v) if k in ('rsi_period', 'ma_short', 'ma_long') else v
+                                           for k, v in params.items()}, verbose=False)
+            prices = close[row['symbol']].dropna()
+            df = pd.DataFrame({'timestamp': prices.index, 'close': prices.to_numpy()})
+            expected = backtest(df, strategy.generate_signals(df, copy=True))
+            for metric, value in expected.items():
+                assert row[metric] == pytest.approx(value, rel=1e-9, abs=1e-12), metric
+
+    def test_workers_agree(self, close, grid):
+        """Test that sharding the grid across processes gives the same table"""
+        single = ScalpingOptimizer(workers=1).run({'close': close}, grid)
+        parallel = ScalpingOptimizer(workers=3).run({'close': close}, grid)
+        pd.testing.assert_frame_equal(single, parallel)
+
+    def test_summary_and_best(self, close, grid):
+        """Test aggregation over symbols and ranking by the objective"""
+        optimizer = ScalpingOptimizer(workers=1, cost=0.0005)
+        summary = optimizer.run(close, grid, objective='total_return')
+        assert len(summary) == len(grid)
+        assert summary['total_return'].is_monotonic_decreasing
+        assert (summary['symbols'] == 4).all()
+
+        top = optimizer.results.merge(summary.iloc[[0]][PARAMETERS])
+        assert summary.loc[0, 'trades'] == top['trades'].sum()
+        assert summary.loc[0, 'max_drawdown'] == top['max_drawdown'].min()
+
+        best = optimizer.best()
+        assert ScalpingStrategy(**best, verbose=False).params == best
+
+    def test_unknown_objective(self, close, grid):
+        """Test that a misspelled objective is rejected"""
+        with pytest.raises(ValueError):
+            ScalpingOptimizer(workers=1).run(close, grid, objective='profit')
+
+
+
+class TestSuccessiveHalving:
+    """Test the adaptive search"""
+
+    @pytest.fixture
+    def wide_grid(self):
+        return scalping_grid(rsi_period=[7, 9, 14, 21], rsi_oversold=[20, 25, 30, 35],
+                             rsi_overbought=[65, 70, 75, 80], ma_short=[5, 10, 20], ma_long=[30, 50])
+
+    def test_sample_grid(self, wide_grid):
+        """Test that samples are reproducible subsets"""
+        sample = sample_grid(wide_grid, 40, seed=1)
+        assert len(sample) == 40
+        assert not sample.duplicated().any()
+        assert len(sample.merge(wide_grid)) == 40
+        pd.testing.assert_frame_equal(sample, sample_grid(wide_grid, 40, seed=1))
+        assert len(sample_grid(wide_grid, 10_000)) == len(wide_grid)
+
+    def test_rungs(self, close, wide_grid):
+        """Test that rungs grow the history and promote the top 1/eta"""
+        optimizer = ScalpingOptimizer(workers=1)
+        summary = optimizer.halving(close, wide_grid, eta=3, min_bars=200)
+        rungs = optimizer.rungs
+
+        assert rungs['bars'].tolist() == [222, 666, 2000]
+        assert rungs['candidates'].tolist() == [384, 128, 43]
+        assert len(summary) == 43
+        # Each rung costs about a third of a full-history run of the grid
+        assert optimizer.budget == pytest.approx(1 / 3, rel=0.01)
+
+    def test_final_rung_is_full_history(self, close, wide_grid):
+        """Test that survivors are the best of the previous rung, ranked on all bars"""
+        optimizer = ScalpingOptimizer(workers=1)
+        summary = optimizer.halving(close, wide_grid, eta=4, min_bars=500)
+        assert optimizer.rungs['bars'].tolist() == [500, 2000]
+
+        # The first rung trades the last 500 bars on indicators warmed up on the full history
+        window = ScalpingOptimizer(workers=1).evaluate(close, wide_grid, windows=[(1500, 2000)])
+        previous = summarize_metrics(window.drop(columns='window'), PARAMETERS, 'sharpe')
+        survivors = previous.head(len(summary))[PARAMETERS]
+        pd.testing.assert_frame_equal(summary, ScalpingOptimizer(workers=1).run(close, survivors))
+        assert optimizer.best() == ScalpingOptimizer(workers=1).run(close, survivors).iloc[0][PARAMETERS].to_dict()
+
+    def test_small_inputs(self, close, grid):
+        """Test that a short history or tiny grid is a single full run"""
+        optimizer = ScalpingOptimizer(workers=1)
+        summary = optimizer.halving(close, grid, min_bars=len(close))
+        assert optimizer.rungs['bars'].tolist() == [len(close)]
+        pd.testing.assert_frame_equal(summary, ScalpingOptimizer(workers=1).run(close, grid))
+
+        with pytest.raises(ValueError):
+            optimizer.halving(close, grid, eta=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
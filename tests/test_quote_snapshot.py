@@ -0,0 +1,134 @@
+"""
+Test suite for quote_snapshot module
+"""
+
+import sys
+import os
+import threading
+import pytest
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.quote_snapshot import QuoteSnapshotService, split_batches
+from modules.rate_limit import RateLimiter
+from modules.resilience import ResilientCaller
+
+
+class FakeFyers:
+    """Quotes endpoint that enforces a per-request symbol cap"""
+
+    def __init__(self, cap=50, fail_on=None, drop_first=0):
+        self.cap = cap
+        self.fail_on = fail_on
+        self.drop_first = drop_first
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def quotes(self, data):
+        symbols = data['symbols'].split(',')
+        with self._lock:
+            self.requests.append(symbols)
+            dropped = len(self.requests) <= self.drop_first
+        if dropped:
+            return {'s': 'error', 'code': -99, 'message': 'connection reset'}
+        if len(symbols) > self.cap:
+            return {'s': 'error', 'message': 'symbol limit exceeded'}
+        if self.fail_on in symbols:
+            return {'s': 'error', 'message': 'internal error'}
+        return {'s': 'ok', 'd': [
+            {'n': s, 's': 'ok', 'v': {'lp': float(i), 'bid': i - 0.5, 'ask': i + 0.5, 'volume': 10 * i}}
+            for i, s in ((int(s[9:-3]), s) for s in symbols)
+        ]}
+
+
+class FakeFetcher:
+    def __init__(self, fyers):
+        self.fyers = fyers
+        self.caller = ResilientCaller(sleep=lambda seconds: None)
+
+
+@pytest.fixture
+def universe():
+    """A 520-symbol universe"""
+    return [f"NSE:STOCK{i}-EQ" for i in range(520)]
+
+
+@pytest.fixture
+def unlimited():
+    """Rate limiter that never blocks in tests"""
+    return RateLimiter(limits=[(10000, 1.0)])
+
+
+class TestBatching:
+    """Test universe batching"""
+
+    def test_split_batches(self):
+        """Test that batches are maximal and preserve order"""
+        batches = split_batches(list(range(120)), 50)
+        assert [len(b) for b in batches] == [50, 50, 20]
+        assert sum(batches, []) == list(range(120))
+
+
+class TestQuoteSnapshotService:
+    """Test parallel snapshot fetching"""
+
+    def test_snapshot_respects_symbol_cap(self, universe, unlimited):
+        """Test that every request stays within the cap and all symbols are filled"""
+        fyers = FakeFyers(cap=50)
+        service = QuoteSnapshotService(FakeFetcher(fyers), universe, batch_size=50,
+                                       rate_limiter=unlimited)
+        snap = service.snapshot()
+        service.close()
+
+        assert len(fyers.requests) == 11
+        assert max(len(r) for r in fyers.requests) == 50
+        assert snap.failed_batches == 0
+        np.testing.assert_array_equal(snap.ltp, np.arange(520, dtype=float))
+        np.testing.assert_array_equal(snap.volume, 10 * np.arange(520, dtype=float))
+
+    def test_failed_batch_leaves_nan(self, universe, unlimited):
+        """Test that a failed batch only blanks its own symbols"""
+        fyers = FakeFyers(fail_on="NSE:STOCK60-EQ")
+        service = QuoteSnapshotService(FakeFetcher(fyers), universe, batch_size=50,
+                                       rate_limiter=unlimited)
+        snap = service.snapshot()
+        service.close()
+
+        assert snap.failed_batches == 1
+        assert np.isnan(snap.ltp[50:100]).all()
+        assert not np.isnan(snap.ltp[:50]).any()
+        assert not np.isnan(snap.ltp[100:]).any()
+
+    def test_transient_errors_are_retried(self, universe, unlimited):
+        """Test that batches go through the fetcher's retrying caller"""
+        fetcher = FakeFetcher(FakeFyers(drop_first=2))
+        service = QuoteSnapshotService(fetcher, universe, batch_size=50, max_workers=1, rate_limiter=unlimited)
+        snap = service.snapshot()
+        service.close()
+
+        assert snap.failed_batches == 0
+        assert fetcher.caller.retries == 2
+        assert not np.isnan(snap.ltp).any()
+
+    def test_snapshot_dataframe(self, universe, unlimited):
+        """Test the symbol-indexed DataFrame view"""
+        service = QuoteSnapshotService(FakeFetcher(FakeFyers()), universe, rate_limiter=unlimited)
+        df = service.snapshot().to_dataframe()
+        service.close()
+
+        assert df.index.name == 'symbol'
+        assert df.loc["NSE:STOCK7-EQ", 'bid'] == 6.5
+        assert df.loc["NSE:STOCK7-EQ", 'ask'] == 7.5
+
+    def test_not_authenticated(self, universe):
+        """Test that snapshots require an authenticated fetcher"""
+        service = QuoteSnapshotService(FakeFetcher(None), universe)
+        with pytest.raises(RuntimeError):
+            service.snapshot()
+        service.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,46 @@
+"""
+Test suite for rate_limit module
+"""
+
+import sys
+import os
+import time
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rate_limit import RateLimiter
+
+
+class TestRateLimiter:
+    """Test sliding-window rate limiting"""
+
+    def test_calls_within_limit_do_not_block(self):
+        """Test that calls under the limit return immediately"""
+        limiter = RateLimiter(limits=[(5, 1.0)])
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.1
+
+    def test_calls_over_limit_wait(self):
+        """Test that the call over the limit waits for the window to slide"""
+        limiter = RateLimiter(limits=[(2, 0.2)])
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.19
+
+    def test_default_limits_from_config(self):
+        """Test that default limits come from config"""
+        import config
+        limiter = RateLimiter()
+        assert limiter.limits == [
+            (config.API_RATE_LIMIT_PER_SECOND, 1.0),
+            (config.API_RATE_LIMIT_PER_MINUTE, 60.0)
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
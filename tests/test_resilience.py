@@ -0,0 +1,195 @@
+"""
+Test suite for resilience module
+"""
+
+import sys
+import os
+import socket
+import pytest
+import requests
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.resilience import (
+    AUTH,
+    PERMANENT,
+    RATE_LIMITED,
+    TRANSIENT,
+    CircuitBreaker,
+    CircuitOpenError,
+    FailureLedger,
+    FyersAPIError,
+    ResilientCaller,
+    RetryPolicy,
+    classify_error
+)
+from modules.data_fetcher import FyersDataFetcher
+from modules.database import Database
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Flaky:
+    """Fails with the given errors, then returns 'ok'"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+@pytest.fixture
+def caller():
+    """Caller that never sleeps"""
+    return ResilientCaller(retry_policy=RetryPolicy(max_attempts=4), sleep=lambda s: None)
+
+
+class TestClassification:
+    """Test error classification"""
+
+    @pytest.mark.parametrize("error, category", [
+        (FyersAPIError("server error", 503), TRANSIENT),
+        (FyersAPIError("no response", -99), TRANSIENT),
+        (FyersAPIError("request limit reached", 429), RATE_LIMITED),
+        (FyersAPIError("token expired", -16), AUTH),
+        (FyersAPIError("invalid symbol", -300), PERMANENT),
+        (ConnectionResetError(), TRANSIENT),
+        (TimeoutError(), TRANSIENT),
+        (socket.gaierror(), TRANSIENT),
+        (requests.exceptions.ConnectionError(), TRANSIENT),
+        (requests.exceptions.ReadTimeout(), TRANSIENT),
+        (KeyError('candles'), PERMANENT),
+        (FileNotFoundError(), PERMANENT),
+        (PermissionError(), PERMANENT),
+    ])
+    def test_classify_error(self, error, category):
+        """Test that errors map to the expected category"""
+        assert classify_error(error) == category
+
+    def test_backoff_is_bounded_and_grows(self):
+        """Test that jittered delays stay within the exponential envelope"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+        for attempt in range(1, 8):
+            for _ in range(20):
+                assert 0 <= policy.delay(attempt) <= min(4.0, 0.5 * 2 ** (attempt - 1))
+
+
+class TestResilientCaller:
+    """Test retries and failure recording"""
+
+    def test_recovers_from_transient_errors(self, caller):
+        """Test that transient failures are retried until success"""
+        func = Flaky(FyersAPIError("bad gateway", 502), FyersAPIError("limit", 429))
+        assert caller.call('history', func) == 'ok'
+        assert func.calls == 3
+        assert caller.retries == 2
+        assert caller.ledger.entries == []
+
+    def test_auth_error_not_retried(self, caller):
+        """Test that auth errors are raised immediately and recorded"""
+        func = Flaky(FyersAPIError("token expired", -16))
+        with pytest.raises(FyersAPIError):
+            caller.call('history', func, key="NSE:TCS-EQ")
+        assert func.calls == 1
+        assert caller.ledger.summary() == {AUTH: 1}
+        assert caller.ledger.entries[0]['key'] == "NSE:TCS-EQ"
+
+    def test_gives_up_after_max_attempts(self, caller):
+        """Test that retries are bounded"""
+        func = Flaky(*[FyersAPIError("down", 500)] * 10)
+        with pytest.raises(FyersAPIError):
+            caller.call('history', func)
+        assert func.calls == 4
+        assert caller.ledger.entries[0]['attempts'] == 4
+
+    def test_circuits_are_per_endpoint(self):
+        """Test that an open circuit only blocks its own endpoint"""
+        clock = FakeClock()
+        caller = ResilientCaller(retry_policy=RetryPolicy(max_attempts=1), failure_threshold=2,
+                                 reset_timeout=10, sleep=lambda s: None, clock=clock)
+        for _ in range(2):
+            with pytest.raises(FyersAPIError):
+                caller.call('history', Flaky(FyersAPIError("down", 500)))
+
+        with pytest.raises(CircuitOpenError):
+            caller.call('history', Flaky())
+        assert caller.call('quotes', Flaky()) == 'ok'
+
+        clock.now = 10
+        assert caller.call('history', Flaky()) == 'ok'
+        assert caller.breaker('history').state == CircuitBreaker.CLOSED
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions"""
+
+    def test_half_open_allows_single_trial(self):
+        """Test that only one trial call passes while half-open"""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        assert breaker.allow() is False
+
+        clock.now = 5
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.retry_in() == 5
+
+
+class TestFailureLedger:
+    """Test persistence of final failures"""
+
+    def test_ledger_writes_to_database(self, tmp_path):
+        """Test that ledger entries land in fetch_failures"""
+        db = Database(db_path=str(tmp_path / "ledger.db"))
+        ledger = FailureLedger(db)
+        ledger.record('history', "NSE:TCS-EQ", TRANSIENT, FyersAPIError("down", 503), 5)
+
+        failures = db.get_fetch_failures()
+        assert len(failures) == 1
+        assert failures['category'].iloc[0] == TRANSIENT
+        assert failures['code'].iloc[0] == 503
+        db.close()
+
+
+class TestFetcherIntegration:
+    """Test that the data fetcher retries through the caller"""
+
+    def test_fetch_history_survives_5xx(self):
+        """Test that a transient 5xx does not drop the symbol"""
+        responses = [
+            {'s': 'error', 'code': 503, 'message': 'Service Unavailable'},
+            {'s': 'error', 'code': -99, 'message': 'connection reset'},
+            {'s': 'ok', 'candles': [[1759290300, 100, 101, 99, 100.5, 1000]]}
+        ]
+
+        class FakeFyers:
+            def history(self, data):
+                return responses.pop(0)
+
+        fetcher = FyersDataFetcher(caller=ResilientCaller(sleep=lambda s: None))
+        fetcher.fyers = FakeFyers()
+        df = fetcher.fetch_history("NSE:TCS-EQ", datetime(2025, 10, 1), datetime(2025, 10, 1))
+
+        assert len(df) == 1
+        assert fetcher.caller.retries == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+Test suite for rules module
+"""
+
+import sys
+import os
+import pytest
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.rules import RuleError, compile_rule, load_rules
+
+
+@pytest.fixture
+def values():
+    return {
+        'rsi': np.array([20.0, 25.0, 50.0, 80.0, np.nan]),
+        'close': np.array([101.0, 99.0, 100.0, 102.0, 100.0]),
+        'ma_20': np.array([100.0, 100.0, 100.0, 100.0, 100.0]),
+        'bar': np.arange(5)
+    }
+
+
+class TestCompile:
+    """Test parsing and the names a rule reads"""
+
+    def test_names_and_indicators(self):
+        """Test that prices and 'bar' are not listed as indicators"""
+        rule = compile_rule("bar >= 50 and rsi < 30 and close > ma_20 or volume > vol_sma")
+        assert rule.names == ('bar', 'rsi', 'close', 'ma_20', 'volume', 'vol_sma')
+        assert rule.indicators == ('rsi', 'ma_20', 'vol_sma')
+
+    def test_constants_substituted(self, values):
+        """Test that constants are compiled in and not read from values"""
+        rule = compile_rule("rsi < oversold", {'oversold': 30})
+        assert rule.names == ('rsi',)
+        np.testing.assert_array_equal(rule(values), [True, True, False, False, False])
+
+    @pytest.mark.parametrize('text', [
+        "__import__('os').system('ls')",
+        "close.mean() > 1",
+        "rsi[0] < 30",
+        "(lambda: 1)()",
+        "rsi < 'thirty'",
+        "sum(rsi) > 1",
+        "min(rsi, initial=3)",
+        "_and(rsi, rsi)",
+        "rsi ** 2 > 1",
+        "[rsi]",
+        "rsi <",
+    ])
+    def test_rejected(self, text):
+        """Test that anything outside the language fails at compile time"""
+        with pytest.raises(RuleError):
+            compile_rule(text)
+
+    def test_missing_value(self):
+        """Test that evaluating without a column names it"""
+        with pytest.raises(RuleError, match='ma_20'):
+            compile_rule("close > ma_20")({'close': 1.0})
+
+
+class TestEvaluate:
+    """Test element-wise semantics"""
+
+    def test_boolean_logic(self, values):
+        """Test and / or / not and chained comparisons per element"""
+        np.testing.assert_array_equal(compile_rule("rsi < 30 and close > ma_20")(values),
+                                      [True, False, False, False, False])
+        np.testing.assert_array_equal(compile_rule("rsi > 70 or not close >= ma_20")(values),
+                                      [False, True, False, True, False])
+        np.testing.assert_array_equal(compile_rule("20 < rsi <= 50")(values), [False, True, True, False, False])
+        np.testing.assert_array_equal(compile_rule("bar >= 3")(values), [False, False, False, True, True])
+
+    def test_arithmetic_and_functions(self, values):
+        """Test conditional expressions and functions against plain NumPy"""
+        rule = compile_rule("0.5 + (min((close - ma_20) / ma_20 * 10, 0.1) if close > ma_20 else 0)")
+        expected = 0.5 + np.where(values['close'] > values['ma_20'],
+                                  np.minimum((values['close'] - values['ma_20']) / values['ma_20'] * 10, 0.1), 0)
+        np.testing.assert_array_equal(rule(values), expected)
+        np.testing.assert_array_equal(compile_rule("clip(abs(close - ma_20), 0, 1.5)")(values),
+                                      [1.0, 1.0, 0.0, 1.5, 0.0])
+        np.testing.assert_array_equal(compile_rule("isnan(rsi)")(values), [False] * 4 + [True])
+        assert compile_rule("-max(rsi, 10)")({'rsi': 5.0}) == -10
+
+    def test_scalars(self):
+        """Test that the same rule evaluates one bar's scalars"""
+        rule = compile_rule("rsi < 30 and close > ma_20")
+        assert rule({'rsi': 25.0, 'close': 101.0, 'ma_20': 100.0})
+        assert not rule({'rsi': np.nan, 'close': 101.0, 'ma_20': 100.0})
+        assert compile_rule("close / ma_20")({'close': np.float64(1.0), 'ma_20': np.float64(0.0)}) == np.inf
+
+
+class TestLoadRules:
+    """Test rule sets in JSON files"""
+
+    def test_round_trip(self, tmp_path):
+        """Test reading a rule set file"""
+        path = tmp_path / "rules.json"
+        path.write_text('{"name": "RSI only", "buy": "rsi < 25", "sell": "rsi > 75"}')
+        assert load_rules(str(path)) == {'name': 'RSI only', 'buy': 'rsi < 25', 'sell': 'rsi > 75'}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
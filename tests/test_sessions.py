@@ -0,0 +1,141 @@
+"""
+Test suite for sessions module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.sessions import (
+    add_session_indicators,
+    calculate_opening_range,
+    calculate_vwap,
+    session_cumulative_volume,
+    session_frame,
+    session_moving_average,
+    to_market_time
+)
+
+
+@pytest.fixture
+def bars():
+    """Three days of 5-minute bars in naive UTC, including pre-open and post-close bars"""
+    days = pd.date_range('2025-09-01', periods=3, freq='D')
+    timestamps = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta('03:30:00'), day + pd.Timedelta('10:10:00'), freq='5min')
+        for day in days
+    ]))
+    np.random.seed(17)
+    n = len(timestamps)
+    close = 1300 + np.cumsum(np.random.randn(n) * 2)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close + np.random.randn(n),
+        'high': close + np.abs(np.random.randn(n) * 2),
+        'low': close - np.abs(np.random.randn(n) * 2),
+        'close': close,
+        'volume': np.random.randint(1000, 5000, n)
+    })
+
+
+def session_groups(df):
+    """Rows of each session, selected explicitly in IST"""
+    local = to_market_time(df['timestamp'])
+    minutes = local.dt.hour * 60 + local.dt.minute
+    in_session = ((minutes >= 9 * 60 + 15) & (minutes < 15 * 60 + 30)).to_numpy()
+    dates = local.dt.date.to_numpy()
+    return [np.flatnonzero(in_session & (dates == date)) for date in sorted(set(dates[in_session]))]
+
+
+class TestSessionFrame:
+    """Test session tagging"""
+
+    def test_session_boundaries(self, bars):
+        """Test that 09:15-15:30 IST bars are in session and others are not"""
+        sessions = session_frame(bars['timestamp'])
+        first = bars.index[bars['timestamp'] == pd.Timestamp('2025-09-01 03:45:00')][0]
+        closing = bars.index[bars['timestamp'] == pd.Timestamp('2025-09-01 10:00:00')][0]
+
+        assert not sessions['in_session'].iloc[first - 1]
+        assert sessions['in_session'].iloc[first]
+        assert sessions['session_bar'].iloc[first] == 0
+        assert sessions['session_bar'].iloc[closing - 1] == 74
+        assert not sessions['in_session'].iloc[closing]
+        assert sessions['session_id'].max() == 2
+        assert (sessions['session_id'][~sessions['in_session']] == -1).all()
+
+    def test_tz_aware_input(self, bars):
+        """Test that tz-aware timestamps give the same tags"""
+        aware = bars['timestamp'].dt.tz_localize('UTC').dt.tz_convert('Asia/Kolkata')
+        pd.testing.assert_frame_equal(session_frame(aware), session_frame(bars['timestamp']))
+
+    def test_custom_hours(self, bars):
+        """Test a shorter session"""
+        sessions = session_frame(bars['timestamp'], open_time='10:00', close_time='11:00')
+        assert sessions.groupby('session_id').size().drop(-1).eq(12).all()
+
+
+class TestSessionIndicators:
+    """Test session-anchored indicators against explicit per-session loops"""
+
+    def test_vwap_and_bands(self, bars):
+        """Test VWAP and its bands"""
+        result = calculate_vwap(bars, num_stds=(1, 2.5))
+        typical = ((bars['high'] + bars['low'] + bars['close']) / 3).to_numpy()
+        volume = bars['volume'].to_numpy(dtype=float)
+
+        for rows in session_groups(bars):
+            for end in range(len(rows)):
+                window = rows[:end + 1]
+                weights = volume[window]
+                vwap = np.average(typical[window], weights=weights)
+                std = np.sqrt(np.average((typical[window] - vwap) ** 2, weights=weights))
+                row = rows[end]
+                assert result['vwap'].iloc[row] == pytest.approx(vwap, rel=1e-12)
+                assert result['vwap_upper_2_5'].iloc[row] == pytest.approx(vwap + 2.5 * std, rel=1e-12)
+                assert result['vwap_lower_1'].iloc[row] == pytest.approx(vwap - std, rel=1e-12)
+        assert result['vwap'][~session_frame(bars['timestamp'])['in_session']].isna().all()
+
+    def test_cumulative_volume_resets(self, bars):
+        """Test that session volume restarts at each open"""
+        sessions = session_frame(bars['timestamp'])
+        cumulative = session_cumulative_volume(bars['volume'], sessions)
+        for rows in session_groups(bars):
+            np.testing.assert_array_equal(cumulative.iloc[rows], np.cumsum(bars['volume'].iloc[rows]))
+
+    def test_opening_range(self, bars):
+        """Test running range inside the first 15 minutes and the final range after"""
+        high, low = calculate_opening_range(bars, minutes=15)
+        for rows in session_groups(bars):
+            opening = rows[:3]
+            for i, row in enumerate(opening):
+                assert high.iloc[row] == bars['high'].iloc[opening[:i + 1]].max()
+            assert (high.iloc[rows[3:]] == bars['high'].iloc[opening].max()).all()
+            assert (low.iloc[rows[3:]] == bars['low'].iloc[opening].min()).all()
+
+    def test_session_moving_average(self, bars):
+        """Test that the MA equals a rolling mean computed per session"""
+        sessions = session_frame(bars['timestamp'])
+        for backend in ['pandas', 'numpy']:
+            ma = session_moving_average(bars['close'], 10, sessions, backend=backend)
+            for rows in session_groups(bars):
+                expected = bars['close'].iloc[rows].rolling(10).mean()
+                np.testing.assert_allclose(ma.iloc[rows].to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    def test_add_session_indicators(self, bars):
+        """Test the combined columns"""
+        df = add_session_indicators(bars, reset_ma_periods=(5,))
+        for column in ['session', 'session_bar', 'session_volume', 'vwap', 'vwap_upper_1',
+                       'vwap_lower_2', 'or_high', 'or_low', 'session_ma_5']:
+            assert column in df.columns
+        assert len(df) == len(bars)
+        assert 'vwap' not in bars.columns
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -4,6 +4,7 @@ Test suite for strategy module
 
 import sys
 import os
+import json
 import pytest
 import pandas as pd
 import numpy as np
@@ -11,8 +12,9 @@ import numpy as np
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.strategy import ScalpingStrategy
-from modules.indicators import add_all_indicators
+from modules.rules import RuleError
+from modules.strategy import RuleStrategy, ScalpingStrategy, SignalRouter, SignalStream
+from modules.indicators import add_all_indicators, compute_indicators
 import config
 
 
@@ -295,6 +297,294 @@ class TestSignalCounts:
         assert total_signals > 0
 
 
+def reference_signals(strategy, df):
+    """The original row-by-row implementation of generate_signals"""
+    from modules.indicators import compute_indicators
+    df = compute_indicators(df, ['rsi', 'ma_20', 'ma_50'])
+    signals = []
+    for i in range(len(df)):
+        if i < strategy.ma_long:
+            continue
+        row = df.iloc[i]
+        if pd.isna(row['rsi']) or pd.isna(row['ma_20']) or pd.isna(row['ma_50']):
+            continue
+        if row['rsi'] < strategy.rsi_oversold and row['close'] > row['ma_20']:
+            action, confidence = 'BUY', strategy._calculate_buy_confidence(row)
+        elif row['rsi'] > strategy.rsi_overbought:
+            action, confidence = 'SELL', strategy._calculate_sell_confidence(row)
+        else:
+            continue
+        signals.append({'timestamp': row['timestamp'], 'action': action, 'price': row['close'],
+                        'confidence': confidence, 'rsi': row['rsi'], 'ma_20': row['ma_20'], 'ma_50': row['ma_50']})
+    return pd.DataFrame(signals)
+
+
+class TestVectorizedSignals:
+    """Test that the vectorized signals equal the row-by-row rules"""
+
+    @pytest.mark.parametrize('seed', [0, 1, 6])
+    def test_matches_row_loop(self, strategy, seed):
+        """Test identical output on choppy data with gaps, tz-aware times and a shifted index"""
+        rng = np.random.default_rng(seed)
+        n = 3000
+        close = 1300 + np.cumsum(rng.standard_normal(n) * 4 * np.sin(np.arange(n) / 40))
+        df = pd.DataFrame({
+            'timestamp': pd.date_range('2025-09-01', periods=n, freq='5min', tz='Asia/Kolkata' if seed else None),
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000
+        })
+        df.loc[rng.integers(0, n, 20), 'close'] = np.nan
+        df.index += 100
+
+        result = strategy.generate_signals(df)
+        assert set(result['action']) == {'BUY', 'SELL'}
+        pd.testing.assert_frame_equal(result, reference_signals(strategy, df), check_exact=True)
+
+    def test_no_signals(self, strategy):
+        """Test that flat data gives the same empty frame"""
+        df = pd.DataFrame({
+            'timestamp': pd.date_range('2025-09-01', periods=80, freq='5min'),
+            'open': 1300.0, 'high': 1301.0, 'low': 1299.0, 'close': 1300.0, 'volume': 1000
+        })
+        pd.testing.assert_frame_equal(strategy.generate_signals(df), pd.DataFrame())
+
+    def test_confidence_arrays(self, strategy):
+        """Test that the confidence helpers score arrays element by element"""
+        rows = pd.DataFrame({'rsi': [10.0, 25.0, 85.0], 'close': [1300.0, 1250.0, 1200.0],
+                             'ma_20': [1200.0, 1260.0, 1250.0], 'ma_50': [1100.0, 1270.0, 1240.0]})
+        buy = strategy._calculate_buy_confidence(rows)
+        sell = strategy._calculate_sell_confidence(rows)
+        for i in range(len(rows)):
+            assert buy[i] == strategy._calculate_buy_confidence(rows.iloc[i])
+            assert sell[i] == strategy._calculate_sell_confidence(rows.iloc[i])
+
+
+class TestIndicatorReuse:
+    """Test that the strategy reads precomputed indicators instead of recomputing them"""
+
+    def test_declares_required_indicators(self, strategy):
+        """Test the declared columns"""
+        assert set(strategy.required_indicators) == {'rsi', 'ma_20', 'ma_50'}
+
+    def test_precomputed_columns_are_used(self, strategy, sample_data_with_indicators, monkeypatch):
+        """Test that a frame with every required column resolves no indicator"""
+        import modules.indicators as indicators
+        resolved = []
+        original = indicators.resolve_indicator
+        monkeypatch.setattr(indicators, 'resolve_indicator', lambda name: resolved.append(name) or original(name))
+
+        df = sample_data_with_indicators
+        df['rsi'] = 10.0
+        df['ma_20'] = df['close'] - 1
+        columns = list(df.columns)
+        signals = strategy.generate_signals(df)
+
+        assert resolved == []
+        assert (signals['action'] == 'BUY').all()
+        assert len(signals) == len(df) - strategy.ma_long
+        assert list(df.columns) == columns
+
+    def test_missing_columns_added_unless_copy(self, strategy):
+        """Test that missing indicators are added to the caller's frame only when copy=False"""
+        rng = np.random.default_rng(3)
+        close = 1300 + np.cumsum(rng.standard_normal(200) * 3)
+        df = pd.DataFrame({'timestamp': pd.date_range('2025-09-01', periods=200, freq='5min'), 'close': close})
+
+        strategy.generate_signals(df, copy=True)
+        assert 'rsi' not in df.columns
+        first = strategy.generate_signals(df)
+        assert {'rsi', 'ma_20', 'ma_50'} <= set(df.columns)
+        pd.testing.assert_frame_equal(strategy.generate_signals(df), first)
+
+
+def choppy_history(seed, n=3000):
+    """Oscillating random walk that produces both BUY and SELL signals"""
+    rng = np.random.default_rng(seed)
+    close = 1300 + np.cumsum(rng.standard_normal(n) * 4 * np.sin(np.arange(n) / 40))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-09-01', periods=n, freq='5min'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1000
+    })
+
+
+def assert_same_signals(streamed, batch):
+    """Same bars and actions; values equal to floating-point rounding"""
+    streamed = pd.DataFrame(streamed)[list(batch.columns)]
+    pd.testing.assert_frame_equal(streamed[['timestamp', 'action']], batch[['timestamp', 'action']])
+    pd.testing.assert_frame_equal(streamed.drop(columns=['timestamp', 'action']),
+                                  batch.drop(columns=['timestamp', 'action']), rtol=1e-9)
+
+
+class TestStreamingSignals:
+    """Test bar-by-bar evaluation against generate_signals"""
+
+    def test_stream_matches_batch(self, strategy):
+        """Test that on_bar finds the signals generate_signals finds"""
+        df = choppy_history(0)
+        df.loc[[700, 701, 1500], 'close'] = np.nan
+        stream = strategy.stream()
+        streamed = [signal for bar in df.to_dict('records') if (signal := stream.on_bar(bar)) is not None]
+
+        batch = strategy.generate_signals(df, copy=True)
+        assert set(batch['action']) == {'BUY', 'SELL'}
+        assert_same_signals(streamed, batch)
+        assert stream.bars == len(df)
+
+    def test_flat_stretch_matches_batch(self, strategy):
+        """Test that unchanged closes do not produce signals the batch path does not"""
+        df = choppy_history(3)
+        df.loc[800:860, ['open', 'high', 'low', 'close']] = df.loc[799, ['open', 'high', 'low', 'close']].to_numpy()
+        stream = strategy.stream()
+        streamed = [signal for bar in df.to_dict('records') if (signal := stream.on_bar(bar)) is not None]
+
+        batch = strategy.generate_signals(df, copy=True)
+        assert_same_signals(streamed, batch)
+        assert not any(800 + 14 <= df.index[df['timestamp'] == signal['timestamp']][0] <= 860
+                       for signal in streamed)
+
+    def test_warm_up_feeds_high_and_low(self):
+        """Test that warm_up passes every OHLCV field to indicators that need them"""
+        strategy = RuleStrategy(buy="stoch_k < 20 and close > ma_20", sell="stoch_k > 80", warmup=20,
+                                verbose=False)
+        df = choppy_history(4)
+        df['high'] += np.abs(np.sin(np.arange(len(df))))
+        router = SignalRouter(strategy)
+        router.warm_up('A', df.iloc[:2000])
+        streamed = [signal for bar in df.iloc[2000:].to_dict('records')
+                    if (signal := router.on_bar('A', bar)) is not None]
+
+        batch = strategy.generate_signals(df, copy=True)
+        batch = batch[batch['timestamp'] >= df['timestamp'].iloc[2000]].reset_index(drop=True)
+        for signal in streamed:
+            signal.pop('symbol')
+        assert len(batch) > 0
+        assert_same_signals(streamed, batch)
+
+    def test_router_keeps_symbols_apart(self, strategy):
+        """Test interleaved bars of several symbols"""
+        histories = {f"SYM{seed}": choppy_history(seed, 1200) for seed in range(4)}
+        router = SignalRouter(strategy)
+        streamed = {symbol: [] for symbol in histories}
+        for i in range(1200):
+            for symbol, df in histories.items():
+                signal = router.on_bar(symbol, df.iloc[i].to_dict())
+                if signal is not None:
+                    assert signal.pop('symbol') == symbol
+                    streamed[symbol].append(signal)
+
+        for symbol, df in histories.items():
+            assert_same_signals(streamed[symbol], strategy.generate_signals(df, copy=True))
+
+    def test_state_round_trip(self, strategy):
+        """Test that a router restored from JSON continues identically"""
+        df = choppy_history(6)
+        head, tail = df.iloc[:1000], df.iloc[1000:].to_dict('records')
+
+        whole = SignalRouter(strategy)
+        whole.warm_up('A', head)
+        expected = [whole.on_bar('A', bar) for bar in tail]
+
+        first = SignalRouter(strategy)
+        assert first.warm_up('A', head) == 1000
+        resumed = SignalRouter(strategy)
+        resumed.set_state(json.loads(json.dumps(first.get_state())))
+        assert [resumed.on_bar('A', bar) for bar in tail] == expected
+        assert any(signal is not None for signal in expected)
+
+    def test_warm_up_period(self, strategy):
+        """Test that no signal is emitted before ma_long bars"""
+        stream = SignalStream(strategy)
+        bars = choppy_history(1, strategy.ma_long).to_dict('records')
+        assert all(stream.on_bar(bar) is None for bar in bars)
+
+
+
+class TestRuleStrategy:
+    """Test strategies defined by rule expressions"""
+
+    @pytest.fixture
+    def rules(self):
+        return RuleStrategy.from_config(verbose=False)
+
+    @pytest.mark.parametrize('seed', [0, 1, 6])
+    def test_config_rules_match_scalping(self, strategy, rules, seed):
+        """Test that config.SCALPING_RULES reproduces ScalpingStrategy exactly"""
+        df = choppy_history(seed)
+        df.loc[[700, 701], 'close'] = np.nan
+        expected = strategy.generate_signals(df, copy=True)
+        pd.testing.assert_frame_equal(rules.generate_signals(df, copy=True), expected)
+        assert rules.required_indicators == strategy.required_indicators
+
+    def test_stream_matches_batch(self, rules):
+        """Test that on_bar evaluates the same rules as generate_signals"""
+        df = choppy_history(1)
+        stream = rules.stream()
+        streamed = [signal for bar in df.to_dict('records') if (signal := stream.on_bar(bar)) is not None]
+        assert_same_signals(streamed, rules.generate_signals(df, copy=True))
+
+    def test_stream_with_bar_indicators(self):
+        """Test rules reading ATR, Stochastic, Bollinger and MACD columns bar by bar"""
+        strategy = RuleStrategy(buy="stoch_k < 20 and close < bb_lower + atr",
+                                sell="stoch_k > 80 and macd > macd_signal",
+                                buy_confidence="0.5 + clip((bb_middle - close) / atr, 0, 1) * 0.3",
+                                warmup=35, verbose=False)
+        df = choppy_history(7)
+        df['high'] += np.abs(np.sin(np.arange(len(df))))
+        stream = strategy.stream()
+        streamed = [signal for bar in df.to_dict('records') if (signal := stream.on_bar(bar)) is not None]
+
+        batch = strategy.generate_signals(df, copy=True)
+        assert set(batch['action']) == {'BUY', 'SELL'}
+        assert_same_signals(streamed, batch)
+
+    def test_stream_rejects_batch_only_indicators(self):
+        """Test a clear error for indicators without a streaming counterpart"""
+        strategy = RuleStrategy(buy="close < ma_20 - 2 * std_20", sell="close > ma_20", verbose=False)
+        assert not strategy.generate_signals(choppy_history(8), copy=True).empty
+        with pytest.raises(ValueError, match="std_20"):
+            strategy.stream()
+
+    def test_variant_from_file(self, tmp_path):
+        """Test a new variant defined only by a rule file"""
+        path = tmp_path / "ema.json"
+        path.write_text(json.dumps({
+            'name': 'EMA pullback', 'warmup': 30,
+            'buy': 'close < ema_9 and ema_9 > ma_30 and rsi_7 < low_rsi',
+            'sell': 'rsi_7 > 80 or close < ma_30 * 0.99',
+            'buy_confidence': 'clip((low_rsi - rsi_7) / low_rsi, 0, 1)',
+            'constants': {'low_rsi': 40}
+        }))
+        variant = RuleStrategy.from_file(str(path), verbose=False)
+        assert variant.name == 'EMA pullback'
+        assert variant.required_indicators == ('ema_9', 'ma_30', 'rsi_7')
+
+        df = choppy_history(0)
+        signals = variant.generate_signals(df, copy=True)
+        assert set(signals['action']) == {'BUY', 'SELL'}
+        assert list(signals.columns[4:]) == ['ema_9', 'ma_30', 'rsi_7']
+
+        # Reference: the same conditions written directly with pandas
+        full = compute_indicators(df, ['ema_9', 'ma_30', 'rsi_7'], copy=True)
+        ready = (np.arange(len(df)) >= 30) & full[['ema_9', 'ma_30', 'rsi_7']].notna().all(axis=1)
+        buy = ready & (full['close'] < full['ema_9']) & (full['ema_9'] > full['ma_30']) & (full['rsi_7'] < 40)
+        sell = ready & ~buy & ((full['rsi_7'] > 80) | (full['close'] < full['ma_30'] * 0.99))
+        assert signals['timestamp'].tolist() == full.loc[buy | sell, 'timestamp'].tolist()
+        assert (signals.loc[signals['action'] == 'SELL', 'confidence'] == 0.5).all()
+        assert signals['confidence'].between(0, 1).all()
+
+        stream = variant.stream()
+        streamed = [signal for bar in df.to_dict('records') if (signal := stream.on_bar(bar)) is not None]
+        assert_same_signals(streamed, signals)
+
+    def test_invalid_rule(self):
+        """Test that a bad rule fails when the strategy is built"""
+        with pytest.raises(RuleError):
+            RuleStrategy(buy='rsi < 30 and os.system("ls")', sell='rsi > 70', verbose=False)
+
+    def test_no_signals(self, rules):
+        """Test that a history shorter than the warm-up gives an empty frame"""
+        assert rules.generate_signals(choppy_history(0, 40), copy=True).empty
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -0,0 +1,176 @@
+"""
+Test suite for strategy_engine module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import modules.indicators as indicators
+from modules.database import Database
+from modules.indicator_store import IndicatorStore
+from modules.strategy import BaseStrategy, ScalpingStrategy
+from modules.strategy_engine import StrategyEngine
+
+SYMBOL = "NSE:INFY-EQ"
+
+
+class MacdCrossStrategy(BaseStrategy):
+    """Entirely different rules: MACD crossing its signal line once MA50 is defined"""
+
+    name = "MACD Cross"
+    required_indicators = ('macd', 'macd_signal', 'ma_50')
+
+    def find_signals(self, df):
+        above = df['macd'] > df['macd_signal']
+        crossed = above != above.shift(fill_value=False)
+        rows = df[crossed & df['ma_50'].notna()]
+        return pd.DataFrame({
+            'timestamp': rows['timestamp'].to_numpy(),
+            'action': np.where(above[rows.index], 'BUY', 'SELL'),
+            'price': rows['close'].to_numpy(),
+            'confidence': 0.5
+        })
+
+
+def make_candles(n=1500, seed=0):
+    """Oscillating random walk that produces signals for every strategy"""
+    rng = np.random.default_rng(seed)
+    close = 1300 + np.cumsum(rng.standard_normal(n) * 4 * np.sin(np.arange(n) / 40))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2025-09-01 03:45:00', periods=n, freq='5min'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': rng.integers(1000, 5000, n)
+    })
+
+
+def tight_scalping():
+    strategy = ScalpingStrategy()
+    strategy.name = "Scalping Options (25/75)"
+    strategy.rsi_oversold, strategy.rsi_overbought = 25, 75
+    return strategy
+
+
+@pytest.fixture
+def engine():
+    return StrategyEngine([ScalpingStrategy(), tight_scalping(), MacdCrossStrategy()])
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Create a temporary database with one symbol"""
+    db = Database(db_path=str(tmp_path / "engine.db"))
+    db.add_stock(SYMBOL, "Infosys", "NSE")
+    db.upsert_price_data(make_candles(), SYMBOL)
+    yield db
+    db.close()
+
+
+class TestStrategyEngine:
+    """Test running many strategies on one indicator pass"""
+
+    def test_union_of_requirements(self, engine):
+        """Test that shared indicators are listed once"""
+        assert engine.required_indicators == ['rsi', 'ma_20', 'ma_50', 'macd', 'macd_signal']
+
+    def test_results_match_individual_runs(self, engine):
+        """Test that each strategy gets the signals it would produce alone"""
+        df = make_candles()
+        results = engine.run(df, copy=True)
+        assert list(results) == ["Scalping Options", "Scalping Options (25/75)", "MACD Cross"]
+        for strategy in engine.strategies:
+            pd.testing.assert_frame_equal(results[strategy.name], strategy.generate_signals(df, copy=True))
+        assert len(results["Scalping Options (25/75)"]) < len(results["Scalping Options"])
+
+    def test_each_indicator_computed_once(self, engine, monkeypatch):
+        """Test that the shared columns are computed a single time for all strategies"""
+        computed = []
+        original = indicators.resolve_indicator
+
+        def counting(name):
+            node = original(name)
+
+            def compute(*inputs, **options):
+                computed.append(name)
+                return node.compute(*inputs, **options)
+            return indicators.IndicatorNode(name, node.inputs, compute)
+
+        monkeypatch.setattr(indicators, 'resolve_indicator', counting)
+        engine.run(make_candles())
+        assert len(computed) == len(set(computed))
+        assert {'rsi', 'ma_20', 'ma_50', 'macd', 'macd_signal'} <= set(computed)
+
+    def test_duplicate_name_rejected(self, engine):
+        """Test that strategy names must be unique"""
+        with pytest.raises(ValueError):
+            engine.register(ScalpingStrategy())
+
+
+class TestSignalStorage:
+    """Test bulk emission to the signals table"""
+
+    def test_run_symbol_stores_all_strategies(self, engine, db):
+        """Test that every strategy's signals are written, and reruns do not duplicate them"""
+        engine.db = db
+        results = engine.run_symbol(SYMBOL)
+        stored = db.get_signals(symbol=SYMBOL)
+
+        expected = {name: len(signals) for name, signals in results.items()}
+        assert stored.groupby('strategy').size().to_dict() == expected
+
+        engine.run_symbol(SYMBOL)
+        assert len(db.get_signals(symbol=SYMBOL)) == sum(expected.values())
+
+    def test_rerun_drops_stale_signals(self, db):
+        """Test that a rerun with tighter thresholds removes signals it no longer produces"""
+        engine = StrategyEngine([ScalpingStrategy()], db=db)
+        first = len(engine.run_symbol(SYMBOL)["Scalping Options"])
+        assert first > 0
+
+        engine.strategies[0].rsi_oversold, engine.strategies[0].rsi_overbought = 25, 75
+        tighter = len(engine.run_symbol(SYMBOL)["Scalping Options"])
+        assert tighter < first
+        assert len(db.get_signals(symbol=SYMBOL)) == tighter
+
+        engine.strategies[0].rsi_oversold, engine.strategies[0].rsi_overbought = 0, 100
+        assert engine.run_symbol(SYMBOL)["Scalping Options"].empty
+        assert db.get_signals(symbol=SYMBOL).empty
+
+    def test_reads_stored_indicators(self, engine, db):
+        """Test that candles loaded from the indicator store give the same signals"""
+        engine.store = IndicatorStore(db)
+        from_store = engine.run_symbol(SYMBOL, save=False)
+        engine.store = None
+        engine.db = db
+        from_prices = engine.run_symbol(SYMBOL, save=False)
+        for name in from_prices:
+            pd.testing.assert_frame_equal(from_store[name], from_prices[name], rtol=1e-9)
+
+    def test_run_all_counts(self, engine, db):
+        """Test the per-symbol summary"""
+        engine.db = db
+        counts = engine.run_all()
+        assert len(counts) == 3
+        assert (counts['buy'] + counts['sell'] > 0).all()
+
+    def test_insert_signals_columns(self, db):
+        """Test per-row symbol and strategy columns and missing confidence"""
+        signals = pd.DataFrame({
+            'symbol': [SYMBOL, SYMBOL], 'strategy': ['A', 'B'],
+            'timestamp': pd.to_datetime(['2025-09-01 04:00', '2025-09-01 04:05']),
+            'action': ['BUY', 'SELL'], 'price': [1300, 1301.5]
+        })
+        assert db.insert_signals(signals) == 2
+        assert db.insert_signals(signals.iloc[:0]) == 0
+        stored = db.get_signals(symbol=SYMBOL).sort_values('strategy')
+        assert stored['strategy'].tolist() == ['A', 'B']
+        assert stored['confidence'].isna().all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,198 @@
+"""
+Test suite for streaming_indicators module
+"""
+
+import sys
+import os
+import json
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import (
+    calculate_rsi,
+    calculate_moving_average,
+    calculate_ema,
+    calculate_stochastic,
+    calculate_atr,
+    add_all_indicators,
+    compute_indicators
+)
+from modules.streaming_indicators import (
+    ATR,
+    EMA,
+    RSI,
+    SMA,
+    IndicatorSet,
+    RollingExtreme,
+    Stochastic,
+    streaming_column,
+    streaming_indicator
+)
+
+
+@pytest.fixture
+def price_data():
+    """Create 1500 bars so that every indicator warms up and resyncs"""
+    np.random.seed(7)
+    n = 1500
+    close = 1300 + np.cumsum(np.random.randn(n) * 3)
+    return pd.DataFrame({
+        'high': close + np.abs(np.random.randn(n) * 2),
+        'low': close - np.abs(np.random.randn(n) * 2),
+        'close': close
+    })
+
+
+def assert_series_match(streamed, batch):
+    """Compare streamed values with a batch Series, NaN positions included"""
+    np.testing.assert_allclose(np.asarray(streamed, dtype=float), batch.to_numpy(dtype=float),
+                               rtol=1e-9, atol=1e-8)
+
+
+class TestParity:
+    """Test numerical equivalence with the batch functions"""
+
+    def test_sma_and_ema(self, price_data):
+        """Test SMA and EMA against calculate_moving_average and calculate_ema"""
+        sma, ema = SMA(20), EMA(12)
+        close = price_data['close']
+        assert_series_match([sma.update(c) for c in close], calculate_moving_average(close, 20))
+        assert_series_match([ema.update(c) for c in close], calculate_ema(close, 12))
+
+    def test_rsi(self, price_data):
+        """Test RSI against calculate_rsi"""
+        rsi = RSI(14)
+        close = price_data['close']
+        assert_series_match([rsi.update(c) for c in close], calculate_rsi(close, 14))
+
+    def test_rsi_flat_stretch(self, price_data):
+        """Test that a run of unchanged closes gives NaN, as in batch, not a stale value"""
+        close = price_data['close'].copy()
+        close.iloc[300:330] = close.iloc[299]
+        close.iloc[600:650] = close.iloc[599]
+        rsi = RSI(14)
+        streamed = np.array([rsi.update(c) for c in close])
+
+        assert_series_match(streamed, calculate_rsi(close, 14))
+        assert np.isnan(streamed[320:330]).all()
+        assert ((streamed[~np.isnan(streamed)] >= 0) & (streamed[~np.isnan(streamed)] <= 100)).all()
+
+    def test_wilder_rsi(self, price_data):
+        """Test Wilder smoothing against an explicit recursion"""
+        close = price_data['close'].to_numpy()
+        delta = np.diff(close)
+        gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+
+        expected = [np.nan] * 14
+        avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+        expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+        for g, l in zip(gains[14:], losses[14:]):
+            avg_gain = (avg_gain * 13 + g) / 14
+            avg_loss = (avg_loss * 13 + l) / 14
+            expected.append(100 - 100 / (1 + avg_gain / avg_loss))
+
+        rsi = RSI(14, smoothing='wilder')
+        assert_series_match([rsi.update(c) for c in close], pd.Series(expected))
+
+    def test_stochastic_and_atr(self, price_data):
+        """Test bar-based indicators against the batch functions"""
+        stochastic, atr = Stochastic(14, 3), ATR(14)
+        rows = list(zip(price_data['high'], price_data['low'], price_data['close']))
+        k, d = zip(*[stochastic.update(*row) for row in rows])
+        batch_k, batch_d = calculate_stochastic(price_data['high'], price_data['low'], price_data['close'])
+        assert_series_match(k, batch_k)
+        assert_series_match(d, batch_d)
+        assert_series_match([atr.update(*row) for row in rows],
+                            calculate_atr(price_data['high'], price_data['low'], price_data['close']))
+
+    def test_indicator_set_matches_add_all_indicators(self, price_data):
+        """Test all 15 columns, including gaps in the closes"""
+        price_data.loc[[40, 41, 700], 'close'] = np.nan
+        streamed = pd.DataFrame(IndicatorSet().run(price_data))
+        batch = add_all_indicators(price_data)
+
+        for column in IndicatorSet.COLUMNS:
+            assert_series_match(streamed[column], batch[column])
+
+
+class TestRollingExtreme:
+    """Test the monotonic deque"""
+
+    def test_matches_pandas(self):
+        """Test rolling max and min against pandas"""
+        np.random.seed(3)
+        values = pd.Series(np.random.randint(0, 20, 300).astype(float))
+        highest, lowest = RollingExtreme(5, 'max'), RollingExtreme(5, 'min')
+        assert_series_match([highest.update(v) for v in values], values.rolling(5).max())
+        assert_series_match([lowest.update(v) for v in values], values.rolling(5).min())
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected"""
+        with pytest.raises(ValueError):
+            RollingExtreme(5, 'median')
+
+
+class TestStreamingIndicatorNames:
+    """Test construction from registry names"""
+
+    def test_close_only_names(self, price_data):
+        """Test that each name streams the matching batch column"""
+        batch = {'rsi': calculate_rsi(price_data['close'], 14),
+                 'rsi_21': calculate_rsi(price_data['close'], 21),
+                 'ma_30': calculate_moving_average(price_data['close'], 30),
+                 'ema_9': calculate_ema(price_data['close'], 9)}
+        for name, expected in batch.items():
+            indicator = streaming_indicator(name)
+            streamed = pd.Series([indicator.update(c) for c in price_data['close']])
+            assert_series_match(streamed, expected)
+
+    def test_unknown_name(self):
+        """Test that names needing more than the close are rejected"""
+        with pytest.raises(KeyError):
+            streaming_indicator('atr')
+
+    def test_bar_names(self, price_data):
+        """Test that every streaming_column name streams the matching batch column"""
+        names = ['rsi', 'ma_30', 'macd', 'macd_signal', 'macd_histogram', 'bb_upper', 'bb_middle',
+                 'bb_lower', 'stoch_k', 'stoch_d', 'atr', 'atr_7']
+        batch = compute_indicators(price_data, names, copy=True)
+        bars = price_data.to_dict('records')
+        for name in names:
+            column = streaming_column(name)
+            assert_series_match([column.update(bar) for bar in bars], batch[name])
+        assert streaming_column('atr').fields == ('high', 'low', 'close')
+        with pytest.raises(KeyError):
+            streaming_column('std_20')
+
+
+class TestState:
+    """Test snapshot and restore"""
+
+    def test_restore_resumes_exactly(self, price_data):
+        """Test that a restored set continues as if it had never stopped"""
+        head, tail = price_data.iloc[:800], price_data.iloc[800:]
+
+        uninterrupted = IndicatorSet()
+        expected = uninterrupted.run(price_data)[800:]
+
+        first = IndicatorSet()
+        first.run(head)
+        state = json.loads(json.dumps(first.get_state()))
+
+        resumed = IndicatorSet()
+        resumed.set_state(state)
+        result = resumed.run(tail)
+
+        assert resumed.bars == len(price_data)
+        assert_series_match(pd.DataFrame(result)['rsi'], pd.DataFrame(expected)['rsi'])
+        assert_series_match(pd.DataFrame(result)['ma_200'], pd.DataFrame(expected)['ma_200'])
+        assert_series_match(pd.DataFrame(result)['macd_signal'], pd.DataFrame(expected)['macd_signal'])
+        assert_series_match(pd.DataFrame(result)['stoch_d'], pd.DataFrame(expected)['stoch_d'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,136 @@
+"""
+Test suite for timeframes module
+"""
+
+import sys
+import os
+import json
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import compute_indicators
+from modules.timeframes import (
+    TimeframeAggregator,
+    add_timeframe_indicators,
+    resample_candles
+)
+
+
+@pytest.fixture
+def candles():
+    """Six sessions of 5-minute candles (naive UTC) with a pre-open bar and a missing candle"""
+    days = pd.bdate_range('2025-09-01', periods=6)
+    timestamps = pd.DatetimeIndex(np.concatenate([
+        pd.date_range(day + pd.Timedelta('03:40:00'), day + pd.Timedelta('09:55:00'), freq='5min')
+        for day in days
+    ]))
+    timestamps = timestamps.delete(timestamps.get_loc(pd.Timestamp('2025-09-02 04:25:00')))
+    np.random.seed(4)
+    n = len(timestamps)
+    close = 1300 + np.cumsum(np.random.randn(n) * 2)
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': close + np.random.randn(n),
+        'high': close + np.abs(np.random.randn(n) * 2),
+        'low': close - np.abs(np.random.randn(n) * 2),
+        'close': close,
+        'volume': np.random.randint(1000, 5000, n)
+    })
+
+
+class TestResample:
+    """Test session-anchored resampling"""
+
+    def test_fifteen_minute_bars(self, candles):
+        """Test bucket boundaries and OHLCV aggregation"""
+        bars = resample_candles(candles, 15)
+        first = bars.iloc[0]
+        source = candles.iloc[1:4]
+
+        assert first['timestamp'] == pd.Timestamp('2025-09-01 03:45:00')
+        assert first['end_time'] == pd.Timestamp('2025-09-01 04:00:00')
+        assert first['open'] == source['open'].iloc[0]
+        assert first['high'] == source['high'].max()
+        assert first['low'] == source['low'].min()
+        assert first['close'] == source['close'].iloc[-1]
+        assert first['volume'] == source['volume'].sum()
+        assert len(bars) == 6 * 25
+        assert bars['bars'].value_counts()[2] == 1
+
+    def test_hourly_bars_end_at_close(self, candles):
+        """Test that the last hourly bar of a session is cut at 15:30 IST"""
+        bars = resample_candles(candles, 60)
+        last = bars[bars['timestamp'].dt.date == pd.Timestamp('2025-09-01').date()].iloc[-1]
+        assert last['timestamp'] == pd.Timestamp('2025-09-01 09:45:00')
+        assert last['end_time'] == pd.Timestamp('2025-09-01 10:00:00')
+        assert last['bars'] == 3
+
+
+class TestAlignment:
+    """Test higher-timeframe indicators on base candles"""
+
+    def test_no_lookahead(self, candles):
+        """Test that each base candle sees only higher-timeframe bars closed by its own close"""
+        df = add_timeframe_indicators(candles, 15, columns=['ma_20'])
+        bars = compute_indicators(resample_candles(candles, 15), ['ma_20'])
+
+        base_end = candles['timestamp'] + pd.Timedelta(minutes=5)
+        for i in range(len(candles)):
+            closed = bars[bars['end_time'] <= base_end.iloc[i]]
+            expected = closed['ma_20'].iloc[-1] if len(closed) else np.nan
+            assert df['ma_20_15m'].iloc[i] == pytest.approx(expected, nan_ok=True)
+
+    def test_value_changes_only_at_bar_close(self, candles):
+        """Test that the aligned value changes only when a 15m boundary has just passed"""
+        df = add_timeframe_indicators(candles, 15, columns=['ma_20'])
+        base_end = df['timestamp'] + pd.Timedelta(minutes=5)
+        changed = (df['ma_20_15m'].diff().fillna(0) != 0).to_numpy()
+
+        # Includes the candle after the missing 04:25 one, which is the first
+        # to see the 04:15-04:30 bar
+        assert (base_end.dt.floor('15min')[changed] > base_end.shift()[changed]).all()
+        assert changed.sum() == len(resample_candles(candles, 15)) - 20
+
+
+class TestAggregator:
+    """Test incremental higher-timeframe state"""
+
+    def test_matches_batch(self, candles):
+        """Test that streaming base candles reproduces the batch result"""
+        batch = add_timeframe_indicators(candles, 15, columns=['rsi', 'ma_20', 'macd', 'atr'])
+        aggregator = TimeframeAggregator(15)
+
+        completed = 0
+        for i, candle in enumerate(candles.to_dict('records')):
+            if aggregator.update(candle) is not None:
+                completed += 1
+            values = aggregator.current(['rsi', 'ma_20', 'macd', 'atr'])
+            for column, value in values.items():
+                assert value == pytest.approx(batch[column].iloc[i], rel=1e-9, abs=1e-9, nan_ok=True), (i, column)
+        assert completed == len(resample_candles(candles, 15))
+
+    def test_state_round_trip(self, candles):
+        """Test that a restored aggregator continues identically"""
+        records = candles.to_dict('records')
+        whole = TimeframeAggregator(60)
+        for candle in records:
+            whole.update(candle)
+
+        first = TimeframeAggregator(60)
+        for candle in records[:203]:
+            first.update(candle)
+        assert first.forming is not None
+        resumed = TimeframeAggregator(60)
+        resumed.set_state(json.loads(json.dumps(first.get_state())))
+        for candle in records[203:]:
+            resumed.update(candle)
+
+        assert resumed.current() == pytest.approx(whole.current(), nan_ok=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+"""
+Test suite for universe module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.indicators import compute_panel_indicators
+from modules.strategy import ScalpingStrategy
+from modules.universe import SharedPanel, UniverseRunner
+
+
+@pytest.fixture
+def panel():
+    """Twelve symbols of 5-minute candles, one listed late and one delisted early"""
+    np.random.seed(41)
+    n, k = 600, 12
+    index = pd.date_range('2025-01-01 03:45:00', periods=n, freq='5min')
+    symbols = [f"SYM{i}" for i in range(k)]
+    close = 1000 + np.cumsum(np.random.randn(n, k) * 2, axis=0)
+    close[:150, 2] = np.nan
+    close[400:, 5] = np.nan
+    close[[50, 51], 8] = np.nan
+    return {
+        'open': pd.DataFrame(close + np.random.randn(n, k), index=index, columns=symbols),
+        'high': pd.DataFrame(close + np.random.rand(n, k) * 3, index=index, columns=symbols),
+        'low': pd.DataFrame(close - np.random.rand(n, k) * 3, index=index, columns=symbols),
+        'close': pd.DataFrame(close, index=index, columns=symbols),
+        'volume': pd.DataFrame(np.random.randint(1000, 5000, (n, k)).astype(float), index=index, columns=symbols)
+    }
+
+
+COLUMNS = ['rsi', 'ma_20', 'ma_50', 'macd_signal', 'bb_lower', 'stoch_d', 'atr']
+
+
+class TestSharedPanel:
+    """Test the shared memory block"""
+
+    def test_attach_sees_parent_data(self, panel):
+        """Test that an attached block views the same memory"""
+        shared = SharedPanel.from_panel(panel, ['close', 'volume'])
+        try:
+            attached = SharedPanel.attach(shared.spec)
+            np.testing.assert_array_equal(attached.field('close'), panel['close'].to_numpy())
+            attached.values[1, 0, 0] = -1.0
+            assert shared.field('volume')[0, 0] == -1.0
+            attached.close()
+        finally:
+            shared.close()
+
+
+class TestUniverseRunner:
+    """Test parity of parallel and single-process computation"""
+
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_indicators_match_panel(self, panel, workers):
+        """Test that sharded results equal compute_panel_indicators"""
+        runner = UniverseRunner(workers=workers)
+        results = runner.compute_indicators(panel, COLUMNS)
+        expected = compute_panel_indicators(panel, COLUMNS, backend='numpy')
+        for column in COLUMNS:
+            pd.testing.assert_frame_equal(results[column], expected[column])
+        assert runner.symbols == 12
+
+    def test_float32(self, panel):
+        """Test that the precision setting reaches the workers"""
+        results = UniverseRunner(workers=2, precision='float32').compute_indicators(panel, ['rsi'])
+        expected = compute_panel_indicators(panel, ['rsi'], backend='numpy', precision='float32')
+        pd.testing.assert_frame_equal(results['rsi'], expected['rsi'])
+
+    def test_more_workers_than_symbols(self, panel):
+        """Test that empty shards are not scheduled"""
+        runner = UniverseRunner(workers=32)
+        assert len(runner._shards(12)) == 12
+        small = {field: frame.iloc[:, :2] for field, frame in panel.items()}
+        results = runner.compute_indicators(small, ['ma_20'])
+        assert results['ma_20'].shape == (600, 2)
+
+    def test_signals_match_per_symbol(self, panel):
+        """Test that parallel signals equal the strategy run on each symbol"""
+        strategy = ScalpingStrategy()
+        signals = UniverseRunner(workers=3).generate_signals(panel, strategy)
+
+        for symbol in ['SYM2', 'SYM5', 'SYM8']:
+            df = pd.DataFrame({field: frame[symbol] for field, frame in panel.items()})
+            df = df.rename_axis('timestamp').reset_index()
+            df = df[df['close'].notna()].reset_index(drop=True)
+            expected = strategy.generate_signals(df)
+            got = signals[signals['symbol'] == symbol].drop(columns='symbol').reset_index(drop=True)
+            pd.testing.assert_frame_equal(got, expected)
+        assert set(signals['symbol']) <= set(panel['close'].columns)
+        gap = panel['close'].index[[50, 51]]
+        assert not signals[signals['symbol'] == 'SYM8']['timestamp'].isin(gap).any()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
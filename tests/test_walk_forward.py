@@ -0,0 +1,139 @@
+"""
+Test suite for walk_forward module
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.backtest import METRICS, backtest_signals, signal_masks
+from modules.optimizer import PARAMETERS, scalping_grid
+from modules.strategy import ScalpingStrategy
+from modules.walk_forward import WalkForward, walk_forward_windows
+
+BARS_PER_DAY = 75
+
+
+def session_index(days):
+    """5-minute bars of NSE sessions (03:45-10:00 UTC) on consecutive business days"""
+    dates = pd.date_range('2025-01-01', periods=days, freq='B').repeat(BARS_PER_DAY)
+    return dates + pd.to_timedelta(np.tile(np.arange(BARS_PER_DAY) * 5 + 225, days), unit='min')
+
+
+@pytest.fixture
+def panel():
+    """Three symbols over 24 sessions, one listed on day 5 and one with a gap"""
+    np.random.seed(5)
+    index = session_index(24)
+    n = len(index)
+    close = 1000 + np.cumsum(np.random.randn(n, 3) * 3 * np.sin(np.arange(n) / 30)[:, None], axis=0)
+    close[:5 * BARS_PER_DAY, 2] = np.nan
+    close[12 * BARS_PER_DAY + 10:12 * BARS_PER_DAY + 40, 0] = np.nan
+    close = pd.DataFrame(close, index=index, columns=['SYM0', 'SYM1', 'SYM2'])
+    return {'close': close, 'open': close, 'high': close + 1, 'low': close - 1,
+            'volume': pd.DataFrame(1000.0, index=index, columns=close.columns)}
+
+
+@pytest.fixture
+def grid():
+    return scalping_grid(rsi_period=[9, 14], rsi_oversold=[25, 35], rsi_overbought=[65, 75],
+                         ma_short=[10, 20], ma_long=[50])
+
+
+def candidates(grid):
+    """ScalpingStrategy instances for every grid point"""
+    return [ScalpingStrategy(**params, name=str(tuple(params.values())), verbose=False)
+            for params in grid.to_dict('records')]
+
+
+class TestWindows:
+    """Test fold boundaries"""
+
+    def test_rolling(self):
+        """Test that test windows tile the history after the first training window"""
+        folds = walk_forward_windows(session_index(20), train_days=8, test_days=4)
+        assert len(folds) == 3
+        assert folds['train_start'].tolist() == [0, 4 * BARS_PER_DAY, 8 * BARS_PER_DAY]
+        assert (folds['train_stop'] == folds['test_start']).all()
+        assert (folds['test_stop'] - folds['test_start'] == 4 * BARS_PER_DAY).all()
+        assert folds['test_stop'].iloc[-1] == 20 * BARS_PER_DAY
+
+    def test_anchored_and_step(self):
+        """Test anchored training windows and an explicit step"""
+        folds = walk_forward_windows(session_index(20), train_days=8, test_days=4, step_days=2, anchored=True)
+        assert len(folds) == 5
+        assert (folds['train_start'] == 0).all()
+        assert folds['test_start'].diff().dropna().eq(2 * BARS_PER_DAY).all()
+        assert folds['test_from'].iloc[0] == pd.Timestamp('2025-01-13')
+
+    def test_too_short(self, panel):
+        """Test that a history without a full fold is rejected"""
+        with pytest.raises(ValueError):
+            WalkForward(train_days=20, test_days=5).windows(panel['close'].index)
+
+
+class TestWalkForward:
+    """Test out-of-sample selection and reporting"""
+
+    def test_grid_matches_strategy(self, panel, grid):
+        """Test that window metrics equal the strategy's signals backtested on that slice"""
+        walk = WalkForward(train_days=10, test_days=4, workers=1)
+        report = walk.run_grid(panel, grid)
+        assert len(report) == len(walk.folds) == 3
+
+        fold = walk.folds.iloc[1]
+        row = report.iloc[1]
+        params = {name: row[name] for name in PARAMETERS}
+        for symbol in ['SYM1', 'SYM2']:
+            prices = panel['close'][symbol].dropna()
+            df = pd.DataFrame({'timestamp': prices.index, 'close': prices.to_numpy()})
+            buy, sell = signal_masks(df, ScalpingStrategy(**params, verbose=False).generate_signals(df, copy=True))
+            offset = len(panel['close']) - len(df)
+            rows = slice(fold['test_start'] - offset, fold['test_stop'] - offset)
+            expected = backtest_signals(df['close'].to_numpy()[rows], buy[rows], sell[rows])
+
+            got = walk.results[(walk.results['window'] == len(walk.folds) + 1) & (walk.results['symbol'] == symbol)]
+            got = got[(got[PARAMETERS] == list(params.values())).all(axis=1)].iloc[0]
+            for metric in METRICS:
+                assert got[metric] == pytest.approx(expected[metric], rel=1e-9, abs=1e-12), metric
+
+    def test_choice_uses_training_window_only(self, panel, grid):
+        """Test that each fold's candidate is the best on its training window"""
+        walk = WalkForward(train_days=10, test_days=4, workers=1, objective='total_return')
+        report = walk.run_grid(panel, grid)
+        for fold in range(len(report)):
+            train = walk.results[walk.results['window'] == fold]
+            means = train.groupby(PARAMETERS)['total_return'].mean()
+            assert report.loc[fold, 'train_total_return'] == pytest.approx(means.max())
+            assert report.loc[fold, 'rsi_period'] in (9, 14)
+
+    def test_strategies_match_grid(self, panel, grid):
+        """Test that strategy instances and the equivalent grid give the same report"""
+        by_grid = WalkForward(train_days=10, test_days=4, anchored=True, workers=1).run_grid(panel, grid)
+        by_strategy = WalkForward(train_days=10, test_days=4, anchored=True, workers=2).run_strategies(
+            panel, candidates(grid))
+
+        chosen = by_grid[PARAMETERS].apply(lambda params: str(tuple(params)), axis=1)
+        assert by_strategy['strategy'].tolist() == chosen.tolist()
+        for metric in ['symbols'] + METRICS:
+            np.testing.assert_allclose(by_strategy[metric], by_grid[metric], rtol=1e-9, atol=1e-12)
+
+    def test_summary(self, panel, grid):
+        """Test pooling the out-of-sample folds"""
+        walk = WalkForward(train_days=10, test_days=4, workers=1)
+        with pytest.raises(ValueError):
+            walk.summary()
+        report = walk.run_grid(panel, grid)
+        summary = walk.summary()
+        assert summary['folds'] == 3
+        assert summary['trades'] == report['trades'].sum()
+        assert summary['max_drawdown'] == report['max_drawdown'].min()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])